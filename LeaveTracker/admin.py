@@ -3,8 +3,8 @@ from django.urls import path
 from django.shortcuts import redirect
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User, Group, Permission
-from .models import Employee, HolidayRequest,SpecialHolidayTypes,SpecialHolidayUsage, PublicHolidayFetchConfig
-from LeaveTracker.utils.public_holidays_fetching import fetch_and_store_holidays
+from .models import Employee, HolidayRequest,SpecialHolidayTypes,SpecialHolidayUsage, PublicHolidayFetchConfig, HolidayRollover, EmailOutbox, LeaveBalance, LeaveLedgerEntry
+from LeaveTracker.utils.public_holidays_fetching import fetch_and_store_holidays, import_public_holidays
 from django.contrib.auth.admin import GroupAdmin
 from django import forms
 from django.contrib.admin.widgets import FilteredSelectMultiple
@@ -65,6 +65,7 @@ class CustomGroupAdmin(GroupAdmin):
 class PublicHolidayFetchConfigAdmin(admin.ModelAdmin):
     list_display = ('country_code', 'year', 'created_at')
     change_form_template = "admin/holiday_config_change_form.html"
+    actions = ['import_selected']
 
     def get_urls(self):
         urls = super().get_urls()
@@ -95,6 +96,19 @@ class PublicHolidayFetchConfigAdmin(admin.ModelAdmin):
 
         return redirect(f"../")
 
+    @admin.action(description="Import public holidays for the selected configurations")
+    def import_selected(self, request, queryset):
+        configs = queryset.values_list('api_key', 'country_code', 'year')
+        for country_code, year, count, error in import_public_holidays(configs):
+            if error:
+                self.message_user(request, f"{country_code} - {year}: {error}", level=messages.ERROR)
+            else:
+                self.message_user(
+                    request,
+                    f"Successfully imported {count} holidays for {country_code} - {year}",
+                    level=messages.SUCCESS,
+                )
+
 def response_add(self, request, obj, post_url_continue=None):
 
     return redirect(f'../{obj.pk}/change/')
@@ -107,3 +121,22 @@ admin.site.register(HolidayRequest)
 admin.site.register(Employee)
 admin.site.register(SpecialHolidayTypes)
 admin.site.register(SpecialHolidayUsage)
+admin.site.register(HolidayRollover)
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to_email', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+
+
+@admin.register(LeaveBalance)
+class LeaveBalanceAdmin(admin.ModelAdmin):
+    list_display = ('employee', 'year', 'granted', 'reserved', 'consumed', 'available', 'updated_at')
+    list_filter = ('year',)
+
+
+@admin.register(LeaveLedgerEntry)
+class LeaveLedgerEntryAdmin(admin.ModelAdmin):
+    list_display = ('employee', 'year', 'kind', 'days', 'holiday_request', 'created_at')
+    list_filter = ('kind', 'year')
@@ -6,4 +6,5 @@ class LeaveTrackerConfig(AppConfig):
     name = 'LeaveTracker'
     
     def ready(self):
+        import LeaveTracker.checks
         import LeaveTracker.signals
@@ -0,0 +1,255 @@
+import random
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from django.contrib.auth.models import Group, Permission, User
+from django.utils import timezone
+from LeaveTracker.models import (
+    Employee,
+    HolidayRequest,
+    PublicHoliday,
+    SpecialHolidayTypes,
+    SpecialHolidayUsage,
+)
+from LeaveTracker.services.data_versions import invalidate_data_versions
+from LeaveTracker.services.holiday_calendar import invalidate_holiday_calendar
+from LeaveTracker.services.leave_days import rebuild_leave_days
+from LeaveTracker.services.leave_ledger import rebuild_leave_ledger
+from LeaveTracker.services.org_hierarchy import rebuild_hierarchy
+from LeaveTracker.services.pending_counters import invalidate_pending_counts
+from LeaveTracker.utils.date_utils import count_business_days, prepare_holidays
+
+# Every generated user name starts with this, so the org can be dropped again
+USER_PREFIX = "org_"
+ADMIN_USERNAME = f"{USER_PREFIX}admin"
+PUBLIC_HOLIDAY_PREFIX = "Generated holiday"
+
+COUNTRIES = ['NL', 'GR', 'DE', 'FR', 'ES', 'IT', 'BE', 'PT']
+PUBLIC_HOLIDAYS_PER_YEAR = 10
+SPECIAL_TYPES = [('Marriage', 5), ('Bereavement', 3), ('Parental', 20), ('Moving', 1)]
+TEAM_SIZE = 8
+
+FIRST_NAMES = ['Anna', 'Bram', 'Chloe', 'Daan', 'Eleni', 'Femke', 'Giorgos', 'Hanna', 'Ioanna', 'Jan',
+               'Katerina', 'Lars', 'Maria', 'Nikos', 'Olga', 'Pieter', 'Sofia', 'Thomas']
+LAST_NAMES = ['de Vries', 'Papadopoulos', 'Jansen', 'Schmidt', 'Bakker', 'Georgiou', 'Visser',
+              'Müller', 'Smit', 'Nikolaou', 'Mulder', 'Rossi', 'Dubois', 'Silva']
+
+MANAGER_PERMISSIONS = [
+    'is_manager',
+    'review_holiday_requests_managed',
+    'approve_holiday_request',
+    'reject_holiday_request',
+    'view_managed_employees',
+    'view_total_normal_holidays_managed',
+    'view_remaining_normal_holidays_managed',
+    'filter_holidays_managed',
+    'view_holiday',
+    'view_special_holiday_usage_managed',
+]
+
+
+def manager_index(index):
+    """
+    Position of an employee's manager in a tree with TEAM_SIZE reports per
+    manager: 1-7 report to 0, 9-15 to 8, 8, 16, ... 56 to 0, 72 to 64 and so on.
+    """
+    span = TEAM_SIZE
+    while index % span == 0:
+        span *= TEAM_SIZE
+    return index - index % span
+
+
+def clear_org():
+    """Drop a previously generated organisation."""
+    User.objects.filter(username__startswith=USER_PREFIX).delete()
+    PublicHoliday.objects.filter(name__startswith=PUBLIC_HOLIDAY_PREFIX).delete()
+    invalidate_holiday_calendar()
+    invalidate_pending_counts()
+    invalidate_data_versions()
+
+
+def _groups():
+    employee_group, _ = Group.objects.get_or_create(name='Employee')
+    manager_group, _ = Group.objects.get_or_create(name='Manager')
+    manager_group.permissions.add(*Permission.objects.filter(
+        content_type__app_label='LeaveTracker', codename__in=MANAGER_PERMISSIONS
+    ))
+    return employee_group, manager_group
+
+
+def _public_holidays(rng, years):
+    calendars = {}
+    holidays = []
+    for country in COUNTRIES:
+        days = set()
+        for year in years:
+            while len([day for day in days if day.year == year]) < PUBLIC_HOLIDAYS_PER_YEAR:
+                day = date(year, 1, 1) + timedelta(days=rng.randrange(365))
+                if day.weekday() < 5:
+                    days.add(day)
+        holidays.extend(
+            PublicHoliday(name=f"{PUBLIC_HOLIDAY_PREFIX} {country} {day:%m-%d}", date=day, country_code=country)
+            for day in days
+        )
+        calendars[country] = prepare_holidays(days)
+    PublicHoliday.objects.bulk_create(holidays, ignore_conflicts=True, batch_size=1000)
+    return calendars
+
+
+def _requests_for(rng, employee, reviewer_id, first_day, last_day, count, calendar, special_types, today):
+    """
+    Yield `count` non-overlapping requests for one employee, one per equal
+    slot of the timeline, with statuses that match their position in time.
+    """
+    slot = max((last_day - first_day).days // max(count, 1), 3)
+    user_group = 'Manager' if employee.is_manager else 'Employee'
+
+    for n in range(count):
+        slot_start = first_day + timedelta(days=n * slot)
+        start = slot_start + timedelta(days=rng.randrange(max(slot - 2, 1)))
+        if start.weekday() >= 5:
+            start += timedelta(days=7 - start.weekday())
+        end = min(start + timedelta(days=rng.choice([0, 0, 1, 2, 3, 4, 7])), slot_start + timedelta(days=slot - 1))
+        if start > end or end > last_day:
+            continue
+
+        days_taken = count_business_days(start, end, calendar)
+        if not days_taken:
+            continue
+
+        roll = rng.random()
+        if end < today:
+            status = 'approved' if roll < 0.85 else 'rejected'
+        else:
+            status = 'pending' if roll < 0.5 else 'approved' if roll < 0.95 else 'rejected'
+
+        special_type = rng.choice(special_types) if rng.random() < 0.1 else None
+        created_at = timezone.make_aware(datetime.combine(start - timedelta(days=rng.randint(5, 60)), time(9)))
+        decided_at = created_at + timedelta(days=1) if end < today or status != 'pending' else None
+
+        yield HolidayRequest(
+            employee_id=employee.id,
+            days_taken=days_taken,
+            start_date=start,
+            end_date=end,
+            status=status,
+            user_group=user_group,
+            reviewer_id=reviewer_id,
+            reset=status == 'approved' and special_type is None and start.year < today.year,
+            deleted=created_at + timedelta(hours=1) if rng.random() < 0.03 else None,
+            is_special=special_type is not None,
+            special_type=special_type,
+            approved_at=decided_at if status == 'approved' else None,
+            rejected_at=decided_at if status == 'rejected' else None,
+            created_at=created_at,
+        )
+
+
+def generate_org(employees=5000, requests_per_employee=20, years=5, seed=0, batch_size=5000, log=None):
+    """
+    Bulk-generate a synthetic organisation: a management tree of employees
+    spread over several countries, public holiday calendars, special leave
+    types and usage, and non-overlapping requests over `years` years ending
+    next year. Signals are bypassed, so the hierarchy, caches, pending
+    counters, leave ledger and leave days are rebuilt along the way.
+
+    :return: Dict with the number of rows written per model.
+    """
+    log = log or (lambda message: None)
+    rng = random.Random(seed)
+    today = timezone.now().date()
+    year_range = list(range(today.year - years + 2, today.year + 2))
+    first_day, last_day = date(year_range[0], 1, 1), date(year_range[-1], 12, 31)
+
+    employee_group, manager_group = _groups()
+
+    User.objects.create_superuser(ADMIN_USERNAME, f"{ADMIN_USERNAME}@example.com", None)
+    User.objects.bulk_create([
+        User(
+            username=f"{USER_PREFIX}{i:06d}",
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            email=f"{USER_PREFIX}{i:06d}@example.com",
+        )
+        for i in range(employees)
+    ], batch_size=batch_size)
+    users = list(User.objects.filter(
+        username__startswith=USER_PREFIX
+    ).exclude(username=ADMIN_USERNAME).order_by('username'))
+
+    Employee.objects.bulk_create([
+        Employee(user=user, country_code=rng.choice(COUNTRIES), last_holiday_year_update=today.year)
+        for user in users
+    ], batch_size=batch_size)
+    staff = list(Employee.objects.filter(user__in=users).order_by('user__username'))
+    log(f"Created {len(staff)} employees")
+
+    managers = set()
+    for index, employee in enumerate(staff[1:], start=1):
+        boss = manager_index(index)
+        employee.manager_id = staff[boss].id
+        managers.add(boss)
+    Employee.objects.bulk_update(staff, ['manager'], batch_size=batch_size)
+    rebuild_hierarchy()
+
+    memberships = []
+    for index, employee in enumerate(staff):
+        employee.is_manager = index in managers
+        group = manager_group if employee.is_manager else employee_group
+        memberships.append(User.groups.through(user_id=employee.user_id, group_id=group.id))
+    User.groups.through.objects.bulk_create(memberships, batch_size=batch_size)
+
+    calendars = _public_holidays(rng, year_range)
+    special_types = [
+        SpecialHolidayTypes.objects.get_or_create(name=name, defaults={'max_days': max_days})[0]
+        for name, max_days in SPECIAL_TYPES
+    ]
+
+    # Requests are written in batches; usage and balances are tallied on the way
+    special_usage = defaultdict(int)
+    held = defaultdict(int)
+    batch = []
+    written = 0
+    user_ids = {employee.id: employee.user_id for employee in staff}
+    for employee in staff:
+        requests = _requests_for(rng, employee, user_ids.get(employee.manager_id), first_day, last_day,
+                                 requests_per_employee, calendars[employee.country_code], special_types, today)
+        for holiday_request in requests:
+            if holiday_request.deleted is None and holiday_request.status != 'rejected':
+                if holiday_request.is_special:
+                    special_usage[(employee.id, holiday_request.special_type.id, holiday_request.start_date.year)] \
+                        += holiday_request.days_taken
+                elif holiday_request.start_date.year >= today.year:
+                    held[employee.id] += holiday_request.days_taken
+            batch.append(holiday_request)
+            if len(batch) >= batch_size:
+                HolidayRequest.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+                log(f"Created {written} holiday requests")
+    HolidayRequest.objects.bulk_create(batch)
+    written += len(batch)
+
+    SpecialHolidayUsage.objects.bulk_create([
+        SpecialHolidayUsage(employee_id=employee_id, holiday_type_id=type_id, year=year, days_used=days)
+        for (employee_id, type_id, year), days in special_usage.items()
+    ], batch_size=batch_size, ignore_conflicts=True)
+
+    for employee in staff:
+        employee.available_holidays = max(employee.annual_holidays - held[employee.id], 0)
+    Employee.objects.bulk_update(staff, ['available_holidays'], batch_size=batch_size)
+
+    invalidate_holiday_calendar()
+    invalidate_pending_counts()
+    invalidate_data_versions()
+    for offset in range(0, len(staff), batch_size):
+        rebuild_leave_ledger(staff[offset:offset + batch_size], today.year)
+        rebuild_leave_days(staff[offset:offset + batch_size])
+    log(f"Rebuilt the leave ledger and leave days for {len(staff)} employees")
+
+    return {
+        'employees': len(staff),
+        'managers': len(managers),
+        'holiday_requests': written,
+        'public_holidays': PublicHoliday.objects.filter(name__startswith=PUBLIC_HOLIDAY_PREFIX).count(),
+        'special_usage': len(special_usage),
+    }
@@ -0,0 +1,215 @@
+import math
+import statistics
+import time
+from datetime import date, timedelta
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.utils import timezone
+from LeaveTracker.models import Employee
+from LeaveTracker.services.holiday_export import generate_holiday_export_stream
+from LeaveTracker.services.holiday_review import get_reviewable_requests, review_holiday_requests
+from LeaveTracker.services.holiday_submission import process_holiday_submission
+from LeaveTracker.services.holiday_summary import get_my_holiday_summary
+from LeaveTracker.services.manage_holiday_overview import get_approved_requests, get_manage_holiday_scope
+from LeaveTracker.views.api import get_all_holidays
+from LeaveTracker.views.dashboard import dashboard_bootstrap
+from LeaveTracker.utils.pagination import APPROXIMATE_COUNT_LIMIT, get_keyset_page
+from LeaveTracker.views.review import review_requests
+from .generator import ADMIN_USERNAME, USER_PREFIX
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+
+class QueryCounter:
+    """Execute wrapper counting queries without the 9000 entry cap of connection.queries."""
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(samples, pct):
+    """Linearly interpolated percentile of a non-empty list."""
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def build_context():
+    """
+    Pick the actors of the generated organisation the benchmarks run as.
+
+    :return: The context dict, or None when no organisation was generated.
+    """
+    admin = User.objects.filter(username=ADMIN_USERNAME).first()
+    staff = Employee.objects.filter(user__username__startswith=USER_PREFIX).select_related('user')
+    manager = staff.filter(manager__isnull=False, employee__isnull=False).order_by('id').first()
+    # Someone with days left, so the submission benchmark takes the success path
+    employee = staff.filter(employee__isnull=True, available_holidays__gte=3).order_by('id').first()
+    if not (admin and manager and employee):
+        return None
+
+    year = timezone.now().year
+    return {
+        'admin': admin,
+        'manager': manager,
+        'employee': employee,
+        'users': {'admin': admin, 'manager': manager.user, 'employee': employee.user},
+        'year': year,
+        # Far enough ahead not to overlap any generated request
+        'submission_start': date(year + 3, 3, 2),
+        'factory': RequestFactory(),
+    }
+
+
+def _view(view, path, actor, params=None):
+    """Benchmark a view called directly with a GET request made by `actor`."""
+    def run(context):
+        request = context['factory'].get(path, params(context) if params else {})
+        request.user = context['users'][actor]
+        response = view(request)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        return response
+    return run
+
+
+def _manage_holidays(actor, can_view_all, can_view_managed):
+    """Benchmark the queries of the manage holidays view: the scope and the first page of a year."""
+    def run(context):
+        request = context['factory'].get('/manage-holidays/', {'year': context['year']})
+        request.user = context['users'][actor]
+        employees, scoped_requests = get_manage_holiday_scope(request.user, can_view_all, can_view_managed)
+        page = get_keyset_page(
+            request,
+            get_approved_requests(scoped_requests, context['year']).select_related('employee__user', 'special_type'),
+            count_limit=APPROXIMATE_COUNT_LIMIT
+        )
+        list(page)
+        list(employees.select_related('user'))
+    return run
+
+
+def bench_my_holiday_summary(context):
+    get_my_holiday_summary(context['employee'], context['year'])
+
+
+def bench_submission(context):
+    employee = context['employee']
+    start = context['submission_start']
+    with transaction.atomic():
+        result = process_holiday_submission(employee.user, {
+            'start_date': start.isoformat(),
+            'end_date': (start + timedelta(days=2)).isoformat(),
+            'is_special': False,
+        })
+        transaction.set_rollback(True)
+    return result
+
+
+def bench_bulk_review(context):
+    admin = context['admin']
+    ids = list(get_reviewable_requests(admin).order_by('id').values_list('id', flat=True)[:500])
+    with transaction.atomic():
+        results, error = review_holiday_requests(admin, ids, 'approve')
+        transaction.set_rollback(True)
+    return results
+
+
+def _bench_export(export_format):
+    def run(context):
+        export, error = generate_holiday_export_stream(context['admin'], context['year'], export_format)
+        chunks, content_type, filename = export
+        for _ in chunks:
+            pass
+    return run
+
+
+def _quarter(context):
+    year = context['year']
+    return {'from': f"{year}-04-01", 'to': f"{year}-06-30"}
+
+
+# name: (function taking the context, iteration cap or None)
+BENCHMARKS = {
+    'manage_holidays_all': (_manage_holidays('admin', True, False), None),
+    'manage_holidays_managed': (_manage_holidays('manager', False, True), None),
+    'my_holiday_summary': (bench_my_holiday_summary, None),
+    'all_holidays_admin': (_view(get_all_holidays, '/get-all-holidays/', 'admin', _quarter), None),
+    'all_holidays_manager': (_view(get_all_holidays, '/get-all-holidays/', 'manager', _quarter), None),
+    'dashboard_bootstrap': (_view(dashboard_bootstrap, '/dashboard-bootstrap/', 'employee'), None),
+    'submission': (bench_submission, None),
+    'export_csv': (_bench_export('csv'), 3),
+    'export_ndjson': (_bench_export('ndjson'), 3),
+    'export_xlsx': (_bench_export('xlsx'), 3),
+    'review_requests': (_view(review_requests, '/review-requests/', 'admin'), None),
+    'bulk_review': (bench_bulk_review, 5),
+}
+
+
+def run_benchmark(function, context, iterations):
+    """
+    Time one benchmark after a warm-up run.
+
+    :return: Latency percentiles in milliseconds and the median query count.
+    """
+    function(context)
+
+    timings = []
+    query_counts = []
+    for _ in range(iterations):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            function(context)
+            timings.append((time.perf_counter() - started) * 1000)
+        query_counts.append(counter.count)
+
+    result = {f"p{pct}": round(percentile(timings, pct), 3) for pct in PERCENTILES}
+    result.update({
+        'mean': round(statistics.fmean(timings), 3),
+        'max': round(max(timings), 3),
+        'queries': int(statistics.median(query_counts)),
+        'iterations': iterations,
+    })
+    return result
+
+
+def run_benchmarks(context, iterations=20, only=None, log=None):
+    log = log or (lambda message: None)
+    results = {}
+    for name, (function, max_iterations) in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        results[name] = run_benchmark(function, context, min(iterations, max_iterations or iterations))
+        log(f"{name}: p50 {results[name]['p50']:.1f}ms, p95 {results[name]['p95']:.1f}ms, "
+            f"{results[name]['queries']} queries")
+    return results
+
+
+def compare_to_baseline(results, baseline, threshold=0.2, metric='p95'):
+    """
+    Benchmarks that got slower than the baseline by more than `threshold`
+    (a fraction), or that now run more queries.
+
+    :return: List of human readable regressions.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if result[metric] > previous[metric] * (1 + threshold):
+            regressions.append(
+                f"{name}: {metric} {result[metric]:.1f}ms vs {previous[metric]:.1f}ms "
+                f"(+{(result[metric] / previous[metric] - 1) * 100:.0f}%)"
+            )
+        if result['queries'] > previous['queries']:
+            regressions.append(f"{name}: {result['queries']} queries vs {previous['queries']}")
+    return regressions
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Warn when the state kept in the cache is not shared between workers."""
+    if getattr(settings, 'LEAVE_SHARED_CACHE', False):
+        return []
+    return [Warning(
+        "The cache is not shared between worker processes, so ETags, template "
+        "fragments, pending-request counters, permission snapshots and managed "
+        "employee sets are not cached across requests.",
+        hint="Point CACHE_URL at redis or memcached, or set LEAVE_SHARED_CACHE=True "
+             "for a single-process deployment.",
+        id='LeaveTracker.W001',
+    )]
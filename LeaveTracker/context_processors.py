@@ -1,16 +1,16 @@
-from LeaveTracker.models import HolidayRequest
+from LeaveTracker.services.permission_cache import get_group_names
+from LeaveTracker.services.pending_counters import FALLBACK_SCOPE, get_pending_count, reviewer_scope
+from LeaveTracker.services.review_routing import reviews_fallback_queue
 
 def pending_requests(request):
     if request.user.is_authenticated:
-        user_groups = request.user.groups.values_list('name', flat=True)
-        is_general_manager = any(group in user_groups for group in ['General Manager'])
-        is_operations_manager = any(group in user_groups for group in ['Operations Manager'])
-
-        if is_general_manager:
-            pending_requests_count = HolidayRequest.objects.filter(status='pending').count()
-        elif is_operations_manager:
-            group_filter = 'Employee'
-            pending_requests_count = HolidayRequest.objects.filter(status='pending', user_group__icontains=group_filter).count()
+        # Same scopes as the review queue, see get_reviewable_requests
+        if request.user.has_perm('LeaveTracker.review_holiday_requests_all'):
+            pending_requests_count = get_pending_count('all')
+        elif request.user.has_perm('LeaveTracker.review_holiday_requests_managed'):
+            pending_requests_count = get_pending_count(reviewer_scope(request.user.pk))
+            if reviews_fallback_queue(request.user):
+                pending_requests_count += get_pending_count(FALLBACK_SCOPE)
         else:
             pending_requests_count = 0
     else:
@@ -21,9 +21,9 @@ def pending_requests(request):
     }
 
 def manager(request):
-    is_manager = request.user.groups.filter(name__in=['Operations Manager', 'General Manager']).exists()
+    is_manager = bool(get_group_names(request.user) & {'Operations Manager', 'General Manager'})
     pending_requests_count = 0
     if is_manager:
-        pending_requests_count = HolidayRequest.objects.filter(status='pending').count()
+        pending_requests_count = get_pending_count('all')
     return {'is_manager': is_manager, 'pending_requests_count': pending_requests_count}
 
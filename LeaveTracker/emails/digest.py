@@ -0,0 +1,94 @@
+from collections import defaultdict
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from LeaveTracker.models import HolidayRequest, ReviewDigestRun
+from LeaveTracker.emails.utils import queue_custom_email
+from LeaveTracker.services.review_routing import get_fallback_reviewers
+from LeaveTracker.utils.permissions import get_users_with_permission
+
+
+def digest_mode_enabled():
+    return getattr(settings, 'LEAVE_NOTIFICATION_MODE', 'immediate') == 'digest'
+
+
+def send_review_digests(now=None):
+    """
+    Queue one digest email per reviewer listing the requests submitted since
+    they were last told. Requests are claimed through their awaiting_digest
+    flag rather than a creation window, so one that commits late still gets
+    into the next run and concurrent runs skip each other's rows. Reviewers
+    are the user each request is routed to (or the fallback reviewers for
+    the fallback queue) plus everyone who can review all requests, resolved
+    once for the whole run.
+
+    :return: The ReviewDigestRun recording the run, or None if a run ending
+        at this moment already exists.
+    """
+    now = now or timezone.now()
+    last_run = ReviewDigestRun.objects.order_by('-window_end').first()
+
+    with transaction.atomic():
+        run, created = ReviewDigestRun.objects.get_or_create(window_end=now, defaults={
+            'window_start': last_run.window_end if last_run else now,
+        })
+        if not created:
+            return None
+
+        claimed = list(HolidayRequest.objects.select_for_update(skip_locked=True, of=('self',)).filter(
+            awaiting_digest=True
+        ).select_related('employee__user', 'reviewer', 'special_type').order_by('start_date', 'id'))
+        HolidayRequest.objects.filter(id__in=[hr.id for hr in claimed]).update(awaiting_digest=False)
+        # Requests reviewed or deleted before the run need no reminder
+        pending = [hr for hr in claimed if hr.status == 'pending' and hr.deleted is None]
+
+        reviewer_emails = [
+            email for email in get_users_with_permission(
+                "LeaveTracker", "review_holiday_requests_all"
+            ).values_list('email', flat=True) if email
+        ]
+        fallback_emails = [email for email in get_fallback_reviewers().values_list('email', flat=True) if email]
+
+        requests_by_reviewer = defaultdict(list)
+        for holiday_request in pending:
+            recipients = set(reviewer_emails)
+            if holiday_request.reviewer and holiday_request.reviewer.email:
+                recipients.add(holiday_request.reviewer.email)
+            elif holiday_request.fallback_review:
+                recipients.update(fallback_emails)
+            for email in recipients:
+                requests_by_reviewer[email].append(holiday_request)
+
+        for email, holiday_requests in requests_by_reviewer.items():
+            queue_review_digest(email, holiday_requests)
+
+        run.reviewers_notified = len(requests_by_reviewer)
+        run.requests_included = len(pending)
+        run.save(update_fields=['reviewers_notified', 'requests_included'])
+
+    return run
+
+
+def queue_review_digest(reviewer_email, holiday_requests):
+    subject = f"Holiday Requests Awaiting Review ({len(holiday_requests)})"
+    context = {
+        "subject": subject,
+        "view_request_url": getattr(settings, 'SITE_URL', 'http://127.0.0.1:8000/'),
+        "requests": [
+            {
+                "employee_fullname": hr.employee.user.get_full_name(),
+                "start_date": hr.start_date.isoformat(),
+                "end_date": hr.end_date.isoformat(),
+                "days_taken": hr.days_taken,
+                "holiday_type": hr.special_type.name if hr.is_special and hr.special_type else "Regular Holiday",
+            }
+            for hr in holiday_requests
+        ],
+    }
+
+    queue_custom_email(
+        subject=subject,
+        to_email=reviewer_email,
+        context=context,
+        html_template="emails/manager_digest.html"
+    )
@@ -1,8 +1,8 @@
 from django.conf import settings
-from LeaveTracker.emails.utils import send_custom_email
+from LeaveTracker.emails.utils import queue_custom_email, queue_custom_emails
 
 
-def send_employee_notification(employee_email, is_approved):
+def employee_notification(employee_email, is_approved):
     status = "Approved" if is_approved else "Rejected"
     subject = f"Holiday Request {status}"
 
@@ -11,11 +11,24 @@ def send_employee_notification(employee_email, is_approved):
         "subject": subject,
     }
 
-    send_custom_email(
-        subject=subject,
-        to_email=employee_email,
-        context=context,
-        html_template="emails/employee_notification.html"
+    return {
+        "subject": subject,
+        "to_email": employee_email,
+        "context": context,
+        "html_template": "emails/employee_notification.html",
+    }
+
+
+def send_employee_notification(employee_email, is_approved):
+    queue_custom_email(**employee_notification(employee_email, is_approved))
+
+
+def send_employee_notifications(notifications):
+    """Queue many (employee_email, is_approved) notifications in one insert."""
+    return queue_custom_emails(
+        employee_notification(employee_email, is_approved)
+        for employee_email, is_approved in notifications
+        if employee_email
     )
 
 
@@ -30,7 +43,7 @@ def send_manager_notification(manager_email, employee_firstname, employee_lastna
         "subject": subject
     }
 
-    send_custom_email(
+    queue_custom_email(
         subject=subject,
         to_email=manager_email,
         context=context,
@@ -0,0 +1,101 @@
+import logging
+from datetime import timedelta
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+from LeaveTracker.models import EmailOutbox
+from LeaveTracker.emails.utils import send_custom_email
+
+logger = logging.getLogger('LeaveTracker')
+
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = timedelta(minutes=1)
+# How long a claimed batch is hidden from other dispatchers. A dispatcher
+# that dies mid-batch leaves its emails to be picked up again after this.
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+def _claim_batch(now, batch_size):
+    """
+    Lease a batch of due emails by moving them past CLAIM_TIMEOUT, so the
+    row locks are only held for the claim and not for the SMTP round trips.
+    """
+    with transaction.atomic():
+        batch = list(EmailOutbox.objects.select_for_update(skip_locked=True).filter(
+            status='pending',
+            next_attempt_at__lte=now
+        ).order_by('id')[:batch_size])
+        EmailOutbox.objects.filter(id__in=[email.id for email in batch]).update(
+            next_attempt_at=now + CLAIM_TIMEOUT
+        )
+    return batch
+
+
+def _record_failure(email, error, now, max_attempts, retry_base_delay):
+    """
+    Count a failed attempt and schedule the retry.
+
+    :return: True if the email has now failed permanently.
+    """
+    email.attempts += 1
+    email.last_error = str(error)
+    if email.attempts >= max_attempts:
+        email.status = 'failed'
+        logger.error(f"Giving up on email {email.id} to {email.to_email}: {error}")
+        return True
+    email.next_attempt_at = now + retry_base_delay * 2 ** (email.attempts - 1)
+    logger.warning(f"Email {email.id} to {email.to_email} failed, retrying: {error}")
+    return False
+
+
+def dispatch_pending_emails(batch_size=100, max_attempts=MAX_ATTEMPTS, retry_base_delay=RETRY_BASE_DELAY):
+    """
+    Send one batch of due outbox emails over a single SMTP connection.
+    Failed emails are retried with exponential backoff and marked as
+    failed after max_attempts. If the connection cannot be opened, every
+    email in the batch counts a failed attempt.
+
+    :return: (sent, failed) counts for the batch.
+    """
+    now = timezone.now()
+    sent = failed = 0
+
+    batch = _claim_batch(now, batch_size)
+    if not batch:
+        return 0, 0
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        logger.error(f"Could not open the email connection: {e}")
+        for email in batch:
+            failed += _record_failure(email, e, now, max_attempts, retry_base_delay)
+    else:
+        try:
+            for email in batch:
+                try:
+                    send_custom_email(
+                        subject=email.subject,
+                        to_email=email.to_email,
+                        context=dict(email.context),
+                        html_template=email.html_template,
+                        text_template=email.text_template or None,
+                        connection=connection,
+                    )
+                except Exception as e:
+                    failed += _record_failure(email, e, now, max_attempts, retry_base_delay)
+                else:
+                    email.attempts += 1
+                    email.status = 'sent'
+                    email.sent_at = timezone.now()
+                    email.last_error = ''
+                    sent += 1
+        finally:
+            connection.close()
+
+    EmailOutbox.objects.bulk_update(
+        batch, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+    )
+
+    return sent, failed
@@ -1,13 +1,47 @@
 from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.utils.timezone import now
+from LeaveTracker.models import EmailOutbox
 
 
-def send_custom_email(subject, to_email, context, html_template, text_template=None):
+def send_custom_email(subject, to_email, context, html_template, text_template=None, connection=None):
     context["current_year"] = now().year
     html_content = render_to_string(html_template, context)
     text_content = render_to_string(text_template, context) if text_template else None
 
-    msg = EmailMultiAlternatives(subject, text_content or '', to=[to_email])
+    msg = EmailMultiAlternatives(subject, text_content or '', to=[to_email], connection=connection)
     msg.attach_alternative(html_content, "text/html")
     msg.send()
+
+
+def queue_custom_email(subject, to_email, context, html_template, text_template=None):
+    """
+    Store the email in the outbox instead of sending it. The row is part of
+    the caller's transaction and is delivered later by the dispatch_emails
+    command.
+    """
+    return EmailOutbox.objects.create(
+        subject=subject,
+        to_email=to_email,
+        context=context,
+        html_template=html_template,
+        text_template=text_template or '',
+    )
+
+
+def queue_custom_emails(messages):
+    """
+    Bulk counterpart of queue_custom_email: one INSERT for many emails.
+
+    :param messages: Dicts with the keyword arguments of queue_custom_email.
+    """
+    return EmailOutbox.objects.bulk_create([
+        EmailOutbox(
+            subject=message['subject'],
+            to_email=message['to_email'],
+            context=message['context'],
+            html_template=message['html_template'],
+            text_template=message.get('text_template') or '',
+        )
+        for message in messages
+    ], batch_size=500)
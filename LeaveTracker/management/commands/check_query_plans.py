@@ -0,0 +1,156 @@
+import json
+import re
+from datetime import date, timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from LeaveTracker.models import (
+    Employee,
+    HolidayRequest,
+    LeaveDay,
+    PublicHoliday,
+    SpecialHolidayTypes,
+    SpecialHolidayUsage,
+)
+from LeaveTracker.services.org_hierarchy import rebuild_hierarchy
+
+
+class _Rollback(Exception):
+    pass
+
+
+def hot_queries(employee, special_type):
+    """
+    The service query shapes that must be served by an index, as
+    (label, queryset) pairs.
+    """
+    return [
+        ("overlap check", HolidayRequest.objects.filter(
+            employee=employee,
+            deleted__isnull=True,
+            status__in=['pending', 'approved'],
+            start_date__lte=date(2025, 7, 25),
+            end_date__gte=date(2025, 7, 21)
+        )),
+        ("employee requests", HolidayRequest.objects.filter(
+            employee=employee, status='approved', deleted__isnull=True, start_date__year=2025
+        )),
+        ("pending count", HolidayRequest.objects.filter(
+            reviewer_id=employee.user_id, status='pending'
+        )),
+        ("calendar range", HolidayRequest.objects.filter(
+            status__in=['approved', 'pending'],
+            start_date__lte=date(2025, 3, 31),
+            end_date__gte=date(2025, 3, 1),
+            deleted__isnull=True
+        )),
+        ("yearly export", HolidayRequest.objects.filter(
+            status='approved', deleted__isnull=True, start_date__year=2025
+        )),
+        ("country calendar", PublicHoliday.objects.filter(
+            country_code='NL', date__year=2025
+        )),
+        ("special usage lookup", SpecialHolidayUsage.objects.filter(
+            employee=employee, holiday_type=special_type, year=2025
+        )),
+        ("special usage report", SpecialHolidayUsage.objects.filter(year=2025)),
+        ("managed subtree", Employee.objects.filter(
+            ancestor_links__ancestor_id=employee.id, ancestor_links__depth__gt=0
+        )),
+        ("absence heatmap", LeaveDay.objects.filter(
+            date__range=(date(2025, 3, 1), date(2025, 3, 31)), status__in=['pending', 'approved']
+        ).values('date').annotate(absent=Count('employee', distinct=True))),
+    ]
+
+
+def find_full_scans(plan):
+    """Return the tables the plan reads without an index."""
+    vendor = connection.vendor
+    if vendor == 'sqlite':
+        return re.findall(r'\bSCAN (\w+)\b(?! USING)', plan)
+    if vendor == 'mysql':
+        return re.findall(r'"table_name": "(\w+)",\s*"access_type": "ALL"', plan)
+    if vendor == 'postgresql':
+        return re.findall(r'Seq Scan on "?(\w+)"?', plan)
+    raise CommandError(f"Query plan checks are not supported on {vendor}.")
+
+
+class Command(BaseCommand):
+    help = "Seed a throwaway dataset and fail if a hot query falls back to a full table scan."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=200)
+        parser.add_argument('--requests-per-employee', type=int, default=10)
+
+    def handle(self, *args, **options):
+        failures = []
+        try:
+            with transaction.atomic():
+                employee, special_type = self.seed(options['employees'], options['requests_per_employee'])
+                self.analyze()
+                for label, queryset in hot_queries(employee, special_type):
+                    plan = self.explain(queryset)
+                    scans = find_full_scans(plan)
+                    if scans:
+                        failures.append(f"{label}: full scan of {', '.join(scans)}")
+                        self.stdout.write(self.style.ERROR(f"FAIL {label}\n{plan}"))
+                    else:
+                        self.stdout.write(f"ok   {label}")
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+        if failures:
+            raise CommandError("Queries without a usable index:\n" + "\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("All hot queries use an index."))
+
+    def seed(self, employee_count, requests_per_employee):
+        prefix = "queryplan_"
+        User.objects.bulk_create([
+            User(username=f"{prefix}{i}") for i in range(employee_count)
+        ])
+        users = User.objects.filter(username__startswith=prefix).order_by('id')
+        Employee.objects.bulk_create([
+            Employee(user=user, country_code='NL' if i % 2 else 'GR') for i, user in enumerate(users)
+        ])
+        employees = list(Employee.objects.filter(user__in=users).order_by('id'))
+        for i, employee in enumerate(employees[1:], start=1):
+            employee.manager_id = employees[(i - 1) // 8].id
+        Employee.objects.bulk_update(employees, ['manager'])
+        rebuild_hierarchy()
+
+        statuses = ['approved', 'pending', 'rejected']
+        requests = []
+        for i, employee in enumerate(employees):
+            for j in range(requests_per_employee):
+                start = date(2023, 1, 2) + timedelta(days=(i * 7 + j * 37) % 1000)
+                requests.append(HolidayRequest(
+                    employee=employee, days_taken=3, start_date=start, end_date=start + timedelta(days=2),
+                    status=statuses[j % 3], user_group='Employee', reviewer_id=users[i % 10].id
+                ))
+        HolidayRequest.objects.bulk_create(requests)
+
+        PublicHoliday.objects.bulk_create([
+            PublicHoliday(name=f"{prefix}{country}{day}", country_code=country,
+                          date=date(2023, 1, 1) + timedelta(days=day))
+            for country in ('NL', 'GR', 'DE') for day in range(0, 1000, 25)
+        ])
+
+        special_type = SpecialHolidayTypes.objects.create(name=f"{prefix}type", max_days=5)
+        SpecialHolidayUsage.objects.bulk_create([
+            SpecialHolidayUsage(employee=employee, holiday_type=special_type, year=year, days_used=1)
+            for employee in employees for year in (2023, 2024, 2025)
+        ])
+        return employees[0], special_type
+
+    def analyze(self):
+        # Refresh planner statistics so the seeded volumes are taken into account
+        if connection.vendor in ('sqlite', 'postgresql'):
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+    def explain(self, queryset):
+        if connection.vendor == 'mysql':
+            return json.dumps(json.loads(queryset.explain(format='json')), indent=1)
+        return queryset.explain()
@@ -0,0 +1,39 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from LeaveTracker.emails.outbox import dispatch_pending_emails, MAX_ATTEMPTS
+
+logger = logging.getLogger('LeaveTracker')
+
+
+class Command(BaseCommand):
+    help = "Send queued notification emails from the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS)
+        parser.add_argument('--loop', action='store_true', help="Keep polling the outbox instead of exiting when it is empty")
+        parser.add_argument('--interval', type=float, default=10, help="Seconds to sleep between polls with --loop")
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            try:
+                sent, failed = dispatch_pending_emails(options['batch_size'], options['max_attempts'])
+            except Exception:
+                # The claimed batch comes back after its lease expires
+                if not options['loop']:
+                    raise
+                logger.exception("Dispatching the email outbox failed")
+                time.sleep(options['interval'])
+                continue
+            total_sent += sent
+            total_failed += failed
+
+            if sent or failed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(f"Sent {total_sent} emails, {total_failed} failed permanently.")
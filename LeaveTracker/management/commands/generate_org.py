@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.models import User
+from LeaveTracker.benchmarks.generator import USER_PREFIX, clear_org, generate_org
+
+
+class Command(BaseCommand):
+    help = "Bulk-generate a synthetic organisation with several years of leave for benchmarking."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=5000)
+        parser.add_argument('--requests-per-employee', type=int, default=20,
+                            help="Use 200 with 5000 employees for a 1M request dataset")
+        parser.add_argument('--years', type=int, default=5, help="Years of requests, ending next year")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--reset', action='store_true', help="Drop a previously generated organisation first")
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            clear_org()
+        elif User.objects.filter(username__startswith=USER_PREFIX).exists():
+            raise CommandError("An organisation was already generated. Pass --reset to replace it.")
+
+        counts = generate_org(
+            employees=options['employees'],
+            requests_per_employee=options['requests_per_employee'],
+            years=options['years'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            ", ".join(f"{count} {name.replace('_', ' ')}" for name, count in counts.items())
+        ))
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from LeaveTracker.models import PublicHolidayFetchConfig
+from LeaveTracker.utils.public_holidays_fetching import import_public_holidays
+
+
+class Command(BaseCommand):
+    help = ("Import public holidays for several countries and years concurrently. "
+            "Without --country every saved fetch configuration is imported.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--country', action='append', default=[], help="Country code, repeatable")
+        parser.add_argument('--year', action='append', type=int, default=[], help="Year, repeatable")
+        parser.add_argument('--api-key', default=None, help="Defaults to PUBLIC_HOLIDAYS_API_KEY")
+        parser.add_argument('--workers', type=int, default=None, help="Concurrent API requests")
+
+    def handle(self, *args, **options):
+        if options['country']:
+            api_key = options['api_key'] or settings.PUBLIC_HOLIDAYS_API_KEY
+            if not (api_key and options['year']):
+                raise CommandError("--country needs at least one --year and an API key.")
+            configs = [
+                (api_key, country_code.upper(), year)
+                for country_code in options['country'] for year in options['year']
+            ]
+        else:
+            configs = list(PublicHolidayFetchConfig.objects.values_list('api_key', 'country_code', 'year'))
+            if not configs:
+                raise CommandError("No fetch configurations saved. Pass --country and --year.")
+
+        failures = 0
+        for country_code, year, count, error in import_public_holidays(configs, max_workers=options['workers']):
+            if error:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"{country_code} {year}: {error}"))
+            else:
+                self.stdout.write(f"{country_code} {year}: {count} new holidays")
+
+        if failures:
+            raise CommandError(f"{failures} of {len(configs)} imports failed.")
+        self.stdout.write(self.style.SUCCESS(f"Imported {len(configs)} calendars."))
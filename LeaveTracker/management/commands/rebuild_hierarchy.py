@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from LeaveTracker.services.org_hierarchy import rebuild_hierarchy
+
+
+class Command(BaseCommand):
+    help = "Rebuild the employee hierarchy closure table from Employee.manager."
+
+    def handle(self, *args, **options):
+        written = rebuild_hierarchy()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} hierarchy links."))
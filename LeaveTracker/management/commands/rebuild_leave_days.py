@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from LeaveTracker.models import Employee
+from LeaveTracker.services.leave_days import rebuild_leave_days
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-day leave table from the existing holiday requests."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help="Employees rebuilt per transaction")
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        employees = Employee.objects.order_by('id').only('id', 'country_code')
+        written = 0
+        last_id = 0
+
+        while True:
+            chunk = list(employees.filter(id__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+            written += rebuild_leave_days(chunk)
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} leave days."))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from LeaveTracker.models import Employee
+from LeaveTracker.services.leave_ledger import rebuild_leave_ledger
+
+
+class Command(BaseCommand):
+    help = "Rebuild the leave ledger and balance snapshots from the existing holiday requests."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help="Employees rebuilt per transaction")
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        employees = Employee.objects.order_by('id')
+        written = 0
+        last_id = 0
+
+        while True:
+            chunk = list(employees.filter(id__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+            written += rebuild_leave_ledger(chunk)
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} ledger entries."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from LeaveTracker.services.home_summary import rollover_annual_holidays
+
+
+class Command(BaseCommand):
+    help = "Grant the yearly holiday allowance to every employee. Safe to re-run."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, default=None, help="Year to roll over (defaults to the current one)")
+        parser.add_argument('--chunk-size', type=int, default=500, help="Employees updated per transaction")
+
+    def handle(self, *args, **options):
+        year = options['year'] or timezone.now().year
+        marker, created = rollover_annual_holidays(year, chunk_size=options['chunk_size'])
+
+        if not created:
+            self.stdout.write(f"Rollover for {year} already completed at {marker.completed_at:%Y-%m-%d %H:%M}.")
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rolled over {marker.employees_processed} employees for {year} in {marker.duration_seconds:.2f}s."
+        ))
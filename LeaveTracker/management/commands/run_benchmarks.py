@@ -0,0 +1,45 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from LeaveTracker.benchmarks.suite import BENCHMARKS, build_context, compare_to_baseline, run_benchmarks
+from LeaveTracker.models import Employee, HolidayRequest
+
+
+class Command(BaseCommand):
+    help = "Time the key services and views against a generated organisation and compare with a baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--only', action='append', choices=list(BENCHMARKS), help="Run only these benchmarks")
+        parser.add_argument('--output', help="Write the results to this JSON file")
+        parser.add_argument('--baseline', help="Compare against a JSON file written by --output")
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help="Allowed p95 slowdown against the baseline, as a fraction")
+
+    def handle(self, *args, **options):
+        context = build_context()
+        if context is None:
+            raise CommandError("No generated organisation found. Run generate_org first.")
+
+        results = run_benchmarks(context, options['iterations'], options['only'], log=self.stdout.write)
+        report = {
+            'created_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'employees': Employee.objects.count(),
+            'holiday_requests': HolidayRequest.objects.count(),
+            'results': results,
+        }
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options['baseline']:
+            with open(options['baseline']) as baseline_file:
+                baseline = json.load(baseline_file)
+            regressions = compare_to_baseline(results, baseline['results'], options['threshold'])
+            if regressions:
+                raise CommandError("Regressions against the baseline:\n" + "\n".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from LeaveTracker.emails.digest import send_review_digests
+
+
+class Command(BaseCommand):
+    help = "Queue one summary email per reviewer with the holiday requests submitted since the last run."
+
+    def handle(self, *args, **options):
+        run = send_review_digests()
+        if run is None:
+            self.stdout.write("A digest for this window was already sent.")
+            return
+
+        self.stdout.write(
+            f"Queued digests for {run.reviewers_notified} reviewers covering {run.requests_included} requests."
+        )
@@ -0,0 +1,194 @@
+import contextvars
+import hashlib
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+from LeaveTracker.services.permission_cache import prime_permission_cache
+
+logger = logging.getLogger('LeaveTracker')
+
+# Statements remembered per request, in order, for the SQL of slow requests
+MAX_CAPTURED_QUERIES = 500
+# Share of slow requests logged with their SQL when LEAVE_SQL_SAMPLE_RATE is unset
+DEFAULT_SQL_SAMPLE_RATE = 0.01
+MAX_REPORTED_DUPLICATES = 5
+
+# Collapse IN lists so batches of different sizes share a fingerprint
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+
+_current_metrics = contextvars.ContextVar('leave_request_metrics', default=None)
+
+
+def fingerprint(sql):
+    """Short stable id of a statement's shape, ignoring its parameters."""
+    normalized = _IN_LIST.sub('IN (...)', sql)
+    return hashlib.md5(normalized.encode()).hexdigest()[:12], normalized
+
+
+class RequestMetrics:
+    """
+    Collects the queries and template time of one request. Installed as a
+    connection execute wrapper, so it sees every query with DEBUG off.
+    """
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.fingerprints = Counter()
+        self.statements = {}
+        # (fingerprint, ms) per statement; parameters are never kept, as
+        # they hold session keys, password hashes and personal data
+        self.timeline = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.queries += 1
+            self.db_time += duration
+
+            key, normalized = fingerprint(sql)
+            self.fingerprints[key] += 1
+            self.statements.setdefault(key, normalized)
+            if len(self.timeline) < MAX_CAPTURED_QUERIES:
+                self.timeline.append((key, round(duration * 1000, 3)))
+
+    def captured_sql(self):
+        """The statements run so far, as parameterless SQL with their timings."""
+        return [
+            {'fingerprint': key, 'sql': self.statements[key], 'ms': ms}
+            for key, ms in self.timeline
+        ]
+
+    def duplicates(self):
+        """Statements run more than once, most repeated first: the N+1 signature."""
+        return [
+            {'fingerprint': key, 'count': count, 'sql': self.statements[key][:300]}
+            for key, count in self.fingerprints.most_common()
+            if count > 1
+        ]
+
+
+_original_template_render = Template.render
+
+
+def _instrumented_template_render(self, context):
+    metrics = _current_metrics.get()
+    # Included templates render inside their parent and are already timed
+    if metrics is None or metrics.template_depth:
+        return _original_template_render(self, context)
+
+    metrics.template_depth += 1
+    started = time.perf_counter()
+    try:
+        return _original_template_render(self, context)
+    finally:
+        metrics.template_time += time.perf_counter() - started
+        metrics.template_depth -= 1
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Records per request the number of queries, DB time, duplicated query
+    fingerprints, template render time and the remaining view time. Every
+    request is logged with the numbers in `record.request_metrics`; requests
+    over LEAVE_SLOW_REQUEST_MS or LEAVE_SLOW_REQUEST_QUERIES are logged as
+    warnings, with their SQL (without parameters) for a LEAVE_SQL_SAMPLE_RATE
+    share of them.
+
+    Queries run while a streaming response is consumed are not counted.
+    """
+    def __init__(self, get_response):
+        if not getattr(settings, 'LEAVE_INSTRUMENTATION', True):
+            # Leaves Template.render unpatched
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if Template.render is not _instrumented_template_render:
+            Template.render = _instrumented_template_render
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        total_time = time.perf_counter() - started
+
+        record = self.build_record(request, response, metrics, total_time)
+        self.log(record, metrics)
+
+        if getattr(settings, 'LEAVE_SERVER_TIMING', False):
+            response['Server-Timing'] = (
+                f'db;dur={record["db_ms"]};desc="{record["queries"]} queries", '
+                f'tpl;dur={record["template_ms"]}, '
+                f'view;dur={record["view_ms"]}, '
+                f'total;dur={record["total_ms"]}'
+            )
+        return response
+
+    def build_record(self, request, response, metrics, total_time):
+        duplicates = metrics.duplicates()
+        match = getattr(request, 'resolver_match', None)
+        return {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': metrics.queries,
+            'duplicate_queries': sum(duplicate['count'] - 1 for duplicate in duplicates),
+            'duplicates': duplicates[:MAX_REPORTED_DUPLICATES],
+            'db_ms': round(metrics.db_time * 1000, 2),
+            'template_ms': round(metrics.template_time * 1000, 2),
+            # Time in the view itself, outside the database and templates
+            'view_ms': round(max(total_time - metrics.db_time - metrics.template_time, 0) * 1000, 2),
+            'total_ms': round(total_time * 1000, 2),
+        }
+
+    def log(self, record, metrics):
+        message = (
+            f"{record['method']} {record['path']} {record['status']}: {record['queries']} queries "
+            f"({record['duplicate_queries']} duplicated) in {record['db_ms']}ms, "
+            f"templates {record['template_ms']}ms, total {record['total_ms']}ms"
+        )
+
+        slow = (
+            record['total_ms'] >= getattr(settings, 'LEAVE_SLOW_REQUEST_MS', 500) or
+            record['queries'] >= getattr(settings, 'LEAVE_SLOW_REQUEST_QUERIES', 50)
+        )
+        if not slow:
+            logger.info(message, extra={'request_metrics': record})
+            return
+
+        # Sampled once the request is known to be slow
+        if random.random() < getattr(settings, 'LEAVE_SQL_SAMPLE_RATE', DEFAULT_SQL_SAMPLE_RATE):
+            record = dict(record, sql=metrics.captured_sql())
+        logger.warning(f"Slow request {message}", extra={'request_metrics': record})
+
+
+class PermissionSnapshotMiddleware:
+    """
+    Attaches the user's cached permission snapshot to request.user, so the
+    has_perm checks of the view, context processors and templates run no
+    SQL. Must come after AuthenticationMiddleware.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        prime_permission_cache(request.user)
+        return self.get_response(request)
@@ -0,0 +1,136 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:31
+
+import LeaveTracker.models
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Event',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+            ],
+            options={
+                'db_table': 'Event',
+                'default_permissions': (),
+            },
+        ),
+        migrations.CreateModel(
+            name='PublicHolidayFetchConfig',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('api_key', models.CharField(max_length=255)),
+                ('country_code', models.CharField(default='NL', max_length=10)),
+                ('year', models.IntegerField(default=2025)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'PublicHolidayConfig',
+                'default_permissions': (),
+            },
+        ),
+        migrations.CreateModel(
+            name='SpecialHolidayTypes',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('max_days', models.IntegerField()),
+            ],
+            options={
+                'verbose_name_plural': 'Special holiday types',
+                'db_table': 'SpecialHolidayTypes',
+                'default_permissions': (),
+            },
+        ),
+        migrations.CreateModel(
+            name='Employee',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('country_code', models.CharField(default='NL', max_length=2)),
+                ('annual_holidays', models.IntegerField(default=25)),
+                ('available_holidays', models.IntegerField(default=25)),
+                ('last_holiday_update', models.DateField(blank=True, null=True)),
+                ('last_holiday_year_update', models.IntegerField(default=0)),
+                ('position', models.CharField(blank=True, max_length=255, null=True)),
+                ('manager', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='LeaveTracker.employee')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'Employee',
+                'default_permissions': (),
+            },
+        ),
+        migrations.CreateModel(
+            name='PublicHoliday',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('date', models.DateField()),
+                ('country_code', models.CharField(max_length=2)),
+            ],
+            options={
+                'db_table': 'PublicHoliday',
+                'default_permissions': (),
+                'unique_together': {('name', 'date', 'country_code')},
+            },
+        ),
+        migrations.CreateModel(
+            name='HolidayRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('days_taken', models.IntegerField()),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')], default='pending', max_length=10)),
+                ('user_group', models.CharField(blank=True, max_length=255)),
+                ('reset', models.BooleanField(default=False)),
+                ('deleted', models.DateTimeField(null=True)),
+                ('is_special', models.BooleanField(default=False)),
+                ('approved_at', models.DateTimeField(null=True)),
+                ('rejected_at', models.DateTimeField(null=True)),
+                ('approved_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='holiday_requests_approved', to=settings.AUTH_USER_MODEL)),
+                ('deleted_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='holiday_requests_deleted', to=settings.AUTH_USER_MODEL)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='LeaveTracker.employee')),
+                ('rejected_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='holiday_requests_rejected', to=settings.AUTH_USER_MODEL)),
+                ('special_type', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='LeaveTracker.specialholidaytypes')),
+            ],
+            options={
+                'db_table': 'HolidayRequest',
+                'permissions': [('is_manager', 'Can manage other users'), ('review_holiday_requests_all', 'Can review holiday requests for all employees'), ('review_holiday_requests_managed', 'Can review holiday requests for managed employees'), ('approve_holiday_request', 'Can approve holiday requests'), ('reject_holiday_request', 'Can reject holiday request'), ('view_all_employees', 'Can view all employee holidays (managed page)'), ('view_managed_employees', 'Can view managed employees (managed page)'), ('view_total_normal_holidays_all', 'Can view total normal holidays for all employees'), ('view_total_normal_holidays_managed', 'Can view total normal holidays for managed employees'), ('view_remaining_normal_holidays_all', 'Can view remaining normal holidays for all employees'), ('view_remaining_normal_holidays_managed', 'Can view remaining normal holidays for managed employees'), ('filter_holidays_all', 'Can filter holidays for all employees'), ('filter_holidays_managed', 'Can filter holidays for managed employees'), ('delete_holiday', 'Can delete holidays'), ('view_holiday', 'Can view holidays but not delete'), ('view_special_holiday_usage_all', 'Can view special holiday usage for all employees'), ('view_special_holiday_usage_managed', 'Can view special holiday usage for managed employees')],
+                'default_permissions': (),
+            },
+        ),
+        migrations.CreateModel(
+            name='SpecialHolidayUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField(default=LeaveTracker.models.current_year)),
+                ('days_used', models.IntegerField(default=0)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='LeaveTracker.employee')),
+                ('holiday_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='LeaveTracker.specialholidaytypes')),
+            ],
+            options={
+                'db_table': 'SpecialHolidayUsage',
+                'default_permissions': (),
+                'unique_together': {('employee', 'holiday_type', 'year')},
+            },
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='special_holidays',
+            field=models.ManyToManyField(through='LeaveTracker.SpecialHolidayUsage', to='LeaveTracker.specialholidaytypes'),
+        ),
+    ]
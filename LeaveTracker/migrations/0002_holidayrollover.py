@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LeaveTracker', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HolidayRollover',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField(unique=True)),
+                ('employees_processed', models.IntegerField(default=0)),
+                ('duration_seconds', models.FloatField(default=0)),
+                ('completed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'HolidayRollover',
+                'default_permissions': (),
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LeaveTracker', '0002_holidayrollover'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='holidayrequest',
+            index=models.Index(fields=['employee', 'status', 'deleted', 'start_date', 'end_date'], name='holidayreq_emp_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='holidayrequest',
+            index=models.Index(fields=['status', 'user_group'], name='holidayreq_status_group_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='holidayrequest',
+            index=models.Index(fields=['status', 'start_date', 'end_date'], name='holidayreq_status_dates_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publicholiday',
+            index=models.Index(fields=['country_code', 'date'], name='publicholiday_country_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='specialholidayusage',
+            index=models.Index(fields=['year', 'holiday_type'], name='specialusage_year_type_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:35
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LeaveTracker', '0003_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255)),
+                ('to_email', models.EmailField(max_length=254)),
+                ('html_template', models.CharField(max_length=255)),
+                ('text_template', models.CharField(blank=True, max_length=255)),
+                ('context', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.IntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Email outbox',
+                'db_table': 'EmailOutbox',
+                'default_permissions': (),
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='emailoutbox_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:36
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LeaveTracker', '0004_emailoutbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewDigestRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window_start', models.DateTimeField()),
+                ('window_end', models.DateTimeField(unique=True)),
+                ('reviewers_notified', models.IntegerField(default=0)),
+                ('requests_included', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'ReviewDigestRun',
+                'default_permissions': (),
+            },
+        ),
+        migrations.AddField(
+            model_name='holidayrequest',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='holidayrequest',
+            index=models.Index(fields=['status', 'created_at'], name='holidayreq_status_created_idx'),
+        ),
+    ]
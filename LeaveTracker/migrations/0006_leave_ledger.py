@@ -0,0 +1,50 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:39
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LeaveTracker', '0005_review_digest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaveBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('granted', models.IntegerField(default=0)),
+                ('reserved', models.IntegerField(default=0)),
+                ('consumed', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='LeaveTracker.employee')),
+            ],
+            options={
+                'db_table': 'LeaveBalance',
+                'default_permissions': (),
+                'unique_together': {('employee', 'year')},
+            },
+        ),
+        migrations.CreateModel(
+            name='LeaveLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('kind', models.CharField(choices=[('grant', 'Grant'), ('reserve', 'Reserve'), ('release', 'Release'), ('consume', 'Consume'), ('refund', 'Refund')], max_length=10)),
+                ('days', models.IntegerField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='LeaveTracker.employee')),
+                ('holiday_request', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='LeaveTracker.holidayrequest')),
+            ],
+            options={
+                'verbose_name_plural': 'Leave ledger entries',
+                'db_table': 'LeaveLedgerEntry',
+                'default_permissions': (),
+                'indexes': [models.Index(fields=['employee', 'year', 'created_at'], name='ledger_emp_year_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LeaveTracker', '0006_leave_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaveDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')], max_length=10)),
+                ('is_special', models.BooleanField(default=False)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='LeaveTracker.employee')),
+                ('holiday_request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='LeaveTracker.holidayrequest')),
+            ],
+            options={
+                'db_table': 'LeaveDay',
+                'default_permissions': (),
+                'indexes': [models.Index(fields=['date', 'status', 'employee'], name='leaveday_date_status_idx')],
+                'unique_together': {('holiday_request', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def route_pending_requests(apps, schema_editor):
+    Employee = apps.get_model('LeaveTracker', 'Employee')
+    HolidayRequest = apps.get_model('LeaveTracker', 'HolidayRequest')
+    HolidayRequest.objects.filter(status='pending', reviewer__isnull=True).update(
+        reviewer_id=Subquery(Employee.objects.filter(id=OuterRef('employee_id')).values('manager__user_id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LeaveTracker', '0007_leave_days'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='holidayrequest',
+            name='holidayreq_status_group_idx',
+        ),
+        migrations.AddField(
+            model_name='holidayrequest',
+            name='reviewer',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='holiday_requests_to_review', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='holidayrequest',
+            index=models.Index(fields=['reviewer', 'status'], name='holidayreq_reviewer_status_idx'),
+        ),
+        migrations.RunPython(route_pending_requests, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LeaveTracker', '0008_holiday_request_reviewer'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='holidayrequest',
+            name='holidayreq_reviewer_status_idx',
+        ),
+        migrations.AddIndex(
+            model_name='holidayrequest',
+            index=models.Index(fields=['reviewer', 'status', 'start_date'], name='holidayreq_reviewer_status_idx'),
+        ),
+    ]
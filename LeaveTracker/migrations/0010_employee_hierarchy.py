@@ -0,0 +1,55 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:14
+
+import django.db.models.deletion
+from collections import defaultdict
+from django.db import migrations, models
+
+
+def build_hierarchy(apps, schema_editor):
+    Employee = apps.get_model('LeaveTracker', 'Employee')
+    EmployeeHierarchy = apps.get_model('LeaveTracker', 'EmployeeHierarchy')
+
+    reports = defaultdict(list)
+    roots = []
+    for employee_id, manager_id in Employee.objects.values_list('id', 'manager_id'):
+        if manager_id is None:
+            roots.append(employee_id)
+        else:
+            reports[manager_id].append(employee_id)
+
+    links = []
+    stack = [(root, []) for root in roots]
+    while stack:
+        employee_id, ancestors = stack.pop()
+        chain = ancestors + [employee_id]
+        links.extend(
+            EmployeeHierarchy(ancestor_id=ancestor_id, descendant_id=employee_id, depth=len(chain) - 1 - position)
+            for position, ancestor_id in enumerate(chain)
+        )
+        stack.extend((report_id, chain) for report_id in reports[employee_id])
+    EmployeeHierarchy.objects.bulk_create(links, batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LeaveTracker', '0009_reviewer_queue_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeHierarchy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='LeaveTracker.employee')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='LeaveTracker.employee')),
+            ],
+            options={
+                'db_table': 'EmployeeHierarchy',
+                'default_permissions': (),
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.RunPython(build_hierarchy, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-18 21:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def queue_unrouted_requests(apps, schema_editor):
+    HolidayRequest = apps.get_model('LeaveTracker', 'HolidayRequest')
+    requester_groups = set(getattr(settings, 'LEAVE_FALLBACK_REQUESTER_GROUPS', ['Employee']))
+    queued = [
+        request_id for request_id, user_group in HolidayRequest.objects.filter(
+            status='pending', reviewer__isnull=True
+        ).values_list('id', 'user_group')
+        if not requester_groups.isdisjoint(user_group.split(','))
+    ]
+    HolidayRequest.objects.filter(id__in=queued).update(fallback_review=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LeaveTracker', '0010_employee_hierarchy'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='holidayrequest',
+            name='fallback_review',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='holidayrequest',
+            index=models.Index(fields=['fallback_review', 'status', 'start_date'], name='holidayreq_fallback_idx'),
+        ),
+        migrations.RunPython(queue_unrouted_requests, migrations.RunPython.noop),
+    ]
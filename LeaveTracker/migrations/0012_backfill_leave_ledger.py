@@ -0,0 +1,78 @@
+# Generated by Django 5.2.4 on 2026-10-18 21:30
+
+from collections import defaultdict
+from django.db import migrations
+from django.utils import timezone
+
+CHUNK_SIZE = 500
+
+# Mirrors ENTRY_EFFECTS in LeaveTracker.services.leave_ledger
+ENTRY_EFFECTS = {
+    'grant': {'granted': 1},
+    'reserve': {'reserved': 1},
+    'consume': {'reserved': -1, 'consumed': 1},
+}
+
+
+def backfill_leave_ledger(apps, schema_editor):
+    """
+    Give every employee without a ledger the entries rebuild_leave_ledger
+    would write, so upgraded installs have balance snapshots straight away.
+    """
+    Employee = apps.get_model('LeaveTracker', 'Employee')
+    HolidayRequest = apps.get_model('LeaveTracker', 'HolidayRequest')
+    LeaveBalance = apps.get_model('LeaveTracker', 'LeaveBalance')
+    LeaveLedgerEntry = apps.get_model('LeaveTracker', 'LeaveLedgerEntry')
+    year = timezone.now().year
+
+    employees = Employee.objects.filter(leaveledgerentry__isnull=True).order_by('id')
+    last_id = 0
+    while True:
+        chunk = dict(employees.filter(id__gt=last_id).values_list('id', 'available_holidays')[:CHUNK_SIZE])
+        if not chunk:
+            break
+        last_id = max(chunk)
+
+        entries = []
+        held = defaultdict(int)
+        for request_id, employee_id, status, start_date, days_taken in HolidayRequest.objects.filter(
+            employee_id__in=list(chunk),
+            status__in=['pending', 'approved'],
+            deleted__isnull=True
+        ).exclude(
+            is_special=True, special_type__isnull=False
+        ).values_list('id', 'employee_id', 'status', 'start_date', 'days_taken'):
+            for kind in (['reserve', 'consume'] if status == 'approved' else ['reserve']):
+                entries.append(LeaveLedgerEntry(
+                    employee_id=employee_id, year=start_date.year, kind=kind,
+                    days=days_taken, holiday_request_id=request_id
+                ))
+            held[employee_id] += days_taken
+
+        for employee_id, available in chunk.items():
+            entries.append(LeaveLedgerEntry(
+                employee_id=employee_id, year=year, kind='grant', days=available + held[employee_id]
+            ))
+        entries = [entry for entry in entries if entry.days]
+        LeaveLedgerEntry.objects.bulk_create(entries, batch_size=CHUNK_SIZE)
+
+        balances = {}
+        for entry in entries:
+            balance = balances.setdefault(
+                (entry.employee_id, entry.year),
+                LeaveBalance(employee_id=entry.employee_id, year=entry.year)
+            )
+            for field, sign in ENTRY_EFFECTS[entry.kind].items():
+                setattr(balance, field, getattr(balance, field) + sign * entry.days)
+        LeaveBalance.objects.bulk_create(balances.values(), batch_size=CHUNK_SIZE, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LeaveTracker', '0011_holiday_request_fallback_review'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_leave_ledger, migrations.RunPython.noop),
+    ]
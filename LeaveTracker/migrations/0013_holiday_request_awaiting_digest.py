@@ -0,0 +1,42 @@
+# Generated by Django 5.2.4 on 2026-10-18 21:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def flag_undigested_requests(apps, schema_editor):
+    # Pending requests submitted in digest mode since the last window-based run
+    if getattr(settings, 'LEAVE_NOTIFICATION_MODE', 'immediate') != 'digest':
+        return
+    HolidayRequest = apps.get_model('LeaveTracker', 'HolidayRequest')
+    ReviewDigestRun = apps.get_model('LeaveTracker', 'ReviewDigestRun')
+    last_run = ReviewDigestRun.objects.order_by('-window_end').first()
+    requests = HolidayRequest.objects.filter(status='pending', deleted__isnull=True)
+    if last_run:
+        requests = requests.filter(created_at__gt=last_run.window_end)
+    requests.update(awaiting_digest=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LeaveTracker', '0012_backfill_leave_ledger'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='holidayrequest',
+            name='holidayreq_status_created_idx',
+        ),
+        migrations.AddField(
+            model_name='holidayrequest',
+            name='awaiting_digest',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='holidayrequest',
+            index=models.Index(fields=['awaiting_digest'], name='holidayreq_awaiting_digest_idx'),
+        ),
+        migrations.RunPython(flag_undigested_requests, migrations.RunPython.noop),
+    ]
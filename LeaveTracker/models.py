@@ -4,6 +4,7 @@ from datetime import date
 from django.db.models.signals import pre_save
 from django.dispatch import receiver
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 def current_year():
     return date.today().year
@@ -46,23 +47,8 @@ class Employee(models.Model):
         SpecialHolidayTypes, through='SpecialHolidayUsage')
 
     def remaining_holidays(self):
-        current_year_holidays = self.annual_holidays
-        previous_years_unused = 0
-
-        for request in self.holidayrequest_set.filter(status='approved'):
-            if request.end_date.year < current_year():
-                days_in_previous_year = (
-                    request.end_date - request.start_date).days + 1
-                previous_years_unused += days_in_previous_year
-
-        for request in self.holidayrequest_set.filter(status='pending'):
-            if request.start_date.year == current_year():
-                days_in_current_year = (
-                    request.end_date - request.start_date).days + 1
-                current_year_holidays -= days_in_current_year
-
-        total_holidays = current_year_holidays + previous_years_unused
-        return total_holidays
+        # Running total kept in step with the leave ledger on every transition
+        return self.available_holidays
 
     def __str__(self):
         return self.user.username
@@ -72,6 +58,25 @@ class Employee(models.Model):
         db_table = 'Employee'
 
 
+class EmployeeHierarchy(models.Model):
+    """
+    Closure table of Employee.manager: one row per (ancestor, descendant)
+    pair at any depth, including each employee with itself at depth 0.
+    Maintained by LeaveTracker.signals.org_hierarchy.
+    """
+    ancestor = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='descendant_links')
+    descendant = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='ancestor_links')
+    depth = models.PositiveSmallIntegerField()
+
+    def __str__(self):
+        return f"{self.ancestor} > {self.descendant} ({self.depth})"
+
+    class Meta:
+        default_permissions = ()
+        unique_together = ('ancestor', 'descendant')
+        db_table = 'EmployeeHierarchy'
+
+
 class SpecialHolidayUsage(models.Model):
     employee = models.ForeignKey(Employee, on_delete=models.CASCADE)
     year = models.IntegerField(default=current_year)
@@ -95,6 +100,10 @@ class SpecialHolidayUsage(models.Model):
     class Meta:
         default_permissions = ()
         unique_together = ['employee', 'holiday_type', 'year']
+        indexes = [
+            # Year-wide usage reports; per-employee lookups use the unique index
+            models.Index(fields=['year', 'holiday_type'], name='specialusage_year_type_idx'),
+        ]
         db_table = 'SpecialHolidayUsage'
 
 
@@ -112,6 +121,12 @@ class HolidayRequest(models.Model):
     status = models.CharField(
         max_length=10, choices=STATUS_CHOICES, default='pending')
     user_group = models.CharField(max_length=255, blank=True)
+    # Resolved when the request is created, see LeaveTracker.services.review_routing
+    reviewer = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name='holiday_requests_to_review')
+    # Set instead of a reviewer when no manager could be found, putting the
+    # request in the fallback reviewer group's shared queue
+    fallback_review = models.BooleanField(default=False)
     reset = models.BooleanField(default=False)
     deleted = models.DateTimeField(null=True)
     deleted_by = models.ForeignKey(
@@ -127,6 +142,9 @@ class HolidayRequest(models.Model):
         User, on_delete=models.SET_NULL, null=True, related_name='holiday_requests_rejected')
     approved_at = models.DateTimeField(null=True)
     rejected_at = models.DateTimeField(null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    # Set on requests submitted in digest mode until a digest run claims them
+    awaiting_digest = models.BooleanField(default=False)
 
     def __str__(self):
         return f"{self.employee.user.username} - {self.start_date} to {self.end_date}"
@@ -170,6 +188,19 @@ class HolidayRequest(models.Model):
             ("view_special_holiday_usage_managed",
              "Can view special holiday usage for managed employees"),
         ]
+        indexes = [
+            # Per-employee lookups and the overlap check in clean()
+            models.Index(fields=['employee', 'status', 'deleted', 'start_date', 'end_date'],
+                         name='holidayreq_emp_status_idx'),
+            # Review queues (paged on start_date) and pending counts per reviewer
+            models.Index(fields=['reviewer', 'status', 'start_date'], name='holidayreq_reviewer_status_idx'),
+            # The fallback queue, paged and counted the same way
+            models.Index(fields=['fallback_review', 'status', 'start_date'], name='holidayreq_fallback_idx'),
+            # Calendar ranges and yearly exports across all employees
+            models.Index(fields=['status', 'start_date', 'end_date'], name='holidayreq_status_dates_idx'),
+            # Requests the next review digest claims
+            models.Index(fields=['awaiting_digest'], name='holidayreq_awaiting_digest_idx'),
+        ]
         db_table = 'HolidayRequest'
     def clean(self):
         super().clean()
@@ -213,6 +244,9 @@ class PublicHoliday(models.Model):
         default_permissions = ()
         db_table = 'PublicHoliday'
         unique_together = ('name', 'date', 'country_code')
+        indexes = [
+            models.Index(fields=['country_code', 'date'], name='publicholiday_country_date_idx'),
+        ]
         
 
 class PublicHolidayFetchConfig(models.Model):
@@ -226,4 +260,133 @@ class PublicHolidayFetchConfig(models.Model):
     
     class Meta:
         default_permissions = ()
-        db_table = 'PublicHolidayConfig'
\ No newline at end of file
+        db_table = 'PublicHolidayConfig'
+
+class HolidayRollover(models.Model):
+    year = models.IntegerField(unique=True)
+    employees_processed = models.IntegerField(default=0)
+    duration_seconds = models.FloatField(default=0)
+    completed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Rollover {self.year}"
+
+    class Meta:
+        default_permissions = ()
+        db_table = 'HolidayRollover'
+
+
+class EmailOutbox(models.Model):
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    )
+
+    subject = models.CharField(max_length=255)
+    to_email = models.EmailField()
+    html_template = models.CharField(max_length=255)
+    text_template = models.CharField(max_length=255, blank=True)
+    context = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.status})"
+
+    class Meta:
+        default_permissions = ()
+        verbose_name_plural = "Email outbox"
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='emailoutbox_due_idx'),
+        ]
+        db_table = 'EmailOutbox'
+
+
+class ReviewDigestRun(models.Model):
+    window_start = models.DateTimeField()
+    window_end = models.DateTimeField(unique=True)
+    reviewers_notified = models.IntegerField(default=0)
+    requests_included = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Digest {self.window_start:%Y-%m-%d %H:%M} - {self.window_end:%Y-%m-%d %H:%M}"
+
+    class Meta:
+        default_permissions = ()
+        db_table = 'ReviewDigestRun'
+
+
+class LeaveLedgerEntry(models.Model):
+    KIND_CHOICES = (
+        ('grant', 'Grant'),
+        ('reserve', 'Reserve'),
+        ('release', 'Release'),
+        ('consume', 'Consume'),
+        ('refund', 'Refund'),
+    )
+
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE)
+    year = models.IntegerField()
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    days = models.IntegerField()
+    holiday_request = models.ForeignKey(
+        HolidayRequest, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.employee} {self.kind} {self.days} ({self.year})"
+
+    class Meta:
+        default_permissions = ()
+        verbose_name_plural = "Leave ledger entries"
+        indexes = [
+            models.Index(fields=['employee', 'year', 'created_at'], name='ledger_emp_year_created_idx'),
+        ]
+        db_table = 'LeaveLedgerEntry'
+
+
+class LeaveBalance(models.Model):
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE)
+    year = models.IntegerField()
+    granted = models.IntegerField(default=0)
+    reserved = models.IntegerField(default=0)
+    consumed = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def available(self):
+        return self.granted - self.reserved - self.consumed
+
+    def __str__(self):
+        return f"{self.employee} {self.year}: {self.available} available"
+
+    class Meta:
+        default_permissions = ()
+        unique_together = ['employee', 'year']
+        db_table = 'LeaveBalance'
+
+
+class LeaveDay(models.Model):
+    """One row per employee per working day covered by an active request."""
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE)
+    holiday_request = models.ForeignKey(HolidayRequest, on_delete=models.CASCADE)
+    date = models.DateField()
+    status = models.CharField(max_length=10, choices=HolidayRequest.STATUS_CHOICES)
+    is_special = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f"{self.employee} off on {self.date} ({self.status})"
+
+    class Meta:
+        default_permissions = ()
+        unique_together = ['holiday_request', 'date']
+        indexes = [
+            # Daily absence counts and "who is out" lookups
+            models.Index(fields=['date', 'status', 'employee'], name='leaveday_date_status_idx'),
+        ]
+        db_table = 'LeaveDay'
@@ -0,0 +1,48 @@
+from datetime import date
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
+from LeaveTracker.models import HolidayRequest, SpecialHolidayTypes
+from LeaveTracker.services.team_calendar import get_team_calendar
+from LeaveTracker.utils.date_utils import get_month_range
+
+
+def get_quarter_range(year, month):
+    """First and last day of the quarter holding the month, the range scripts.js loads at a time."""
+    first_month = (month - 1) // 3 * 3 + 1
+    return date(year, first_month, 1), get_month_range(year, first_month + 2)[1]
+
+
+def get_dashboard_bootstrap(user, employee, start_date, end_date, year):
+    """
+    Everything the home page calendar needs, so it is rendered inline or
+    fetched in one round trip instead of four: the employee's balance, their
+    open requests for the overlap check, their special leave usage per type
+    in `year` and the team calendar between the dates.
+    """
+    existing_holidays = HolidayRequest.objects.filter(
+        employee=employee, status__in=['pending', 'approved'], deleted__isnull=True
+    ).order_by('start_date').values_list('start_date', 'end_date')
+
+    # One grouped LEFT JOIN instead of a usage lookup per type
+    special_usage = SpecialHolidayTypes.objects.annotate(used_days=Coalesce(Sum(
+        'specialholidayusage__days_used',
+        filter=Q(specialholidayusage__employee=employee, specialholidayusage__year=year)
+    ), 0)).values_list('id', 'max_days', 'used_days')
+
+    calendar = get_team_calendar(user, start_date, end_date)
+    return {
+        'available_holidays': employee.available_holidays,
+        'existing_holidays': [
+            {'start_date': hr_start.isoformat(), 'end_date': hr_end.isoformat()}
+            for hr_start, hr_end in existing_holidays
+        ],
+        'special_usage': {
+            str(type_id): {'max_days': max_days, 'used_days': used_days}
+            for type_id, max_days, used_days in special_usage
+        },
+        'calendar': {
+            'from': start_date.isoformat(),
+            'to': end_date.isoformat(),
+            **calendar,
+        },
+    }
@@ -0,0 +1,126 @@
+import hashlib
+import time
+from django.core.cache import cache
+from django.db import transaction
+from LeaveTracker.models import Employee
+from LeaveTracker.services.org_hierarchy import get_hierarchy_version
+from LeaveTracker.services.permission_cache import _snapshot_key
+from LeaveTracker.utils.shared_cache import shared_cache_enabled
+
+# Bumped by bulk writes that bypass the model signals; part of every ETag
+GLOBAL_SCOPE = "all"
+# Public holidays and events, which every calendar shows whatever the country
+CALENDAR_SCOPE = "calendar"
+# Names and team membership shown next to other people's leave
+DIRECTORY_SCOPE = "directory"
+# The set of years any request starts in
+REQUEST_YEARS_SCOPE = "request_years"
+
+# Template fragments are keyed on their data versions, so the TTL only
+# bounds how long unused entries linger
+FRAGMENT_CACHE_TTL = 24 * 60 * 60
+
+
+def get_fragment_cache_ttl():
+    """The {% cache %} timeout; 0 renders fragments without caching them."""
+    return FRAGMENT_CACHE_TTL if shared_cache_enabled() else 0
+
+
+def employee_scope(employee_id):
+    return f"employee:{employee_id}"
+
+
+def month_scopes(start_date, end_date):
+    """One scope per calendar month touched by the date range."""
+    scopes = []
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        scopes.append(f"month:{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return scopes
+
+
+def _version_key(scope):
+    return f"data_version:{scope}"
+
+
+def get_data_versions(scopes):
+    """
+    Current version of each scope, in order. A scope first seen (or evicted)
+    starts from the clock rather than from 1, so it can never come back to a
+    version an ETag was already built from.
+    """
+    keys = [_version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns() // 1000, None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_data_versions(scopes):
+    """Move the given scopes to a new version once the transaction commits."""
+    keys = [_version_key(scope) for scope in set(scopes)]
+
+    def apply():
+        for key in keys:
+            try:
+                cache.incr(key)
+            except ValueError:
+                pass  # Not set yet; the next read starts it from the clock
+
+    transaction.on_commit(apply)
+
+
+def invalidate_data_versions():
+    """Expire every ETag, for bulk writes that bypass the signals."""
+    bump_data_versions([GLOBAL_SCOPE])
+
+
+def get_fragment_stamp(scopes):
+    """A {% cache %} vary_on value that changes whenever one of the scopes does."""
+    scopes = [GLOBAL_SCOPE, *scopes]
+    return ",".join(f"{scope}={version}" for scope, version in zip(scopes, get_data_versions(scopes)))
+
+
+def get_employee_id(user):
+    """The id of the user's employee profile, cached as it never changes."""
+    key = f"employee_id:{user.pk}"
+    employee_id = cache.get(key)
+    if employee_id is None:
+        employee_id = Employee.objects.filter(user=user).values_list('id', flat=True).first()
+        if employee_id is not None:
+            cache.set(key, employee_id, None)
+    return employee_id
+
+
+def forget_employee_id(user_id):
+    cache.delete(f"employee_id:{user_id}")
+
+
+def data_etag(request, scopes):
+    """
+    An ETag for a response built from the given data version scopes. The
+    request parameters, the user and their permission and hierarchy
+    versions are folded in, so it is only reused for the same answer.
+    None (no ETag, no 304) without a shared cache.
+    """
+    if not shared_cache_enabled():
+        return None
+    parts = [
+        request.path,
+        request.GET.urlencode(),
+        _snapshot_key(request.user),
+        str(get_hierarchy_version()),
+        *map(str, get_data_versions([GLOBAL_SCOPE, *scopes])),
+    ]
+    return hashlib.md5("|".join(parts).encode()).hexdigest()
+
+
+def employee_etag(request, *args, **kwargs):
+    """etag_func for responses that only depend on the user's own employee data."""
+    employee_id = get_employee_id(request.user)
+    if employee_id is None:
+        return None
+    return data_etag(request, [employee_scope(employee_id)])
@@ -0,0 +1,111 @@
+import threading
+import time
+from datetime import date, timedelta
+from LeaveTracker.models import Event, PublicHoliday
+from LeaveTracker.services.data_versions import CALENDAR_SCOPE, get_data_versions
+from LeaveTracker.utils.date_utils import SortedHolidays, count_business_days, prepare_holidays
+from LeaveTracker.utils.shared_cache import shared_cache_enabled
+
+# Without a shared cache, how long another worker's calendar change can go
+# unseen here
+CALENDAR_CACHE_TTL = 60
+
+# Process-level cache of holiday calendars keyed by (country_code, year),
+# holding (calendar version, loaded at, calendar). Entries are dropped on
+# commit by the receivers in LeaveTracker.signals.holiday_calendar, and
+# ignored once the CALENDAR_SCOPE data version moves on in another worker.
+_calendars = {}
+_stats = {'hits': 0, 'misses': 0}
+_lock = threading.Lock()
+# Bumped by every invalidation, so a load that raced one is not stored
+_generation = 0
+
+
+def _load_calendar(country_code, year):
+    year_start, year_end = date(year, 1, 1), date(year, 12, 31)
+
+    days = set(PublicHoliday.objects.filter(
+        country_code=country_code,
+        date__year=year
+    ).values_list('date', flat=True))
+
+    # Company-wide events apply to every country and may span several days
+    events = Event.objects.filter(
+        start_date__lte=year_end,
+        end_date__gte=year_start
+    ).values_list('start_date', 'end_date')
+
+    for start_date, end_date in events:
+        day = max(start_date, year_start)
+        while day <= min(end_date, year_end):
+            days.add(day)
+            day += timedelta(days=1)
+
+    return prepare_holidays(days)
+
+
+def get_holiday_calendar(country_code, year):
+    """
+    Return the sorted holiday dates (public holidays plus company events)
+    observed in the given country and year.
+    """
+    key = (country_code, int(year))
+    version = get_data_versions([CALENDAR_SCOPE])[0]
+    now = time.monotonic()
+    with _lock:
+        entry = _calendars.get(key)
+        if entry is not None and entry[0] == version and (
+                shared_cache_enabled() or now - entry[1] < CALENDAR_CACHE_TTL):
+            _stats['hits'] += 1
+            return entry[2]
+        _stats['misses'] += 1
+        generation = _generation
+
+    calendar = _load_calendar(*key)
+    with _lock:
+        if _generation == generation:
+            _calendars[key] = (version, now, calendar)
+    return calendar
+
+
+def get_holidays_between(country_code, start_date, end_date):
+    if start_date.year == end_date.year:
+        return get_holiday_calendar(country_code, start_date.year)
+
+    days = []
+    for year in range(start_date.year, end_date.year + 1):
+        days.extend(get_holiday_calendar(country_code, year))
+    return SortedHolidays(days)
+
+
+def count_working_days(country_code, start_date, end_date):
+    if start_date > end_date:
+        return 0
+    return count_business_days(
+        start_date, end_date, get_holidays_between(country_code, start_date, end_date)
+    )
+
+
+def invalidate_holiday_calendar(country_code=None, year=None):
+    global _generation
+    with _lock:
+        _generation += 1
+        for key in list(_calendars):
+            if (country_code is None or key[0] == country_code) and (year is None or key[1] == year):
+                del _calendars[key]
+
+
+def get_calendar_cache_stats():
+    with _lock:
+        return {
+            'hits': _stats['hits'],
+            'misses': _stats['misses'],
+            'size': len(_calendars),
+        }
+
+
+def reset_calendar_cache():
+    with _lock:
+        _calendars.clear()
+        _stats['hits'] = 0
+        _stats['misses'] = 0
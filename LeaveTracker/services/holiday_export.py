@@ -1,50 +1,125 @@
+import csv
+import json
+import os
+import tempfile
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font
 from LeaveTracker.models import HolidayRequest
 
-def generate_holiday_export_workbook(user, year):
-    can_view_all = user.has_perm('LeaveTracker.view_all_employees')
-    can_view_some = user.has_perm('LeaveTracker.view_holiday')
+EXPORT_HEADER = ["Employee", "Start Date", "End Date", "Days Taken", "Holiday Type"]
 
-    if not (can_view_all or can_view_some):
-        return None, "You don't have permission to export holiday data."
+EXPORT_FORMATS = {
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+}
 
-    try:
-        year = int(year)
-    except (TypeError, ValueError):
-        return None, "Invalid year parameter."
-
-    # Create workbook
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Holidays"
 
-    # Header
-    header = ["Employee", "Start Date", "End Date", "Days Taken", "Holiday Type"]
-    ws.append(header)
-    for cell in ws[1]:
-        cell.font = Font(bold=True)
-
-    # Query holidays
-    holidays = HolidayRequest.objects.select_related('employee__user', 'special_type').filter(
+def iter_holiday_export_rows(year, chunk_size=2000):
+    """
+    Yield one export row per approved holiday of the year, reading the
+    database in chunks so memory does not grow with the number of rows.
+    """
+    holidays = HolidayRequest.objects.filter(
         status='approved',
         deleted__isnull=True,
         start_date__year=year
+    ).order_by('start_date', 'id').values_list(
+        'employee__user__first_name',
+        'employee__user__last_name',
+        'start_date',
+        'end_date',
+        'days_taken',
+        'is_special',
+        'special_type__name',
     )
 
-    for holiday in holidays:
+    for first_name, last_name, start_date, end_date, days_taken, is_special, special_type in holidays.iterator(chunk_size=chunk_size):
         holiday_type = (
-            f"Special Holiday - {holiday.special_type.name}"
-            if holiday.is_special and holiday.special_type else
+            f"Special Holiday - {special_type}"
+            if is_special and special_type else
             "Regular Holiday"
         )
-
-        ws.append([
-            holiday.employee.user.get_full_name(),
-            holiday.start_date.strftime("%Y-%m-%d"),
-            holiday.end_date.strftime("%Y-%m-%d"),
-            holiday.days_taken,
+        yield [
+            f"{first_name} {last_name}".strip(),
+            start_date.strftime("%Y-%m-%d"),
+            end_date.strftime("%Y-%m-%d"),
+            days_taken,
             holiday_type
-        ])
+        ]
+
+
+class _Echo:
+    """File-like object whose write() returns the value for csv.writer."""
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_ndjson(rows):
+    keys = [name.lower().replace(' ', '_') for name in EXPORT_HEADER]
+    for row in rows:
+        yield json.dumps(dict(zip(keys, row))) + "\n"
+
+
+def stream_xlsx(rows, chunk_size=64 * 1024):
+    # Write-only worksheets flush rows to disk as they are appended
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Holidays")
+
+    header = []
+    for title in EXPORT_HEADER:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.font = Font(bold=True)
+        header.append(cell)
+    ws.append(header)
+
+    for row in rows:
+        ws.append(row)
+
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        wb.save(path)
+        with open(path, 'rb') as workbook_file:
+            while chunk := workbook_file.read(chunk_size):
+                yield chunk
+    finally:
+        os.remove(path)
+
+
+STREAMERS = {
+    'xlsx': stream_xlsx,
+    'csv': stream_csv,
+    'ndjson': stream_ndjson,
+}
+
+
+def generate_holiday_export_stream(user, year, export_format='xlsx'):
+    """
+    :return: ((chunks, content_type, filename), None) or (None, error message).
+    """
+    can_view_all = user.has_perm('LeaveTracker.view_all_employees')
+    can_view_some = user.has_perm('LeaveTracker.view_holiday')
+
+    if not (can_view_all or can_view_some):
+        return None, "You don't have permission to export holiday data."
+
+    try:
+        year = int(year)
+    except (TypeError, ValueError):
+        return None, "Invalid year parameter."
+
+    if export_format not in EXPORT_FORMATS:
+        return None, f"Unsupported export format. Choose one of: {', '.join(EXPORT_FORMATS)}."
 
-    return wb, None
+    content_type, extension = EXPORT_FORMATS[export_format]
+    chunks = STREAMERS[export_format](iter_holiday_export_rows(year))
+    return (chunks, content_type, f"holidays_{year}.{extension}"), None
@@ -1,9 +1,13 @@
-from LeaveTracker.models import HolidayRequest, Employee
+from LeaveTracker.models import HolidayRequest
+from LeaveTracker.services.org_hierarchy import manages
 from django.db.models import Value, CharField, Case, When
 from django.db.models.functions import Concat
+from LeaveTracker.utils.pagination import APPROXIMATE_COUNT_LIMIT, InvalidCursor, keyset_paginate
 
+FILTERED_HOLIDAY_FIELDS = ('full_name', 'start_date', 'end_date', 'days_taken', 'leave_type', 'id')
 
-def get_filtered_holidays(user, employee_id, year):
+
+def _filtered_holidays(user, employee_id, year):
     can_filter_all = user.has_perm('LeaveTracker.filter_holidays_all')
     can_filter_managed = user.has_perm('LeaveTracker.filter_holidays_managed')
 
@@ -37,16 +41,42 @@ def get_filtered_holidays(user, employee_id, year):
     )
 
     # Apply managed employee restriction
-    if not can_filter_all:
-        try:
-            manager = Employee.objects.get(user=user)
-        except Employee.DoesNotExist:
-            return None, "You must be linked to an employee profile."
-        queryset = queryset.filter(employee__manager=manager)
-
-    results = queryset.order_by('full_name').values_list(
-        'full_name', 'start_date', 'end_date', 'days_taken', 'leave_type', 'id'
-    )
+    if not can_filter_all and not manages(user, employee_id):
+        queryset = queryset.none()
+
+    return queryset, None
+
+
+def get_filtered_holidays(user, employee_id, year):
+    queryset, error_msg = _filtered_holidays(user, employee_id, year)
+    if error_msg:
+        return None, error_msg
+
+    results = queryset.order_by('full_name').values_list(*FILTERED_HOLIDAY_FIELDS)
 
     data = [list(row) + ["placeholder"] for row in results]  # Placeholder column for JS
     return data, None
+
+
+def get_filtered_holidays_page(user, employee_id, year, cursor=None, per_page=50):
+    """
+    One keyset page of get_filtered_holidays, ordered on (start_date, id),
+    with the rows as dicts and a total counted up to APPROXIMATE_COUNT_LIMIT.
+    """
+    queryset, error_msg = _filtered_holidays(user, employee_id, year)
+    if error_msg:
+        return None, error_msg
+
+    try:
+        page = keyset_paginate(queryset.values(*FILTERED_HOLIDAY_FIELDS), cursor, per_page,
+                               count_limit=APPROXIMATE_COUNT_LIMIT)
+    except InvalidCursor as e:
+        return None, str(e)
+
+    return {
+        'results': page.object_list,
+        'next_cursor': page.next_cursor,
+        'previous_cursor': page.previous_cursor,
+        'count': page.count,
+        'count_capped': page.count_capped,
+    }, None
@@ -1,44 +1,223 @@
+from collections import Counter, defaultdict
 from django.utils import timezone
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
 from django.shortcuts import get_object_or_404
-from LeaveTracker.models import HolidayRequest, SpecialHolidayUsage
-from LeaveTracker.emails.notifications import send_employee_notification
+from LeaveTracker.models import (
+    Employee,
+    HolidayRequest,
+    LeaveDay,
+    LeaveLedgerEntry,
+    SpecialHolidayUsage,
+)
+from LeaveTracker.emails.notifications import send_employee_notification, send_employee_notifications
+from LeaveTracker.services.data_versions import bump_data_versions, employee_scope, month_scopes
+from LeaveTracker.services.leave_ledger import record_ledger_entries, record_request_transition
+from LeaveTracker.services.pending_counters import adjust_pending_counts, pending_scopes
+from LeaveTracker.services.review_routing import reviews_fallback_queue
+
+
+def _get_reviewable_request(user, request_id):
+    """
+    Lock a request the user may review. Requests that are no longer pending,
+    were deleted (and so already gave their days back) or are routed to
+    someone else are a 404, like in the bulk review.
+    """
+    return get_object_or_404(get_reviewable_requests(user).select_for_update(), id=request_id)
 
 
 def approve_holiday_request(user, request_id):
-    holiday_request = get_object_or_404(HolidayRequest, id=request_id)
+    with transaction.atomic():
+        holiday_request = _get_reviewable_request(user, request_id)
+
+        holiday_request.status = 'approved'
+        holiday_request.approved_by = user
+        holiday_request.approved_at = timezone.now()
+        holiday_request.save()
 
-    holiday_request.status = 'approved'
-    holiday_request.approved_by = user
-    holiday_request.approved_at = timezone.now()
-    holiday_request.save()
+        record_request_transition(holiday_request, 'consume')
 
     send_employee_notification(holiday_request.employee.user.email, is_approved=True)
     return holiday_request
 
 
 def reject_holiday_request(user, request_id):
-    holiday_request = get_object_or_404(HolidayRequest, id=request_id)
-
-    holiday_request.status = 'rejected'
-    holiday_request.rejected_by = user
-    holiday_request.rejected_at = timezone.now()
-    holiday_request.save()
-
-    employee = holiday_request.employee
-    days_rejected = holiday_request.days_taken
-
-    if holiday_request.is_special and holiday_request.special_type:
-        year = holiday_request.start_date.year
-        usage, _ = SpecialHolidayUsage.objects.get_or_create(
-            employee=employee,
-            holiday_type=holiday_request.special_type,
-            year=year
+    with transaction.atomic():
+        holiday_request = _get_reviewable_request(user, request_id)
+
+        holiday_request.status = 'rejected'
+        holiday_request.rejected_by = user
+        holiday_request.rejected_at = timezone.now()
+        holiday_request.save()
+
+        employee = holiday_request.employee
+        days_rejected = holiday_request.days_taken
+
+        if holiday_request.is_special and holiday_request.special_type:
+            year = holiday_request.start_date.year
+            usage, _ = SpecialHolidayUsage.objects.get_or_create(
+                employee=employee,
+                holiday_type=holiday_request.special_type,
+                year=year
+            )
+            usage.days_used = max(usage.days_used - days_rejected, 0)
+            usage.save()
+        else:
+            Employee.objects.filter(id=employee.id).update(
+                available_holidays=F('available_holidays') + days_rejected
+            )
+            record_request_transition(holiday_request, 'release')
+
+    send_employee_notification(employee.user.email, is_approved=False)
+    return holiday_request
+
+
+# Upper bound on the ids a single bulk review may touch
+MAX_BULK_REVIEW = 5000
+BULK_REVIEW_CHUNK = 500
+
+
+def get_reviewable_requests(user):
+    """
+    Pending requests the user may review: every one, or those routed to
+    them plus, for the fallback reviewer group, the fallback queue.
+    """
+    if user.has_perm('LeaveTracker.review_holiday_requests_all'):
+        return HolidayRequest.objects.filter(status='pending', deleted__isnull=True)
+    if user.has_perm('LeaveTracker.review_holiday_requests_managed'):
+        routed = Q(reviewer=user)
+        if reviews_fallback_queue(user):
+            routed |= Q(fallback_review=True)
+        return HolidayRequest.objects.filter(routed, status='pending', deleted__isnull=True)
+    return HolidayRequest.objects.none()
+
+
+def _apply_special_usage_changes(changes):
+    """Give back special leave days, one locked read and one bulk_update."""
+    if not changes:
+        return
+    usage_filter = Q()
+    for employee_id, type_id, year in changes:
+        usage_filter |= Q(employee_id=employee_id, holiday_type_id=type_id, year=year)
+
+    usages = list(SpecialHolidayUsage.objects.select_for_update().filter(usage_filter))
+    for usage in usages:
+        usage.days_used = max(usage.days_used - changes[(usage.employee_id, usage.holiday_type_id, usage.year)], 0)
+    SpecialHolidayUsage.objects.bulk_update(usages, ['days_used'])
+
+
+def _apply_available_holiday_changes(changes):
+    """Refund regular days to many employees with one UPDATE per chunk."""
+    changes = list(changes.items())
+    for offset in range(0, len(changes), BULK_REVIEW_CHUNK):
+        chunk = dict(changes[offset:offset + BULK_REVIEW_CHUNK])
+        Employee.objects.filter(id__in=chunk).update(available_holidays=F('available_holidays') + Case(
+            *[When(id=employee_id, then=Value(days)) for employee_id, days in chunk.items()],
+            output_field=IntegerField()
+        ))
+
+
+def review_holiday_requests(user, request_ids, action):
+    """
+    Approve or reject many pending requests in one transaction. Rows are
+    locked in id order, so concurrent bulk reviews cannot deadlock, and the
+    status, balance, ledger, leave day, counter and email side effects are
+    each written in bulk.
+
+    :return: (results, error_msg). results holds one {'id', 'outcome'} per
+             requested id, outcome being 'approved', 'rejected', 'not_found',
+             'forbidden' or 'not_pending'.
+    """
+    if action not in ('approve', 'reject'):
+        return None, "Action must be approve or reject."
+    try:
+        request_ids = sorted({int(request_id) for request_id in request_ids})
+    except (TypeError, ValueError):
+        return None, "Request ids must be integers."
+    if not request_ids:
+        return None, "No requests given."
+    if len(request_ids) > MAX_BULK_REVIEW:
+        return None, f"At most {MAX_BULK_REVIEW} requests can be reviewed at once."
+
+    now = timezone.now()
+    new_status = 'approved' if action == 'approve' else 'rejected'
+    outcomes = {}
+    reviewed = []
+
+    with transaction.atomic():
+        for offset in range(0, len(request_ids), BULK_REVIEW_CHUNK):
+            chunk = request_ids[offset:offset + BULK_REVIEW_CHUNK]
+            locked = list(HolidayRequest.objects.select_for_update(of=('self',)).filter(
+                id__in=chunk
+            ).select_related('employee__user').order_by('id'))
+            allowed = set(get_reviewable_requests(user).filter(id__in=chunk).values_list('id', flat=True))
+
+            for holiday_request in locked:
+                if holiday_request.status != 'pending' or holiday_request.deleted is not None:
+                    outcomes[holiday_request.id] = 'not_pending'
+                elif holiday_request.id not in allowed:
+                    outcomes[holiday_request.id] = 'forbidden'
+                else:
+                    outcomes[holiday_request.id] = new_status
+                    reviewed.append(holiday_request)
+
+        for holiday_request in reviewed:
+            holiday_request.status = new_status
+            if action == 'approve':
+                holiday_request.approved_by = user
+                holiday_request.approved_at = now
+            else:
+                holiday_request.rejected_by = user
+                holiday_request.rejected_at = now
+        HolidayRequest.objects.bulk_update(
+            reviewed,
+            ['status', 'approved_by', 'approved_at'] if action == 'approve' else ['status', 'rejected_by', 'rejected_at'],
+            batch_size=BULK_REVIEW_CHUNK
         )
-        usage.days_used = max(usage.days_used - days_rejected, 0)
-        usage.save()
+
+        _apply_side_effects(reviewed, action)
+
+    results = [{'id': request_id, 'outcome': outcomes.get(request_id, 'not_found')} for request_id in request_ids]
+    return results, None
+
+
+def _apply_side_effects(reviewed, action):
+    # bulk_update skips the post_save receivers, so their work is done here in bulk
+    regular = [hr for hr in reviewed if not (hr.is_special and hr.special_type_id)]
+    reviewed_ids = [hr.id for hr in reviewed]
+
+    if action == 'approve':
+        LeaveDay.objects.filter(holiday_request_id__in=reviewed_ids).update(status='approved')
+        ledger_kind = 'consume'
     else:
-        employee.available_holidays += days_rejected
-        employee.save()
+        LeaveDay.objects.filter(holiday_request_id__in=reviewed_ids).delete()
+        ledger_kind = 'release'
 
-    send_employee_notification(employee.user.email, is_approved=False)
-    return holiday_request
\ No newline at end of file
+        refunds = defaultdict(int)
+        special_refunds = defaultdict(int)
+        for hr in reviewed:
+            if hr.is_special and hr.special_type_id:
+                special_refunds[(hr.employee_id, hr.special_type_id, hr.start_date.year)] += hr.days_taken
+            else:
+                refunds[hr.employee_id] += hr.days_taken
+        _apply_available_holiday_changes(refunds)
+        _apply_special_usage_changes(special_refunds)
+
+    record_ledger_entries([
+        LeaveLedgerEntry(employee_id=hr.employee_id, year=hr.start_date.year, kind=ledger_kind,
+                         days=hr.days_taken, holiday_request_id=hr.id)
+        for hr in regular
+    ])
+
+    for scopes, count in Counter(tuple(pending_scopes(hr.reviewer_id, hr.fallback_review)) for hr in reviewed).items():
+        adjust_pending_counts(scopes, -count)
+
+    data_scopes = set()
+    for hr in reviewed:
+        data_scopes.add(employee_scope(hr.employee_id))
+        data_scopes.update(month_scopes(hr.start_date, hr.end_date))
+    bump_data_versions(data_scopes)
+
+    send_employee_notifications(
+        (hr.employee.user.email, action == 'approve') for hr in reviewed
+    )
@@ -2,17 +2,57 @@ from datetime import date
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import F
 from LeaveTracker.models import (
     HolidayRequest,
     Employee,
     SpecialHolidayTypes,
     SpecialHolidayUsage,
-    PublicHoliday,
 )
-from LeaveTracker.utils.date_utils import count_non_weekend_and_non_holiday_days
+from LeaveTracker.services.holiday_calendar import count_working_days
+from LeaveTracker.services.leave_ledger import record_request_transition
+from LeaveTracker.services.permission_cache import get_group_names
+
+
+class SubmissionRejected(Exception):
+    """Raised inside the submission transaction to roll back what it reserved."""
+
+
+def _reserve_regular_days(employee, days):
+    # The guard makes the check and the decrement one statement, so
+    # concurrent submissions can neither overdraw nor lose an update
+    reserved = Employee.objects.filter(
+        id=employee.id, available_holidays__gte=days
+    ).update(available_holidays=F('available_holidays') - days)
+    if not reserved:
+        raise SubmissionRejected("You don't have enough available holidays.")
+
+
+def _reserve_special_days(employee, special_type, year, days):
+    # Create the usage row if it is missing, without racing a concurrent
+    # first submission, then add to it under the same kind of guard
+    SpecialHolidayUsage.objects.bulk_create([SpecialHolidayUsage(
+        employee=employee, holiday_type=special_type, year=year, days_used=0
+    )], ignore_conflicts=True)
+    reserved = SpecialHolidayUsage.objects.filter(
+        employee=employee, holiday_type=special_type, year=year,
+        days_used__lte=special_type.max_days - days
+    ).update(days_used=F('days_used') + days)
+    if not reserved:
+        raise SubmissionRejected(f"You've exceeded your allowed {special_type.name} days.")
+    # The usage row is per type, so lock the employee row as well: the
+    # overlap check on save must be serialised with the employee's regular
+    # submissions and special ones of other types
+    Employee.objects.filter(id=employee.id).update(available_holidays=F('available_holidays'))
+
 
-@transaction.atomic
 def process_holiday_submission(user, data):
+    """
+    Validate and file a holiday request. Everything that only reads (the
+    working day count, the special type, the overlap check) runs before the
+    transaction, which is left with the guarded balance or usage UPDATE, the
+    INSERT and its ledger entry.
+    """
     start_date = date.fromisoformat(data["start_date"])
     end_date = date.fromisoformat(data["end_date"])
 
@@ -24,18 +64,9 @@ def process_holiday_submission(user, data):
 
     is_special = data.get("is_special", False)
     special_type_id = data.get("special_type_id")
-    group_names_str = ",".join(user.groups.values_list("name", flat=True))
-
-    employee = Employee.objects.select_for_update().get(user=user)
-    country_code = employee.country_code
 
-    public_holidays = set(PublicHoliday.objects.filter(
-        country_code=country_code
-    ).values_list('date', flat=True))
-
-    days_requested = count_non_weekend_and_non_holiday_days(
-        start_date, end_date, public_holidays
-    )
+    employee = Employee.objects.get(user=user)
+    days_requested = count_working_days(employee.country_code, start_date, end_date)
 
     if days_requested == 0:
         return {
@@ -49,37 +80,28 @@ def process_holiday_submission(user, data):
         start_date=start_date,
         end_date=end_date,
         status="pending",
-        user_group=group_names_str,
+        user_group=",".join(sorted(get_group_names(user))),
         is_special=is_special
     )
 
+    special_type = None
     if is_special and special_type_id:
         special_type = SpecialHolidayTypes.objects.get(id=special_type_id)
         holiday_request.special_type = special_type
         year = data.get("year", timezone.now().year)
 
-        usage, created = SpecialHolidayUsage.objects.get_or_create(
-            employee=employee,
-            holiday_type=special_type,
-            year=year,
-            defaults={"days_used": 0}
-        )
-
-        if usage.days_used + days_requested > usage.holiday_type.max_days:
+        if days_requested > special_type.max_days:
             return {
                 "status": "error",
-                "message": f"You've exceeded your allowed {usage.holiday_type.name} days."
+                "message": f"You've exceeded your allowed {special_type.name} days."
             }
 
-        usage.days_used += days_requested
-        usage.save()
-
-    else:
-        if employee.available_holidays < days_requested:
-            return {
-                "status": "error",
-                "message": "You don't have enough available holidays."
-            }
+    elif employee.available_holidays < days_requested:
+        # A stale read only lets more through to the guarded UPDATE below
+        return {
+            "status": "error",
+            "message": "You don't have enough available holidays."
+        }
 
     # Let model validation run
     try:
@@ -87,10 +109,20 @@ def process_holiday_submission(user, data):
     except ValidationError as e:
         return {"status": "error", "message": str(e)}
 
-    # Save user and request
-    if not is_special:
-        employee.available_holidays -= days_requested
-        employee.save()
+    try:
+        with transaction.atomic():
+            if special_type:
+                _reserve_special_days(employee, special_type, year, days_requested)
+            else:
+                _reserve_regular_days(employee, days_requested)
+            # Saving re-runs the overlap check behind the employee row both
+            # reservations lock, which serialises it with all of the
+            # employee's other submissions
+            holiday_request.save()
+            record_request_transition(holiday_request, 'reserve')
+    except SubmissionRejected as e:
+        return {"status": "error", "message": str(e)}
+    except ValidationError as e:
+        return {"status": "error", "message": str(e)}
 
-    holiday_request.save()
-    return {"status": "success"}
\ No newline at end of file
+    return {"status": "success"}
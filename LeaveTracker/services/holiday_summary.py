@@ -1,10 +1,17 @@
+from datetime import date
 from django.db.models import Q
 from django.utils import timezone
 from LeaveTracker.models import HolidayRequest
-from LeaveTracker.utils.date_utils import count_non_weekend_and_non_holiday_days, total_days_for_queryset
-from LeaveTracker.models import HolidayRequest, Event
+from LeaveTracker.services.holiday_calendar import get_holidays_between
+from LeaveTracker.utils.date_utils import count_business_days, total_days_for_queryset
 
-def get_total_normal_holidays(employee_id, year, public_holiday_dates):
+
+def _calendar_around_year(country_code, year):
+    # Requests counted for a year may start or end in the neighbouring ones
+    return get_holidays_between(country_code, date(year - 1, 1, 1), date(year + 1, 12, 31))
+
+
+def get_total_normal_holidays(employee_id, year, country_code):
     holiday_requests = HolidayRequest.objects.filter(
         employee_id=employee_id,
         is_special=False,
@@ -13,68 +20,59 @@ def get_total_normal_holidays(employee_id, year, public_holiday_dates):
         deleted=None
     ).select_related('employee')  # Optional optimization
 
-    total_days = 0
-    for holiday in holiday_requests:
-        overlapping_holidays = [
-            date for date in public_holiday_dates
-            if holiday.start_date <= date <= holiday.end_date
-        ]
-        duration = count_non_weekend_and_non_holiday_days(
-            holiday.start_date, holiday.end_date, overlapping_holidays
-        )
-        total_days += duration
+    total_days = total_days_for_queryset(holiday_requests, _calendar_around_year(country_code, int(year)))
 
     return total_days
 
-def get_my_holiday_summary(employee, year):
-    # Load public holidays for overlap exclusion
-    public_holidays = set(Event.objects.filter(
-        start_date__year=year
-    ).values_list('start_date', flat=True))
+# Tabs of the my-holidays page, in display order
+MY_HOLIDAY_TABS = ('upcoming', 'past', 'pending', 'rejected')
+
+
+def _tab_for(holiday_request, today):
+    if holiday_request.status == 'approved':
+        return 'upcoming' if holiday_request.end_date >= today else 'past'
+    return holiday_request.status
 
-    all_requests = HolidayRequest.objects.filter(
-        employee=employee, deleted__isnull=True
-    )
 
-    # Filter by year
-    this_year_requests = all_requests.filter(
+def get_my_holiday_summary(employee, year, today=None):
+    """
+    Everything the my-holidays page shows for one year, from a single query:
+    the employee's requests touching the year, split into the page's tabs,
+    and the regular and special days held (approved or pending) counted
+    against the employee's holiday calendar in the same pass.
+    """
+    today = today or timezone.now().date()
+    public_holidays = _calendar_around_year(employee.country_code, year)
+
+    requests = HolidayRequest.objects.filter(
         Q(start_date__year=year) | Q(end_date__year=year),
-        reset=False
-    )
-
-    approved_regular = this_year_requests.filter(status="approved", is_special=False)
-    pending_regular = this_year_requests.filter(status="pending", is_special=False)
-    approved_special = this_year_requests.filter(status="approved", is_special=True)
-    pending_special = this_year_requests.filter(status="pending", is_special=True)
-
-    # Compute durations
-    holidays_taken = total_days_for_queryset(approved_regular, public_holidays) + \
-                     total_days_for_queryset(pending_regular, public_holidays)
-
-    special_holidays_taken = total_days_for_queryset(approved_special, public_holidays) + \
-                             total_days_for_queryset(pending_special, public_holidays)
-
-    # Categorized tabs
-    upcoming_approved = all_requests.filter(
-        status="approved", start_date__gte=timezone.now().date()
-    )
-    past_approved = all_requests.filter(
-        status="approved", end_date__lt=timezone.now().date()
-    )
-    pending = all_requests.filter(status="pending")
-    rejected = all_requests.filter(status="rejected")
+        employee=employee,
+        deleted__isnull=True
+    ).select_related('special_type').order_by('start_date', 'id')
+
+    tabs = {tab: [] for tab in MY_HOLIDAY_TABS}
+    holidays_taken = 0
+    special_holidays_taken = 0
+    for holiday_request in requests:
+        tabs[_tab_for(holiday_request, today)].append(holiday_request)
+
+        if holiday_request.reset or holiday_request.status not in ('approved', 'pending'):
+            continue
+        days = count_business_days(holiday_request.start_date, holiday_request.end_date, public_holidays)
+        if holiday_request.is_special:
+            special_holidays_taken += days
+        else:
+            holidays_taken += days
 
     return {
-        'all_requests': all_requests,
-        'approved_regular': approved_regular,
-        'pending_regular': pending_regular,
-        'approved_special': approved_special,
-        'pending_special': pending_special,
-        'upcoming_approved': upcoming_approved,
-        'past_approved': past_approved,
-        'pending': pending,
-        'rejected': rejected,
+        'tabs': tabs,
         'holidays_taken': holidays_taken,
         'special_holidays_taken': special_holidays_taken,
-        'public_holidays': public_holidays
-    }
\ No newline at end of file
+    }
+
+
+def get_request_years(employee):
+    """Years the employee has requests starting in, newest last."""
+    return [d.year for d in HolidayRequest.objects.filter(
+        employee=employee, deleted__isnull=True
+    ).dates('start_date', 'year')]
@@ -1,29 +1,111 @@
 
-from django.db.models import Q, Sum
+import logging
+import time
+from django.db import transaction
+from django.db.models import F, Sum
 from django.utils import timezone
-from LeaveTracker.models import Employee, HolidayRequest, SpecialHolidayTypes
+from LeaveTracker.models import (
+    Employee,
+    HolidayRequest,
+    HolidayRollover,
+    LeaveBalance,
+    LeaveLedgerEntry,
+    SpecialHolidayTypes,
+)
+from LeaveTracker.services.data_versions import invalidate_data_versions
+from LeaveTracker.services.leave_ledger import record_ledger_entries
 
-def rollover_annual_holidays():
-    today = timezone.now().date()
-    current_year = today.year
+logger = logging.getLogger('LeaveTracker')
+
+# Years whose rollover marker this process has already seen
+_completed_rollovers = set()
+# Years whose missing marker this process has already logged
+_reported_missing_rollovers = set()
+
+
+def rollover_annual_holidays(year=None, chunk_size=500):
+    """
+    Grant every employee their annual holidays for the year and mark older
+    approved requests as reset. Runs as set-based UPDATEs over chunks of
+    employee ids and records a HolidayRollover marker, so re-running it for
+    a completed year is a no-op.
 
-    employees = Employee.objects.all()
+    :return: The HolidayRollover marker and whether this call created it.
+    """
+    year = year or timezone.now().year
 
-    for employee in employees:
-        if employee.last_holiday_year_update < current_year:
-            employee.available_holidays += employee.annual_holidays
-            employee.last_holiday_year_update = current_year
-            employee.save()
+    marker = HolidayRollover.objects.filter(year=year).first()
+    if marker:
+        return marker, False
+
+    started = time.monotonic()
+    processed = 0
+    last_id = 0
+
+    while True:
+        chunk = list(Employee.objects.filter(
+            id__gt=last_id,
+            last_holiday_year_update__lt=year
+        ).order_by('id').values_list('id', flat=True)[:chunk_size])
+        if not chunk:
+            break
+        last_id = chunk[-1]
+
+        with transaction.atomic():
+            # The year guard keeps concurrent runs from granting twice
+            grants = dict(Employee.objects.select_for_update().filter(
+                id__in=chunk,
+                last_holiday_year_update__lt=year
+            ).values_list('id', 'annual_holidays'))
+            processed += Employee.objects.filter(id__in=grants).update(
+                available_holidays=F('available_holidays') + F('annual_holidays'),
+                last_holiday_year_update=year
+            )
+            record_ledger_entries([
+                LeaveLedgerEntry(employee_id=employee_id, year=year, kind='grant', days=days)
+                for employee_id, days in grants.items()
+            ])
 
             # Reset approved holidays from previous years
             HolidayRequest.objects.filter(
-                employee=employee,
+                employee_id__in=chunk,
                 status="approved",
                 reset=False,
-                start_date__year__lt=current_year,
+                start_date__year__lt=year,
                 deleted__isnull=True
             ).update(reset=True)
 
+    # The balance UPDATEs bypass the signals that expire the dashboard ETags
+    invalidate_data_versions()
+
+    marker, created = HolidayRollover.objects.get_or_create(year=year, defaults={
+        'employees_processed': processed,
+        'duration_seconds': time.monotonic() - started,
+    })
+    logger.info(f"Holiday rollover for {year}: {processed} employees in {marker.duration_seconds:.2f}s")
+    return marker, created
+
+
+def check_annual_rollover():
+    """
+    Cheap per-request check that this year's rollover has run. The work is
+    left to the rollover_holidays management command; a missing marker is
+    logged once per process and checked again on the next request.
+
+    :return: Whether the current year's rollover has run.
+    """
+    year = timezone.now().year
+    if year in _completed_rollovers:
+        return True
+
+    if not HolidayRollover.objects.filter(year=year).exists():
+        if year not in _reported_missing_rollovers:
+            _reported_missing_rollovers.add(year)
+            logger.warning(f"Holiday rollover for {year} has not run; schedule the rollover_holidays command")
+        return False
+    _completed_rollovers.add(year)
+    return True
+
 
 def get_employee_dashboard_summary(user):
     today = timezone.now().date()
@@ -35,23 +117,11 @@ def get_employee_dashboard_summary(user):
         deleted__isnull=True
     )
 
-    this_year_requests = holiday_requests.filter(
-        Q(start_date__year=current_year) | Q(end_date__year=current_year),
-        reset=False,
-        is_special=False
-    )
-
-    next_year_requests = holiday_requests.filter(
-        Q(start_date__year=current_year + 1) | Q(end_date__year=current_year + 1),
-        reset=False,
-        is_special=False
-    )
-
-    holidays_taken = 0
-    for holiday_set in [this_year_requests, next_year_requests]:
-        approved = holiday_set.filter(status="approved").aggregate(total_days=Sum('days_taken'))['total_days'] or 0
-        pending = holiday_set.filter(status="pending").aggregate(total_days=Sum('days_taken'))['total_days'] or 0
-        holidays_taken += approved + pending
+    # Reserved and consumed days for this year and next, from the balance snapshots
+    holidays_taken = LeaveBalance.objects.filter(
+        employee=employee,
+        year__in=[current_year, current_year + 1]
+    ).aggregate(total=Sum(F('reserved') + F('consumed')))['total'] or 0
 
     return {
         'employee': employee,
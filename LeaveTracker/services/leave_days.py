@@ -0,0 +1,112 @@
+from django.db import transaction
+from django.db.models import Count, Q, Value
+from django.db.models.functions import Concat
+from LeaveTracker.models import HolidayRequest, LeaveDay
+from LeaveTracker.services.holiday_calendar import get_holidays_between
+from LeaveTracker.utils.date_utils import business_days
+from LeaveTracker.utils.permissions import get_visible_employees
+
+ACTIVE_STATUSES = ('pending', 'approved')
+
+
+def _leave_days_for(holiday_request, country_code):
+    calendar = get_holidays_between(country_code, holiday_request.start_date, holiday_request.end_date)
+    return [
+        LeaveDay(
+            employee_id=holiday_request.employee_id,
+            holiday_request_id=holiday_request.id,
+            date=day,
+            status=holiday_request.status,
+            is_special=holiday_request.is_special,
+        )
+        for day in business_days(holiday_request.start_date, holiday_request.end_date, calendar)
+    ]
+
+
+@transaction.atomic
+def sync_leave_days(holiday_request):
+    """
+    Bring the LeaveDay rows of one request in line with its current state:
+    none for rejected or deleted requests, one per working day otherwise.
+    """
+    existing = LeaveDay.objects.filter(holiday_request_id=holiday_request.id)
+
+    if holiday_request.deleted is not None or holiday_request.status not in ACTIVE_STATUSES:
+        existing.delete()
+        return
+
+    country_code = holiday_request.employee.country_code
+    wanted = _leave_days_for(holiday_request, country_code)
+    current = list(existing.values_list('date', 'status', 'is_special'))
+
+    if sorted(day for day, _, _ in current) == [row.date for row in wanted]:
+        # Same days, only the status may have moved (e.g. pending -> approved)
+        if any(status != holiday_request.status or is_special != holiday_request.is_special
+               for _, status, is_special in current):
+            existing.update(status=holiday_request.status, is_special=holiday_request.is_special)
+        return
+
+    existing.delete()
+    LeaveDay.objects.bulk_create(wanted)
+
+
+@transaction.atomic
+def rebuild_leave_days(employees):
+    """
+    Recreate the LeaveDay rows of the given employees from their requests.
+
+    :return: Number of rows written.
+    """
+    employees = list(employees)
+    LeaveDay.objects.filter(employee__in=employees).delete()
+
+    countries = {employee.id: employee.country_code for employee in employees}
+    requests = HolidayRequest.objects.filter(
+        employee__in=employees,
+        status__in=ACTIVE_STATUSES,
+        deleted__isnull=True
+    ).only('id', 'employee_id', 'start_date', 'end_date', 'status', 'is_special')
+
+    rows = []
+    for holiday_request in requests.iterator(chunk_size=2000):
+        rows.extend(_leave_days_for(holiday_request, countries[holiday_request.employee_id]))
+    LeaveDay.objects.bulk_create(rows, batch_size=2000)
+    return len(rows)
+
+
+def get_absence_heatmap(user, start_date, end_date, include_pending=True):
+    """
+    Daily number of people off among the employees the user may see, from
+    one GROUP BY over LeaveDay. Days nobody is off are left out.
+    """
+    statuses = ACTIVE_STATUSES if include_pending else ('approved',)
+    rows = LeaveDay.objects.filter(
+        employee__in=get_visible_employees(user),
+        date__range=(start_date, end_date),
+        status__in=statuses
+    ).values('date').annotate(
+        absent=Count('employee', distinct=True),
+        approved=Count('employee', distinct=True, filter=Q(status='approved')),
+    ).order_by('date')
+
+    return [
+        {'date': row['date'].isoformat(), 'absent': row['absent'], 'approved': row['approved']}
+        for row in rows
+    ]
+
+
+def get_absent_employees(user, day, include_pending=True):
+    """Who among the employees the user may see is off on the given day."""
+    statuses = ACTIVE_STATUSES if include_pending else ('approved',)
+    rows = LeaveDay.objects.filter(
+        employee__in=get_visible_employees(user),
+        date=day,
+        status__in=statuses
+    ).annotate(
+        employee_name=Concat('employee__user__first_name', Value(' '), 'employee__user__last_name')
+    ).order_by('employee_name').values_list('employee_id', 'employee_name', 'status', 'is_special')
+
+    return [
+        {'employee_id': employee_id, 'employee_name': name, 'status': status, 'is_special': is_special}
+        for employee_id, name, status, is_special in rows
+    ]
@@ -0,0 +1,145 @@
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, Sum, Value, When
+from django.utils import timezone
+from LeaveTracker.models import HolidayRequest, LeaveBalance, LeaveLedgerEntry
+
+BALANCE_UPDATE_CHUNK = 200
+
+# How each entry kind moves the per-year balance snapshot
+ENTRY_EFFECTS = {
+    'grant': {'granted': 1},
+    'reserve': {'reserved': 1},
+    'release': {'reserved': -1},
+    'consume': {'reserved': -1, 'consumed': 1},
+    'refund': {'consumed': -1},
+}
+
+
+@transaction.atomic
+def record_ledger_entries(entries):
+    """
+    Append ledger entries and apply them to the (employee, year) balance
+    snapshots in the same transaction.
+
+    :param entries: Unsaved LeaveLedgerEntry instances.
+    """
+    entries = [entry for entry in entries if entry.days]
+    if not entries:
+        return []
+
+    LeaveLedgerEntry.objects.bulk_create(entries)
+
+    totals = defaultdict(lambda: defaultdict(int))
+    for entry in entries:
+        for field, sign in ENTRY_EFFECTS[entry.kind].items():
+            totals[(entry.employee_id, entry.year)][field] += sign * entry.days
+
+    LeaveBalance.objects.bulk_create(
+        [LeaveBalance(employee_id=employee_id, year=year) for employee_id, year in totals],
+        ignore_conflicts=True
+    )
+
+    # One UPDATE per chunk of balances, each field moved by a CASE on (employee, year)
+    keys = list(totals)
+    for offset in range(0, len(keys), BALANCE_UPDATE_CHUNK):
+        chunk = keys[offset:offset + BALANCE_UPDATE_CHUNK]
+        match = Q()
+        for employee_id, year in chunk:
+            match |= Q(employee_id=employee_id, year=year)
+        fields = {field for key in chunk for field in totals[key]}
+        LeaveBalance.objects.filter(match).update(
+            updated_at=timezone.now(),
+            **{
+                field: F(field) + Case(
+                    *[When(employee_id=employee_id, year=year, then=Value(totals[(employee_id, year)].get(field, 0)))
+                      for employee_id, year in chunk],
+                    default=Value(0),
+                    output_field=IntegerField()
+                )
+                for field in fields
+            }
+        )
+    return entries
+
+
+def record_ledger_entry(employee, year, kind, days, holiday_request=None):
+    return record_ledger_entries([LeaveLedgerEntry(
+        employee=employee, year=year, kind=kind, days=days, holiday_request=holiday_request
+    )])
+
+
+def record_request_transition(holiday_request, kind, days=None):
+    """Ledger entry for a regular holiday request changing state."""
+    # Special leave is tracked in SpecialHolidayUsage instead
+    if holiday_request.is_special and holiday_request.special_type_id:
+        return []
+    return record_ledger_entry(
+        holiday_request.employee,
+        holiday_request.start_date.year,
+        kind,
+        holiday_request.days_taken if days is None else days,
+        holiday_request
+    )
+
+
+def get_leave_balance(employee, year):
+    balance = LeaveBalance.objects.filter(employee=employee, year=year).first()
+    return balance or LeaveBalance(employee=employee, year=year)
+
+
+def get_leave_balance_as_of(employee, year, moment):
+    """Rebuild the (employee, year) balance from the ledger up to a point in time."""
+    totals = LeaveLedgerEntry.objects.filter(
+        employee=employee, year=year, created_at__lte=moment
+    ).values('kind').annotate(days=Sum('days'))
+
+    balance = LeaveBalance(employee=employee, year=year)
+    for row in totals:
+        for field, sign in ENTRY_EFFECTS[row['kind']].items():
+            setattr(balance, field, getattr(balance, field) + sign * row['days'])
+    return balance
+
+
+@transaction.atomic
+def rebuild_leave_ledger(employees, year=None):
+    """
+    Replace the ledger of the given employees with entries derived from
+    their current requests, plus an opening grant that makes the ledger
+    agree with Employee.available_holidays.
+
+    :return: Number of ledger entries written.
+    """
+    year = year or timezone.now().year
+    employees = list(employees)
+    employee_ids = [employee.id for employee in employees]
+
+    LeaveLedgerEntry.objects.filter(employee_id__in=employee_ids).delete()
+    LeaveBalance.objects.filter(employee_id__in=employee_ids).delete()
+
+    requests = HolidayRequest.objects.filter(
+        employee_id__in=employee_ids,
+        status__in=['pending', 'approved'],
+        deleted__isnull=True
+    ).exclude(
+        is_special=True, special_type__isnull=False
+    ).values_list('id', 'employee_id', 'status', 'start_date', 'days_taken')
+
+    entries = []
+    held = defaultdict(int)
+    for request_id, employee_id, status, start_date, days_taken in requests:
+        kinds = ['reserve', 'consume'] if status == 'approved' else ['reserve']
+        for kind in kinds:
+            entries.append(LeaveLedgerEntry(
+                employee_id=employee_id, year=start_date.year, kind=kind,
+                days=days_taken, holiday_request_id=request_id
+            ))
+        held[employee_id] += days_taken
+
+    for employee in employees:
+        entries.append(LeaveLedgerEntry(
+            employee_id=employee.id, year=year, kind='grant',
+            days=employee.available_holidays + held[employee.id]
+        ))
+
+    return len(record_ledger_entries(entries))
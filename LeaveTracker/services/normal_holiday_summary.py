@@ -1,5 +1,6 @@
-from LeaveTracker.models import Employee, PublicHoliday
+from LeaveTracker.models import Employee
 from LeaveTracker.services.holiday_summary import get_total_normal_holidays
+from LeaveTracker.services.org_hierarchy import manages
 
 def compute_total_normal_holidays(user, employee_id, year):
     can_view_all = user.has_perm('LeaveTracker.view_total_normal_holidays_all')
@@ -8,17 +9,14 @@ def compute_total_normal_holidays(user, employee_id, year):
     if not (can_view_all or can_view_managed):
         return None, "You don't have permission to view this data."
 
-    if can_view_managed:
-        try:
-            manager = Employee.objects.get(user=user)
-        except Employee.DoesNotExist:
-            return None, "Manager record not found."
+    if can_view_managed and not manages(user, employee_id):
+        return None, "You don't manage this employee."
 
-        if not Employee.objects.filter(manager=manager, id=employee_id).exists():
-            return None, "You don't manage this employee."
+    country_code = Employee.objects.filter(id=employee_id).values_list('country_code', flat=True).first()
+    if country_code is None:
+        return 0, None
 
-    public_holidays = list(PublicHoliday.objects.filter(date__year=year).values_list('date', flat=True))
-    total_days = get_total_normal_holidays(employee_id, year, public_holidays)
+    total_days = get_total_normal_holidays(employee_id, year, country_code)
 
     return total_days, None
 
@@ -29,14 +27,8 @@ def get_remaining_normal_holidays(user, employee_id):
     if not (can_view_all or can_view_managed):
         return None, "You don't have permission to view this data."
 
-    if can_view_managed and not can_view_all:
-        try:
-            manager = Employee.objects.get(user=user)
-        except Employee.DoesNotExist:
-            return None, "Manager not found."
-
-        if not Employee.objects.filter(id=employee_id, manager=manager).exists():
-            return None, "You don't manage this employee."
+    if can_view_managed and not can_view_all and not manages(user, employee_id):
+        return None, "You don't manage this employee."
 
     try:
         employee = Employee.objects.get(id=employee_id)
@@ -0,0 +1,136 @@
+from collections import defaultdict
+from django.core.cache import cache
+from django.db import transaction
+from LeaveTracker.models import Employee, EmployeeHierarchy
+from LeaveTracker.utils.shared_cache import shared_cache_enabled
+
+# Visibility sets are dropped by a version bump on every hierarchy change;
+# the TTL bounds drift from writes that bypass signals.
+VISIBLE_EMPLOYEES_TTL = 300
+
+VERSION_KEY = "org_hierarchy:version"
+
+
+def would_create_cycle(employee_id, manager_id):
+    """True if managing employee_id by manager_id would make someone their own manager."""
+    if manager_id is None:
+        return False
+    return manager_id == employee_id or EmployeeHierarchy.objects.filter(
+        ancestor_id=employee_id, descendant_id=manager_id
+    ).exists()
+
+
+@transaction.atomic
+def add_to_hierarchy(employee):
+    """Link a new employee to itself and to every ancestor of its manager."""
+    links = [EmployeeHierarchy(ancestor_id=employee.id, descendant_id=employee.id, depth=0)]
+    if employee.manager_id:
+        links.extend(
+            EmployeeHierarchy(ancestor_id=ancestor_id, descendant_id=employee.id, depth=depth + 1)
+            for ancestor_id, depth in EmployeeHierarchy.objects.filter(
+                descendant_id=employee.manager_id
+            ).values_list('ancestor_id', 'depth')
+        )
+    EmployeeHierarchy.objects.bulk_create(links, ignore_conflicts=True)
+    invalidate_visible_employees()
+
+
+@transaction.atomic
+def move_subtree(employee, manager_id):
+    """
+    Re-hang the employee and everyone below them under manager_id (or make
+    them a root for None): the links from their old ancestors are deleted
+    and one link per (new ancestor, subtree member) pair is inserted.
+    """
+    subtree = dict(EmployeeHierarchy.objects.filter(ancestor_id=employee.id).values_list('descendant_id', 'depth'))
+    EmployeeHierarchy.objects.filter(descendant_id__in=list(subtree)).exclude(
+        ancestor_id__in=list(subtree)
+    ).delete()
+
+    if manager_id is not None:
+        ancestors = EmployeeHierarchy.objects.filter(descendant_id=manager_id).values_list('ancestor_id', 'depth')
+        EmployeeHierarchy.objects.bulk_create([
+            EmployeeHierarchy(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=above + below + 1)
+            for ancestor_id, above in ancestors
+            for descendant_id, below in subtree.items()
+        ], batch_size=2000)
+    invalidate_visible_employees()
+
+
+@transaction.atomic
+def rebuild_hierarchy():
+    """
+    Recreate the whole closure table from Employee.manager.
+
+    :return: Number of links written.
+    """
+    EmployeeHierarchy.objects.all().delete()
+
+    reports = defaultdict(list)
+    roots = []
+    for employee_id, manager_id in Employee.objects.values_list('id', 'manager_id'):
+        if manager_id is None:
+            roots.append(employee_id)
+        else:
+            reports[manager_id].append(employee_id)
+
+    links = []
+    # Walk down from the roots, carrying each employee's ancestor chain
+    stack = [(root, []) for root in roots]
+    while stack:
+        employee_id, ancestors = stack.pop()
+        chain = ancestors + [employee_id]
+        links.extend(
+            EmployeeHierarchy(ancestor_id=ancestor_id, descendant_id=employee_id, depth=len(chain) - 1 - position)
+            for position, ancestor_id in enumerate(chain)
+        )
+        stack.extend((report_id, chain) for report_id in reports[employee_id])
+
+    EmployeeHierarchy.objects.bulk_create(links, batch_size=5000)
+    invalidate_visible_employees()
+    return len(links)
+
+
+def get_managed_employees(user):
+    """Employees below the user in the hierarchy at any depth, as one join on the closure table."""
+    return Employee.objects.filter(ancestor_links__ancestor__user=user, ancestor_links__depth__gt=0)
+
+
+def get_hierarchy_version():
+    """Bumped on every hierarchy change, for caches of anything derived from it."""
+    return cache.get_or_set(VERSION_KEY, 1, None)
+
+
+def get_managed_employee_ids(user):
+    """
+    Cached ids of get_managed_employees, for membership checks without SQL.
+    Without a shared cache a re-parenting would not reach the other workers,
+    so the ids are only kept on the user instance for the request.
+    """
+    if not shared_cache_enabled():
+        if not hasattr(user, '_managed_employee_ids'):
+            user._managed_employee_ids = frozenset(get_managed_employees(user).values_list('id', flat=True))
+        return user._managed_employee_ids
+    key = f"visible_employees:{get_hierarchy_version()}:{user.pk}"
+    employee_ids = cache.get(key)
+    if employee_ids is None:
+        employee_ids = frozenset(get_managed_employees(user).values_list('id', flat=True))
+        cache.set(key, employee_ids, VISIBLE_EMPLOYEES_TTL)
+    return employee_ids
+
+
+def manages(user, employee_id):
+    try:
+        return int(employee_id) in get_managed_employee_ids(user)
+    except (TypeError, ValueError):
+        return False
+
+
+def invalidate_visible_employees():
+    def apply():
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            pass
+
+    transaction.on_commit(apply)
@@ -0,0 +1,79 @@
+from django.core.cache import cache
+from django.db import transaction
+from LeaveTracker.models import HolidayRequest
+from LeaveTracker.utils.shared_cache import shared_cache_enabled
+
+# Counters are adjusted in place by LeaveTracker.signals.pending_counters;
+# the TTL bounds any drift from writes that bypass signals.
+PENDING_COUNT_TTL = 60
+
+
+GENERATION_KEY = "pending_requests:generation"
+# Requests waiting in the fallback queue, see review_routing
+FALLBACK_SCOPE = "fallback"
+
+
+def _counter_key(scope):
+    # Bumping the generation drops every scope's counter at once
+    generation = cache.get_or_set(GENERATION_KEY, 1, None)
+    return f"pending_requests:{generation}:{scope}"
+
+
+def reviewer_scope(reviewer_id):
+    return f"reviewer:{reviewer_id}"
+
+
+def pending_scopes(reviewer_id, fallback_review=False):
+    """Counter scopes a pending request routed to the given reviewer (or queue) counts towards."""
+    if reviewer_id:
+        return ['all', reviewer_scope(reviewer_id)]
+    if fallback_review:
+        return ['all', FALLBACK_SCOPE]
+    return ['all']
+
+
+def _count_pending(scope):
+    queryset = HolidayRequest.objects.filter(status='pending', deleted__isnull=True)
+    if scope == FALLBACK_SCOPE:
+        queryset = queryset.filter(fallback_review=True)
+    elif scope.startswith('reviewer:'):
+        queryset = queryset.filter(reviewer_id=int(scope[len('reviewer:'):]))
+    return queryset.count()
+
+
+def get_pending_count(scope):
+    # Each worker would otherwise adjust its own copy of the counters
+    if not shared_cache_enabled():
+        return _count_pending(scope)
+    key = _counter_key(scope)
+    count = cache.get(key)
+    if count is None:
+        count = _count_pending(scope)
+        cache.add(key, count, PENDING_COUNT_TTL)
+    return count
+
+
+def adjust_pending_counts(scopes, delta):
+    """
+    Shift the cached counters once the current transaction commits. Missing
+    counters are left alone and recounted on the next read.
+    """
+    def apply():
+        for scope in scopes:
+            try:
+                cache.incr(_counter_key(scope), delta)
+            except ValueError:
+                pass
+
+    transaction.on_commit(apply)
+
+
+def invalidate_pending_counts():
+    def apply():
+        try:
+            cache.incr(GENERATION_KEY)
+        except ValueError:
+            pass
+
+    transaction.on_commit(apply)
+
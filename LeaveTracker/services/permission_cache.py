@@ -0,0 +1,93 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import transaction
+from LeaveTracker.utils.shared_cache import shared_cache_enabled
+
+# Snapshots are dropped by a version bump from LeaveTracker.signals.permission_cache;
+# the TTL bounds drift from changes that bypass signals (e.g. raw SQL).
+PERMISSION_SNAPSHOT_TTL = 300
+
+VERSION_KEY = "permissions:version"
+
+
+def _snapshot_key(user):
+    # is_active and is_superuser change what ModelBackend grants, so they are
+    # part of the key rather than a reason to bump the version
+    version = cache.get_or_set(VERSION_KEY, 1, None)
+    return f"permissions:{version}:{user.pk}:{int(user.is_active)}{int(user.is_superuser)}"
+
+
+def get_permission_snapshot(user):
+    """
+    The user's permissions ("app_label.codename", as has_perm expects them)
+    and group names, from the shared cache or resolved once and stored there.
+    Without a shared cache, a revoked grant would outlive the version bump in
+    every other worker, so the snapshot is resolved per request instead and
+    only kept on the user instance.
+
+    :return: (permissions, group_names) as frozensets.
+    """
+    if not shared_cache_enabled():
+        return _resolve_snapshot(user)
+    key = _snapshot_key(user)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = _resolve_snapshot(user)
+        cache.set(key, snapshot, PERMISSION_SNAPSHOT_TTL)
+    return snapshot
+
+
+def _resolve_snapshot(user):
+    # Group names and group permissions come from the same query
+    group_names = set()
+    permissions = set()
+    for name, app_label, codename in Group.objects.filter(user=user).values_list(
+        'name', 'permissions__content_type__app_label', 'permissions__codename'
+    ):
+        group_names.add(name)
+        if codename:
+            permissions.add(f"{app_label}.{codename}")
+
+    # Mirrors ModelBackend: nothing for inactive users, everything for superusers
+    if not user.is_active:
+        permissions = set()
+    elif user.is_superuser:
+        permissions = ModelBackend().get_user_permissions(user)
+    else:
+        permissions |= {
+            f"{app_label}.{codename}"
+            for app_label, codename in user.user_permissions.values_list('content_type__app_label', 'codename')
+        }
+    return frozenset(permissions), frozenset(group_names)
+
+
+def prime_permission_cache(user):
+    """
+    Fill the per-instance caches ModelBackend reads, so every has_perm,
+    get_all_permissions and |has_perm check on this user object is answered
+    without SQL.
+    """
+    if not user.is_authenticated or hasattr(user, '_perm_cache'):
+        return
+    permissions, group_names = get_permission_snapshot(user)
+    user._perm_cache = set(permissions)
+    user._group_names_cache = group_names
+
+
+def get_group_names(user):
+    if not user.is_authenticated:
+        return frozenset()
+    if not hasattr(user, '_group_names_cache'):
+        user._group_names_cache = get_permission_snapshot(user)[1]
+    return user._group_names_cache
+
+
+def invalidate_permission_snapshots():
+    def apply():
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            pass
+
+    transaction.on_commit(apply)
@@ -0,0 +1,56 @@
+from django.conf import settings
+from LeaveTracker.models import Employee, HolidayRequest
+from LeaveTracker.services.permission_cache import get_group_names
+from LeaveTracker.utils.permissions import get_users_with_permission
+
+
+def get_fallback_reviewer_group():
+    return getattr(settings, 'LEAVE_FALLBACK_REVIEWER_GROUP', 'Operations Manager')
+
+
+def resolve_reviewer_id(employee_id):
+    """
+    The user who reviews an employee's requests: their direct manager.
+    Approval deliberately stays with the direct manager even though managers
+    further up can see the whole subtree, so every request has one owner.
+    """
+    return Employee.objects.filter(id=employee_id).values_list('manager__user_id', flat=True).first()
+
+
+def needs_fallback_review(reviewer_id, group_names):
+    """
+    Whether a request without a reviewer goes to the fallback queue: when the
+    requester is in one of LEAVE_FALLBACK_REQUESTER_GROUPS.
+    """
+    requester_groups = getattr(settings, 'LEAVE_FALLBACK_REQUESTER_GROUPS', ['Employee'])
+    return reviewer_id is None and not set(group_names).isdisjoint(requester_groups)
+
+
+def reviews_fallback_queue(user):
+    """Whether a user with review_holiday_requests_managed also reviews the fallback queue."""
+    return get_fallback_reviewer_group() in get_group_names(user)
+
+
+def get_fallback_reviewers():
+    """Users who review the fallback queue."""
+    return get_users_with_permission(
+        "LeaveTracker", "review_holiday_requests_managed"
+    ).filter(groups__name=get_fallback_reviewer_group())
+
+
+def reroute_pending_requests(employee):
+    """
+    Hand the employee's pending requests to their current manager, or to the
+    fallback queue if they no longer have one.
+
+    :return: Number of requests rerouted.
+    """
+    reviewer_id = resolve_reviewer_id(employee.id)
+    return HolidayRequest.objects.filter(
+        employee=employee,
+        status='pending',
+        deleted__isnull=True
+    ).update(
+        reviewer_id=reviewer_id,
+        fallback_review=needs_fallback_review(reviewer_id, get_group_names(employee.user))
+    )
@@ -0,0 +1,42 @@
+from django.db.models import Value
+from django.db.models.functions import Concat
+from LeaveTracker.models import HolidayRequest, PublicHoliday
+from LeaveTracker.utils.permissions import get_visible_employees
+
+# Longest range a single calendar call may cover
+MAX_CALENDAR_RANGE_DAYS = 400
+
+
+def get_team_calendar(user, start_date, end_date):
+    employee_holidays = HolidayRequest.objects.filter(
+        employee__in=get_visible_employees(user),
+        status__in=["approved", "pending"],
+        start_date__lte=end_date,
+        end_date__gte=start_date,
+        deleted__isnull=True
+    ).annotate(
+        employee_name=Concat('employee__user__first_name', Value(' '), 'employee__user__last_name')
+    ).order_by('start_date', 'id').values_list(
+        'employee_name', 'start_date', 'end_date', 'status', 'is_special'
+    )
+
+    public_holidays = PublicHoliday.objects.filter(
+        date__range=(start_date, end_date)
+    ).order_by('date').values_list('name', 'date')
+
+    return {
+        'employee_holidays': [
+            {
+                'employee_name': employee_name,
+                'start_date': hr_start.isoformat(),
+                'end_date': hr_end.isoformat(),
+                'status': status,
+                'is_special': is_special
+            }
+            for employee_name, hr_start, hr_end, status, is_special in employee_holidays
+        ],
+        'public_holidays': [
+            {'name': name, 'date': day.isoformat()}
+            for name, day in public_holidays
+        ]
+    }
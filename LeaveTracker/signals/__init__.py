@@ -1 +1,8 @@
-from .notifications import notify_on_holiday_request
\ No newline at end of file
+from .notifications import notify_on_holiday_request
+from .holiday_calendar import invalidate_on_public_holiday_change, invalidate_on_event_change
+from .pending_counters import update_pending_counts_on_save, update_pending_counts_on_delete
+from .leave_days import sync_leave_days_on_save
+from .review_routing import route_new_request, reroute_on_manager_change
+from .permission_cache import invalidate_on_permission_change, invalidate_on_group_change
+from .org_hierarchy import update_hierarchy_on_save, detach_subtree_on_delete
+from .data_versions import bump_on_holiday_request_change, bump_on_calendar_change
@@ -0,0 +1,78 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from LeaveTracker.models import Employee, Event, HolidayRequest, PublicHoliday, SpecialHolidayTypes, SpecialHolidayUsage
+from LeaveTracker.services.data_versions import (
+    CALENDAR_SCOPE,
+    DIRECTORY_SCOPE,
+    GLOBAL_SCOPE,
+    REQUEST_YEARS_SCOPE,
+    bump_data_versions,
+    employee_scope,
+    forget_employee_id,
+    month_scopes,
+)
+
+
+def _request_snapshot(values):
+    if any(values.get(field) is None for field in ('employee_id', 'start_date', 'end_date')):
+        return None  # unsaved or deferred fields
+    return values['employee_id'], values['start_date'], values['end_date']
+
+
+def _request_scopes(snapshot):
+    employee_id, start_date, end_date = snapshot
+    return [employee_scope(employee_id), *month_scopes(start_date, end_date)]
+
+
+@receiver(post_init, sender=HolidayRequest)
+def remember_request_snapshot(sender, instance, **kwargs):
+    instance._data_version_snapshot = _request_snapshot(instance.__dict__)
+
+
+@receiver([post_save, post_delete], sender=HolidayRequest)
+def bump_on_holiday_request_change(sender, instance, created=False, **kwargs):
+    previous = instance._data_version_snapshot
+    current = _request_snapshot(instance.__dict__)
+    instance._data_version_snapshot = current
+    if current is None:
+        bump_data_versions([GLOBAL_SCOPE])
+        return
+
+    # A moved request leaves its old months and shows up in the new ones
+    scopes = set(_request_scopes(current))
+    if previous is not None:
+        scopes.update(_request_scopes(previous))
+    if created or kwargs['signal'] is post_delete or previous is None or previous[1].year != current[1].year:
+        scopes.add(REQUEST_YEARS_SCOPE)
+    bump_data_versions(scopes)
+
+
+@receiver([post_save, post_delete], sender=SpecialHolidayUsage)
+def bump_on_special_usage_change(sender, instance, **kwargs):
+    bump_data_versions([employee_scope(instance.employee_id)])
+
+
+@receiver([post_save, post_delete], sender=SpecialHolidayTypes)
+def bump_on_special_type_change(sender, instance, **kwargs):
+    bump_data_versions([GLOBAL_SCOPE])
+
+
+@receiver([post_save, post_delete], sender=PublicHoliday)
+@receiver([post_save, post_delete], sender=Event)
+def bump_on_calendar_change(sender, instance, **kwargs):
+    bump_data_versions([CALENDAR_SCOPE])
+
+
+@receiver([post_save, post_delete], sender=Employee)
+def bump_on_employee_change(sender, instance, **kwargs):
+    bump_data_versions([employee_scope(instance.id), DIRECTORY_SCOPE])
+    if kwargs.get('signal') is post_delete:
+        forget_employee_id(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def bump_on_user_change(sender, instance, update_fields=None, **kwargs):
+    # Logging in only touches last_login, which no response shows
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        bump_data_versions([DIRECTORY_SCOPE])
@@ -0,0 +1,19 @@
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from LeaveTracker.models import Event, PublicHoliday
+from LeaveTracker.services.holiday_calendar import invalidate_holiday_calendar
+
+
+@receiver([post_save, post_delete], sender=PublicHoliday)
+def invalidate_on_public_holiday_change(sender, instance, **kwargs):
+    # The previous date is unknown on update, so drop the whole country.
+    # Dropping it before commit would let another request reload the old rows.
+    transaction.on_commit(partial(invalidate_holiday_calendar, country_code=instance.country_code))
+
+
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_on_event_change(sender, instance, **kwargs):
+    # Events are company-wide and feed every country's calendar
+    transaction.on_commit(invalidate_holiday_calendar)
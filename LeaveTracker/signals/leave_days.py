@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from LeaveTracker.models import HolidayRequest
+from LeaveTracker.services.leave_days import sync_leave_days
+
+
+@receiver(post_save, sender=HolidayRequest)
+def sync_leave_days_on_save(sender, instance, **kwargs):
+    # Hard deletes cascade; soft deletes and status changes arrive here
+    sync_leave_days(instance)
@@ -1,37 +1,46 @@
-import logging
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from LeaveTracker.models import HolidayRequest
+from LeaveTracker.emails.digest import digest_mode_enabled
 from LeaveTracker.emails.notifications import send_manager_notification
+from LeaveTracker.services.review_routing import get_fallback_reviewers
 from LeaveTracker.utils.permissions import get_users_with_permission
 
-logger = logging.getLogger('LeaveTracker')
+
+@receiver(pre_save, sender=HolidayRequest)
+def flag_for_digest(sender, instance, **kwargs):
+    # Claimed by the next send_review_digests run
+    if instance._state.adding and digest_mode_enabled():
+        instance.awaiting_digest = True
 
 @receiver(post_save, sender=HolidayRequest)
 def notify_on_holiday_request(sender, instance, created, **kwargs):
-    if not created:
+    # In digest mode reviewers are notified by the send_review_digests command
+    if not created or digest_mode_enabled():
         return
 
     employee = instance.employee
     user = employee.user
 
-    # Notify the direct manager
-    if employee.manager and employee.manager.user.email:
+    # Notify the reviewer the request was routed to
+    if instance.reviewer and instance.reviewer.email:
         send_manager_notification(
-            employee.manager.user.email,
+            instance.reviewer.email,
             user.first_name,
             user.last_name
         )
 
-    # Notify users with permission to review all requests
-    try:
-        reviewers = get_users_with_permission("LeaveTracker", "review_holiday_requests_all")
-        for reviewer in reviewers:
-            if reviewer.email:
-                send_manager_notification(
-                    reviewer.email,
-                    user.first_name,
-                    user.last_name
-                )
-    except Exception as e:
-        logger.warning(f"Failed to notify reviewers: {str(e)}")
+    # Notify users with permission to review all requests, and the fallback
+    # reviewers of requests in their queue. The emails are queued in the
+    # request's own transaction, so a database error here must roll it back
+    # rather than lose the notification or leave the transaction broken.
+    reviewers = list(get_users_with_permission("LeaveTracker", "review_holiday_requests_all"))
+    if instance.fallback_review:
+        reviewers += get_fallback_reviewers()
+    for email in dict.fromkeys(reviewer.email for reviewer in reviewers):
+        if email:
+            send_manager_notification(
+                email,
+                user.first_name,
+                user.last_name
+            )
@@ -0,0 +1,36 @@
+from django.core.exceptions import ValidationError
+from django.db.models.signals import post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from LeaveTracker.models import Employee
+from LeaveTracker.services.org_hierarchy import add_to_hierarchy, move_subtree, would_create_cycle
+
+
+def _manager_changed(instance):
+    return 'manager_id' in instance.__dict__ and instance.manager_id != instance._hierarchy_manager_id
+
+
+@receiver(post_init, sender=Employee)
+def remember_hierarchy_manager(sender, instance, **kwargs):
+    instance._hierarchy_manager_id = instance.__dict__.get('manager_id')
+
+
+@receiver(pre_save, sender=Employee)
+def prevent_management_cycles(sender, instance, **kwargs):
+    if not instance._state.adding and _manager_changed(instance) and \
+            would_create_cycle(instance.id, instance.manager_id):
+        raise ValidationError("An employee cannot report to themselves or to someone they manage.")
+
+
+@receiver(post_save, sender=Employee)
+def update_hierarchy_on_save(sender, instance, created, **kwargs):
+    if created:
+        add_to_hierarchy(instance)
+    elif _manager_changed(instance):
+        move_subtree(instance, instance.manager_id)
+    instance._hierarchy_manager_id = instance.manager_id
+
+
+@receiver(pre_delete, sender=Employee)
+def detach_subtree_on_delete(sender, instance, **kwargs):
+    # The reports become roots once their manager is gone (manager is SET_NULL)
+    move_subtree(instance, None)
@@ -0,0 +1,50 @@
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from LeaveTracker.models import HolidayRequest
+from LeaveTracker.services.pending_counters import (
+    adjust_pending_counts,
+    invalidate_pending_counts,
+    pending_scopes,
+)
+
+_UNKNOWN = object()
+
+
+def _pending_state(values):
+    """The counter scopes of a request that counts as pending, else None."""
+    if any(field not in values for field in ('status', 'deleted', 'reviewer_id', 'fallback_review')):
+        return _UNKNOWN  # deferred fields; don't trigger extra queries
+    if values['status'] == 'pending' and values['deleted'] is None:
+        return tuple(pending_scopes(values['reviewer_id'], values['fallback_review']))
+    return None
+
+
+@receiver(post_init, sender=HolidayRequest)
+def remember_pending_state(sender, instance, **kwargs):
+    instance._pending_state = _pending_state(instance.__dict__)
+
+
+@receiver(post_save, sender=HolidayRequest)
+def update_pending_counts_on_save(sender, instance, created, **kwargs):
+    previous = None if created else instance._pending_state
+    current = _pending_state(instance.__dict__)
+    instance._pending_state = current
+
+    if previous is _UNKNOWN or current is _UNKNOWN:
+        invalidate_pending_counts()
+        return
+    if previous == current:
+        return
+
+    if previous is not None:
+        adjust_pending_counts(previous, -1)
+    if current is not None:
+        adjust_pending_counts(current, 1)
+
+
+@receiver(post_delete, sender=HolidayRequest)
+def update_pending_counts_on_delete(sender, instance, **kwargs):
+    if instance._pending_state is _UNKNOWN:
+        invalidate_pending_counts()
+    elif instance._pending_state is not None:
+        adjust_pending_counts(instance._pending_state, -1)
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_init, post_save, pre_save
+from django.dispatch import receiver
+from LeaveTracker.models import Employee, HolidayRequest
+from LeaveTracker.services.pending_counters import invalidate_pending_counts
+from LeaveTracker.services.review_routing import needs_fallback_review, reroute_pending_requests, resolve_reviewer_id
+
+
+@receiver(pre_save, sender=HolidayRequest)
+def route_new_request(sender, instance, **kwargs):
+    if instance._state.adding and instance.reviewer_id is None and instance.employee_id:
+        instance.reviewer_id = resolve_reviewer_id(instance.employee_id)
+        instance.fallback_review = needs_fallback_review(
+            instance.reviewer_id, filter(None, instance.user_group.split(','))
+        )
+
+
+@receiver(post_init, sender=Employee)
+def remember_manager(sender, instance, **kwargs):
+    instance._routed_manager_id = instance.__dict__.get('manager_id')
+
+
+@receiver(post_save, sender=Employee)
+def reroute_on_manager_change(sender, instance, created, **kwargs):
+    if not created and 'manager_id' in instance.__dict__ and instance.manager_id != instance._routed_manager_id:
+        if reroute_pending_requests(instance):
+            invalidate_pending_counts()
+    instance._routed_manager_id = instance.manager_id
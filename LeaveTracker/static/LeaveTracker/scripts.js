@@ -40,15 +40,50 @@ document.addEventListener('DOMContentLoaded', function() {
     let currentMonth = today.getMonth();
     let currentYear = today.getFullYear();
   
+    // Holidays are fetched a quarter at a time and reused while navigating months
+    const quarterCache = {};
+
+    // The home page renders its first quarter and the employee's data inline
+    const bootstrapElement = document.getElementById("dashboard-bootstrap");
+    const inlineBootstrap = bootstrapElement ? JSON.parse(bootstrapElement.textContent) : null;
+    if (inlineBootstrap) {
+      const [fromYear, fromMonth] = inlineBootstrap.calendar.from.split("-").map(Number);
+      quarterCache[`${fromYear}-${fromMonth}`] = {
+        employeeHolidays: inlineBootstrap.calendar.employee_holidays,
+        publicHolidays: inlineBootstrap.calendar.public_holidays,
+      };
+    }
+
+    // Balance, open requests and special usage in one response
+    async function loadBootstrap() {
+      if (inlineBootstrap) {
+        return inlineBootstrap;
+      }
+      const response = await fetch('/dashboard-bootstrap/');
+      return response.json();
+    }
+
     // Function to fetch holidays for a given year and month
     async function fetchHolidays(year, month) {
+      const quarterStart = Math.floor((month - 1) / 3) * 3 + 1;
+      const cacheKey = `${year}-${quarterStart}`;
+      if (quarterCache[cacheKey]) {
+        return quarterCache[cacheKey];
+      }
+
+      const pad = (value) => String(value).padStart(2, "0");
+      const lastDay = new Date(year, quarterStart + 2, 0).getDate();
+      const from = `${year}-${pad(quarterStart)}-01`;
+      const to = `${year}-${pad(quarterStart + 2)}-${pad(lastDay)}`;
+
       try {
-        const response = await fetch(`/get-all-holidays/?year=${year}&month=${month}`);
+        const response = await fetch(`/get-all-holidays/?from=${from}&to=${to}`);
         const data = await response.json();
-        return { 
+        quarterCache[cacheKey] = {
           employeeHolidays: data.employee_holidays,
           publicHolidays: data.public_holidays,
         };
+        return quarterCache[cacheKey];
       } catch (error) {
         console.error("Error fetching holidays:", error);
         return {
@@ -388,69 +423,47 @@ document.addEventListener('DOMContentLoaded', function() {
   const submitHolidayRequestBtn = document.getElementById("submitHolidayRequest");
   if (submitHolidayRequestBtn) {
     submitHolidayRequestBtn.addEventListener("click", function () {
-      let pastHolidays = [];
-
-      fetch('/get-user-existing-holidays/')
-        .then(response => response.json())
-        .then(data => {
-          pastHolidays = data.past_holidays;
+      loadBootstrap().then(data => {
+        const pastHolidays = data.existing_holidays;
+        const availableHolidays = data.available_holidays;
 
-          fetch('/get-available-holidays/')
-            .then(response => response.json())
-            .then(data => {
-              const availableHolidays = data.available_holidays;
+        // ✅ Use selectedRange instead of marked DOM cells
+        const startDate = selectedRange.start;
+        const endDate = selectedRange.end;
 
-              // ✅ Use selectedRange instead of marked DOM cells
-              const startDate = selectedRange.start;
-              const endDate = selectedRange.end;
-
-              if (!startDate || !endDate) {
-                $('#errorModal').modal('show');
-                return;
-              }
+        if (!startDate || !endDate) {
+          $('#errorModal').modal('show');
+          return;
+        }
 
-              // ✅ Generate all business dates between start and end
-              const businessDays = getAllBusinessDatesInRange(startDate, endDate);
-              const totalHolidays = businessDays.length;
+        // ✅ Generate all business dates between start and end
+        const businessDays = getAllBusinessDatesInRange(startDate, endDate);
+        const totalHolidays = businessDays.length;
+
+        if (hasRangeOverlap(startDate, endDate, pastHolidays)) {
+          $('#pastDatesErrorModal').modal('show');
+        } else if (totalHolidays > availableHolidays) {
+          $('#noHolidaysModal').modal('show');
+        } else if (totalHolidays === 0) {
+          $('#errorModal').modal('show');
+        } else {
+          const isSpecialCheckbox = document.getElementById("is_special");
+          const isSpecial = isSpecialCheckbox.checked;
+
+          if (isSpecial) {
+            const specialTypeSelect = document.getElementById("special_type");
+            const usage = data.special_usage[specialTypeSelect.value];
 
-              if (hasRangeOverlap(startDate, endDate, pastHolidays)) {
-                $('#pastDatesErrorModal').modal('show');
-              } else if (totalHolidays > availableHolidays) {
-                $('#noHolidaysModal').modal('show');
-              } else if (totalHolidays === 0) {
-                $('#errorModal').modal('show');
-              } else {
-                const isSpecialCheckbox = document.getElementById("is_special");
-                const isSpecial = isSpecialCheckbox.checked;
-
-                if (isSpecial) {
-                  const specialTypeSelect = document.getElementById("special_type");
-                  const specialTypeId = specialTypeSelect.value;
-                  const currentYear = new Date().getFullYear();
-
-                  fetch(`/get-special-holiday-usage/?special_type_id=${specialTypeId}&year=${currentYear}`)
-                    .then(response => response.json())
-                    .then(data => {
-                      const maxDays = data.max_days;
-                      const usedDays = data.used_days;
-                      const totalDaysTaken = totalHolidays;
-
-                      if (totalDaysTaken + usedDays > maxDays) {
-                        $('#exceededSpecialHolidayModal').modal('show');
-                      } else {
-                        document.getElementById("selectedDateRange").innerText = `${startDate.toLocaleDateString()} - ${endDate.toLocaleDateString()}`;
-                        document.getElementById("totalHolidays").innerText = totalHolidays;
-                        $('#confirmationModal').modal('show');
-                      }
-                    });
-                } else {
-                  document.getElementById("selectedDateRange").innerText = `${startDate.toLocaleDateString()} - ${endDate.toLocaleDateString()}`;
-                  document.getElementById("totalHolidays").innerText = totalHolidays;
-                  $('#confirmationModal').modal('show');
-                }
-              }
-            });
-        });
+            if (usage && totalHolidays + usage.used_days > usage.max_days) {
+              $('#exceededSpecialHolidayModal').modal('show');
+              return;
+            }
+          }
+          document.getElementById("selectedDateRange").innerText = `${startDate.toLocaleDateString()} - ${endDate.toLocaleDateString()}`;
+          document.getElementById("totalHolidays").innerText = totalHolidays;
+          $('#confirmationModal').modal('show');
+        }
+      });
     });
   }
 
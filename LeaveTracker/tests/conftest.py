@@ -0,0 +1,24 @@
+import pytest
+from django.core.cache import cache
+from LeaveTracker.services import home_summary
+from LeaveTracker.services.holiday_calendar import reset_calendar_cache
+
+
+@pytest.fixture(autouse=True)
+def shared_cache(settings):
+    # The test process is the only worker, so its local memory cache is shared
+    settings.LEAVE_SHARED_CACHE = True
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    # Process-level caches outlive the per-test database rollback
+    reset_calendar_cache()
+    home_summary._completed_rollovers.clear()
+    home_summary._reported_missing_rollovers.clear()
+    cache.clear()
+    yield
+    reset_calendar_cache()
+    home_summary._completed_rollovers.clear()
+    home_summary._reported_missing_rollovers.clear()
+    cache.clear()
@@ -0,0 +1,57 @@
+import json
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from LeaveTracker.benchmarks.generator import generate_org, manager_index
+from LeaveTracker.benchmarks.suite import compare_to_baseline, percentile
+from LeaveTracker.models import Employee, HolidayRequest, LeaveBalance
+
+
+def test_manager_tree_and_percentiles():
+    assert [manager_index(i) for i in (1, 7, 8, 9, 64, 72, 130)] == [0, 0, 0, 8, 0, 64, 128]
+    assert percentile([4, 1, 3, 2], 50) == 2.5
+    assert percentile([10], 95) == 10
+
+
+@pytest.mark.django_db
+def test_generate_org_builds_consistent_dataset():
+    counts = generate_org(employees=40, requests_per_employee=10, years=3)
+
+    assert counts['employees'] == Employee.objects.count() == 40
+    assert Employee.objects.filter(manager__isnull=True).count() == 1
+    assert counts['holiday_requests'] == HolidayRequest.objects.count() > 0
+
+    # Requests of one employee never overlap
+    for employee in Employee.objects.all()[:10]:
+        ranges = list(employee.holidayrequest_set.order_by('start_date').values_list('start_date', 'end_date'))
+        assert all(previous[1] < current[0] for previous, current in zip(ranges, ranges[1:]))
+
+    # The ledger agrees with the running totals
+    for employee in Employee.objects.all()[:10]:
+        balances = LeaveBalance.objects.filter(employee=employee)
+        assert sum(balance.available for balance in balances) == employee.available_holidays
+
+
+@pytest.mark.django_db
+def test_run_benchmarks_writes_and_compares_baseline(tmp_path, capsys):
+    call_command("generate_org", "--employees", "30", "--requests-per-employee", "6")
+    output = tmp_path / "baseline.json"
+
+    call_command("run_benchmarks", "--iterations", "1", "--output", str(output))
+    report = json.loads(output.read_text())
+    assert report['employees'] == 30
+    assert {'p50', 'p95', 'p99', 'queries'} <= set(report['results']['my_holiday_summary'])
+
+    # A baseline that was much faster and leaner flags a regression
+    for result in report['results'].values():
+        result['p95'] /= 100
+        result['queries'] = 0
+    output.write_text(json.dumps(report))
+    with pytest.raises(CommandError, match="Regressions"):
+        call_command("run_benchmarks", "--iterations", "1", "--only", "submission", "--baseline", str(output))
+
+
+def test_compare_to_baseline_respects_threshold():
+    baseline = {'a': {'p95': 100.0, 'queries': 3}}
+    assert compare_to_baseline({'a': {'p95': 115.0, 'queries': 3}}, baseline, threshold=0.2) == []
+    assert len(compare_to_baseline({'a': {'p95': 130.0, 'queries': 4}}, baseline, threshold=0.2)) == 2
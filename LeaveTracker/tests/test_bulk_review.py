@@ -0,0 +1,97 @@
+import pytest
+from datetime import date, timedelta
+from django.contrib.auth.models import Permission, User
+from django.urls import reverse
+from LeaveTracker.models import EmailOutbox, Employee, HolidayRequest, LeaveDay, SpecialHolidayTypes, SpecialHolidayUsage
+from LeaveTracker.services.holiday_review import review_holiday_requests
+from LeaveTracker.services.leave_ledger import get_leave_balance, record_ledger_entry
+from LeaveTracker.services.pending_counters import get_pending_count
+
+
+def create_employee(username, available=10, password=None):
+    user = User.objects.create_user(username=username, email=f"{username}@example.com", password=password)
+    return Employee.objects.create(user=user, available_holidays=available)
+
+
+def create_pending(employee, start, days=1, **kwargs):
+    holiday = HolidayRequest.objects.create(
+        employee=employee, days_taken=days, start_date=start, end_date=start + timedelta(days=days - 1),
+        status="pending", user_group="Employee", **kwargs
+    )
+    if not kwargs.get('is_special'):
+        record_ledger_entry(employee, start.year, 'reserve', days, holiday)
+    return holiday
+
+
+@pytest.fixture
+def reviewer():
+    user = User.objects.create_user(username="reviewer", password="testpass")
+    user.user_permissions.add(*Permission.objects.filter(codename__in=[
+        "review_holiday_requests_managed", "approve_holiday_request", "reject_holiday_request"
+    ]))
+    return User.objects.get(id=user.id)
+
+
+@pytest.mark.django_db
+def test_bulk_reject_refunds_balances_and_reports_each_item(reviewer, django_capture_on_commit_callbacks):
+    alice, bob = create_employee("alice", available=5), create_employee("bob", available=7)
+    special_type = SpecialHolidayTypes.objects.create(name="Moving", max_days=3)
+    SpecialHolidayUsage.objects.create(employee=bob, holiday_type=special_type, year=2025, days_used=2)
+
+    first = create_pending(alice, date(2025, 3, 3), days=2, reviewer=reviewer)
+    second = create_pending(alice, date(2025, 3, 10), days=3, reviewer=reviewer)
+    special = create_pending(bob, date(2025, 3, 3), days=2, is_special=True, special_type=special_type,
+                             reviewer=reviewer)
+    other_team = create_pending(bob, date(2025, 4, 7), reviewer=User.objects.create_user(username="other"))
+    approved = create_pending(bob, date(2025, 5, 5), reviewer=reviewer)
+    approved.status = "approved"
+    approved.save()
+    assert get_pending_count('all') == 4
+
+    with django_capture_on_commit_callbacks(execute=True):
+        results, error = review_holiday_requests(
+            reviewer, [second.id, first.id, special.id, other_team.id, approved.id, 999999], "reject")
+
+    assert error is None
+    assert {r['id']: r['outcome'] for r in results} == {
+        first.id: 'rejected', second.id: 'rejected', special.id: 'rejected',
+        other_team.id: 'forbidden', approved.id: 'not_pending', 999999: 'not_found',
+    }
+    alice.refresh_from_db()
+    assert alice.available_holidays == 10
+    assert get_leave_balance(alice, 2025).reserved == 0
+    assert SpecialHolidayUsage.objects.get(employee=bob).days_used == 0
+    assert not LeaveDay.objects.filter(holiday_request__in=[first, second, special]).exists()
+    assert EmailOutbox.objects.filter(subject="Holiday Request Rejected").count() == 3
+    assert get_pending_count('all') == 1
+
+
+@pytest.mark.django_db
+def test_bulk_approve_scales_without_per_item_queries(reviewer, django_assert_max_num_queries):
+    employees = [create_employee(f"user{i}") for i in range(20)]
+    ids = [create_pending(employee, date(2025, 6, 2) + timedelta(days=7 * n), reviewer=reviewer).id
+           for employee in employees for n in range(5)]
+    reviewer.has_perm('LeaveTracker.review_holiday_requests_all')  # warm the permission cache
+
+    with django_assert_max_num_queries(15):
+        results, error = review_holiday_requests(reviewer, ids, "approve")
+
+    assert {r['outcome'] for r in results} == {'approved'}
+    assert HolidayRequest.objects.filter(status="approved", approved_by=reviewer).count() == 100
+    assert set(LeaveDay.objects.values_list('status', flat=True)) == {'approved'}
+    assert get_leave_balance(employees[0], 2025).consumed == 5
+    assert EmailOutbox.objects.count() == 100
+
+
+@pytest.mark.django_db
+def test_bulk_review_endpoint(client, reviewer):
+    holiday = create_pending(create_employee("alice"), date(2025, 3, 3), reviewer=reviewer)
+    client.login(username="reviewer", password="testpass")
+
+    response = client.post(reverse("bulk_review"), {"ids": [holiday.id], "action": "approve"},
+                           content_type="application/json")
+    assert response.status_code == 200
+    assert response.json() == {"results": [{"id": holiday.id, "outcome": "approved"}], "summary": {"approved": 1}}
+
+    response = client.post(reverse("bulk_review"), {"ids": [], "action": "approve"}, content_type="application/json")
+    assert response.status_code == 400
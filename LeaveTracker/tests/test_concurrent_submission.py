@@ -0,0 +1,121 @@
+import threading
+import time
+import pytest
+from datetime import date, timedelta
+from django.contrib.auth.models import User
+from django.db import OperationalError, connections
+from LeaveTracker.models import Employee, HolidayRequest, LeaveBalance, SpecialHolidayTypes, SpecialHolidayUsage
+from LeaveTracker.services.holiday_submission import process_holiday_submission
+
+THREADS = 8
+
+
+def submit_concurrently(submissions):
+    """
+    Run (user, data) submissions from THREADS threads at once.
+
+    :return: (results, submissions per second)
+    """
+    results = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(THREADS)
+    chunks = [submissions[index::THREADS] for index in range(THREADS)]
+
+    def worker(chunk):
+        barrier.wait()
+        try:
+            for user, data in chunk:
+                while True:
+                    try:
+                        result = process_holiday_submission(user, data)
+                        break
+                    except OperationalError:
+                        # SQLite serialises writers and turns a busy database into an
+                        # error; servers with row locks wait instead
+                        time.sleep(0.01)
+                with lock:
+                    results.append(result)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, len(submissions) / (time.perf_counter() - started)
+
+
+def weekdays(first, count):
+    days = []
+    day = first
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+@pytest.fixture
+def employee():
+    user = User.objects.create_user(username="alice")
+    return Employee.objects.create(user=user, country_code="NL", available_holidays=25)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_submissions_never_overdraw_or_lose_updates(employee, record_property):
+    submissions = [
+        (employee.user, {"start_date": day.isoformat(), "end_date": day.isoformat(), "is_special": False})
+        for day in weekdays(date(2031, 1, 6), 40)
+    ]
+
+    results, rate = submit_concurrently(submissions)
+    record_property("submissions_per_second", round(rate))
+
+    assert [result["status"] for result in results].count("success") == 25
+    employee.refresh_from_db()
+    assert employee.available_holidays == 0
+    assert HolidayRequest.objects.filter(employee=employee).count() == 25
+    assert LeaveBalance.objects.get(employee=employee, year=2031).reserved == 25
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_first_special_submissions_share_one_usage_row(employee, record_property):
+    moving = SpecialHolidayTypes.objects.create(name="Moving", max_days=5)
+    submissions = [
+        (employee.user, {"start_date": day.isoformat(), "end_date": day.isoformat(), "is_special": True,
+                         "special_type_id": moving.id, "year": 2031})
+        for day in weekdays(date(2031, 1, 6), 16)
+    ]
+
+    results, rate = submit_concurrently(submissions)
+    record_property("submissions_per_second", round(rate))
+
+    assert [result["status"] for result in results].count("success") == 5
+    usage = SpecialHolidayUsage.objects.get(employee=employee, holiday_type=moving, year=2031)
+    assert usage.days_used == 5
+    employee.refresh_from_db()
+    assert employee.available_holidays == 25
+
+
+@pytest.mark.django_db(transaction=True)
+def test_overlapping_special_and_regular_submissions_keep_one(employee):
+    moving = SpecialHolidayTypes.objects.create(name="Moving", max_days=5)
+    funeral = SpecialHolidayTypes.objects.create(name="Funeral", max_days=5)
+    day = date(2031, 1, 6).isoformat()
+    base = {"start_date": day, "end_date": day, "year": 2031}
+    submissions = [
+        (employee.user, dict(base, is_special=False)),
+        (employee.user, dict(base, is_special=True, special_type_id=moving.id)),
+        (employee.user, dict(base, is_special=True, special_type_id=funeral.id)),
+    ] * (THREADS // 2)
+
+    results, _ = submit_concurrently(submissions[:THREADS])
+
+    assert [result["status"] for result in results].count("success") == 1
+    assert HolidayRequest.objects.filter(employee=employee).count() == 1
+    # The losers' reservations were rolled back
+    employee.refresh_from_db()
+    used = sum(SpecialHolidayUsage.objects.filter(employee=employee).values_list('days_used', flat=True))
+    assert (25 - employee.available_holidays) + used == 1
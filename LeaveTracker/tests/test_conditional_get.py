@@ -0,0 +1,101 @@
+import pytest
+from datetime import date
+from django.contrib.auth.models import User
+from django.urls import reverse
+from LeaveTracker.checks import check_shared_cache
+from LeaveTracker.models import Employee, HolidayRequest, PublicHoliday, SpecialHolidayTypes, SpecialHolidayUsage
+from LeaveTracker.utils.public_holidays_fetching import store_holidays
+from LeaveTracker.views import api
+
+
+@pytest.fixture
+def employee(client):
+    user = User.objects.create_user(username="alice", password="testpass")
+    client.login(username="alice", password="testpass")
+    return Employee.objects.create(user=user, country_code="NL")
+
+
+def revalidate(client, url, params, etag):
+    return client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+
+
+@pytest.mark.django_db
+def test_team_calendar_answers_304_until_its_months_change(client, employee, django_capture_on_commit_callbacks):
+    url, params = reverse("get_all_holidays"), {"from": "2025-03-01", "to": "2025-04-30"}
+    first = client.get(url, params)
+    assert first.status_code == 200 and first["ETag"]
+    assert "no-cache" in first["Cache-Control"]
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(api, "get_team_calendar", lambda *args: pytest.fail("the calendar was rebuilt"))
+        assert revalidate(client, url, params, first["ETag"]).status_code == 304
+
+        with django_capture_on_commit_callbacks(execute=True):
+            HolidayRequest.objects.create(employee=employee, days_taken=1, status="approved",
+                                          start_date=date(2025, 6, 2), end_date=date(2025, 6, 2))
+        assert revalidate(client, url, params, first["ETag"]).status_code == 304
+
+    with django_capture_on_commit_callbacks(execute=True):
+        HolidayRequest.objects.create(employee=employee, days_taken=1, status="approved",
+                                      start_date=date(2025, 3, 31), end_date=date(2025, 4, 1))
+    second = revalidate(client, url, params, first["ETag"])
+    assert second.status_code == 200 and len(second.json()["employee_holidays"]) == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        PublicHoliday.objects.create(name="Easter Monday", country_code="NL", date=date(2025, 4, 21))
+    assert revalidate(client, url, params, second["ETag"]).status_code == 200
+
+    # Imports write with bulk_create, which sends no signals
+    third = client.get(url, params)
+    assert revalidate(client, url, params, third["ETag"]).status_code == 304
+    with django_capture_on_commit_callbacks(execute=True):
+        store_holidays([PublicHoliday(name="King's Day", country_code="NL", date=date(2025, 4, 26))], "NL", 2025)
+    response = revalidate(client, url, params, third["ETag"])
+    assert response.status_code == 200 and len(response.json()["public_holidays"]) == 2
+
+    assert client.get(url, {"from": "2025-03-01"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_employee_endpoints_follow_their_own_data(client, employee, django_capture_on_commit_callbacks):
+    moving = SpecialHolidayTypes.objects.create(name="Moving", max_days=3)
+    usage_params = {"special_type_id": moving.id, "year": 2025}
+    endpoints = [
+        (reverse("get_available_holidays"), {}),
+        (reverse("get_user_existing_holidays"), {}),
+        (reverse("get_special_holiday_usage"), usage_params),
+    ]
+    etags = [client.get(url, params)["ETag"] for url, params in endpoints]
+    assert len(set(etags)) == 3
+    assert [revalidate(client, url, params, etag).status_code
+            for (url, params), etag in zip(endpoints, etags)] == [304, 304, 304]
+
+    # Someone else's leave leaves these responses alone
+    other = Employee.objects.create(user=User.objects.create_user(username="bob"))
+    with django_capture_on_commit_callbacks(execute=True):
+        HolidayRequest.objects.create(employee=other, days_taken=1, status="approved",
+                                      start_date=date(2025, 6, 2), end_date=date(2025, 6, 2))
+    assert revalidate(client, *endpoints[0], etags[0]).status_code == 304
+
+    with django_capture_on_commit_callbacks(execute=True):
+        SpecialHolidayUsage.objects.create(employee=employee, holiday_type=moving, year=2025, days_used=2)
+    response = revalidate(client, *endpoints[2], etags[2])
+    assert response.status_code == 200 and response.json()["used_days"] == 2
+
+
+@pytest.mark.django_db
+def test_no_etags_or_fragments_without_a_shared_cache(client, employee, settings):
+    settings.LEAVE_SHARED_CACHE = False
+    response = client.get(reverse("get_available_holidays"))
+    assert response.status_code == 200 and not response.has_header("ETag")
+
+    assert "Pending (0)" in client.get(reverse("my_holidays"), {"year": 2025}).content.decode()
+    HolidayRequest.objects.create(employee=employee, days_taken=1, status="pending",
+                                  start_date=date(2025, 2, 3), end_date=date(2025, 2, 3))
+    # Without the on-commit version bump, a cached fragment would go stale
+    response = client.get(reverse("my_holidays"), {"year": 2025})
+    assert "Pending (1)" in response.content.decode()
+
+    assert [warning.id for warning in check_shared_cache(None)] == ["LeaveTracker.W001"]
+    settings.LEAVE_SHARED_CACHE = True
+    assert check_shared_cache(None) == []
@@ -0,0 +1,66 @@
+import json
+import pytest
+from datetime import date
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from LeaveTracker.models import Employee, HolidayRequest, HolidayRollover, PublicHoliday, SpecialHolidayTypes, SpecialHolidayUsage
+from LeaveTracker.services.dashboard_bootstrap import get_quarter_range
+
+
+@pytest.fixture
+def employee(client):
+    user = User.objects.create_user(username="alice", password="testpass", first_name="Alice", last_name="Test")
+    client.login(username="alice", password="testpass")
+    return Employee.objects.create(user=user, country_code="NL", available_holidays=20)
+
+
+def test_quarter_range_matches_the_client_cache():
+    assert get_quarter_range(2025, 5) == (date(2025, 4, 1), date(2025, 6, 30))
+    assert get_quarter_range(2024, 12) == (date(2024, 10, 1), date(2024, 12, 31))
+
+
+@pytest.mark.django_db
+def test_bootstrap_replaces_the_separate_endpoints(client, employee, django_assert_max_num_queries):
+    moving = SpecialHolidayTypes.objects.create(name="Moving", max_days=3)
+    year = timezone.localdate().year
+    SpecialHolidayUsage.objects.create(employee=employee, holiday_type=moving, year=year, days_used=2)
+    SpecialHolidayUsage.objects.create(employee=employee, holiday_type=moving, year=year - 1, days_used=1)
+    HolidayRequest.objects.create(employee=employee, days_taken=2, status="approved",
+                                  start_date=date(2025, 5, 5), end_date=date(2025, 5, 6))
+    HolidayRequest.objects.create(employee=employee, days_taken=1, status="rejected",
+                                  start_date=date(2025, 5, 12), end_date=date(2025, 5, 12))
+    PublicHoliday.objects.create(name="Liberation Day", country_code="NL", date=date(2025, 5, 5))
+
+    with django_assert_max_num_queries(12) as few:
+        data = client.get(reverse("dashboard_bootstrap"), {"year": 2025, "month": 5}).json()
+    query_count = len(few)  # the query log is reset by the next request
+    assert data["available_holidays"] == 20
+    assert data["existing_holidays"] == [{"start_date": "2025-05-05", "end_date": "2025-05-06"}]
+    assert data["special_usage"] == {str(moving.id): {"max_days": 3, "used_days": 2}}
+    assert (data["calendar"]["from"], data["calendar"]["to"]) == ("2025-04-01", "2025-06-30")
+    assert data["calendar"]["employee_holidays"] == client.get(
+        reverse("get_all_holidays"), {"from": "2025-04-01", "to": "2025-06-30"}).json()["employee_holidays"]
+    assert data["calendar"]["public_holidays"] == [{"name": "Liberation Day", "date": "2025-05-05"}]
+
+    # More special types do not mean more queries
+    SpecialHolidayTypes.objects.bulk_create(SpecialHolidayTypes(name=f"Type {n}", max_days=n) for n in range(10))
+    with django_assert_max_num_queries(query_count):
+        data = client.get(reverse("dashboard_bootstrap"), {"year": 2025, "month": 5}).json()
+    assert len(data["special_usage"]) == 11
+
+    assert client.get(reverse("dashboard_bootstrap"), {"month": 13}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_home_page_embeds_the_bootstrap(client, employee):
+    HolidayRollover.objects.create(year=timezone.now().year, employees_processed=1, duration_seconds=0)
+    response = client.get(reverse("home"))
+    assert response.status_code == 200
+
+    content = response.content.decode()
+    start = content.index('<script id="dashboard-bootstrap" type="application/json">') + \
+        len('<script id="dashboard-bootstrap" type="application/json">')
+    inline = json.loads(content[start:content.index('</script>', start)])
+    today = timezone.localdate()
+    assert inline == client.get(reverse("dashboard_bootstrap"), {"year": today.year, "month": today.month}).json()
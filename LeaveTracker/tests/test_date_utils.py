@@ -0,0 +1,73 @@
+import random
+from datetime import date, timedelta
+from LeaveTracker.utils.date_utils import (
+    count_business_days,
+    count_business_days_batch,
+    count_non_weekend_and_non_holiday_days,
+    prepare_holidays,
+    total_days_for_queryset,
+)
+
+
+def reference_count(start_date, end_date, holidays):
+    # Day-by-day implementation the closed form replaced
+    holidays = set(holidays)
+    count = 0
+    day = start_date
+    while day <= end_date:
+        if day.weekday() < 5 and day not in holidays:
+            count += 1
+        day += timedelta(days=1)
+    return count
+
+
+def random_case(rng):
+    start = date(2020, 1, 1) + timedelta(days=rng.randint(0, 2000))
+    end = start + timedelta(days=rng.randint(-5, 800))
+    holidays = [
+        date(2020, 1, 1) + timedelta(days=rng.randint(0, 2900))
+        for _ in range(rng.randint(0, 40))
+    ]
+    return start, end, holidays
+
+
+def test_count_business_days_matches_reference_implementation():
+    rng = random.Random(1234)
+    for _ in range(2000):
+        start, end, holidays = random_case(rng)
+        assert count_business_days(start, end, holidays) == reference_count(start, end, holidays)
+
+
+def test_batch_matches_single_counts():
+    rng = random.Random(99)
+    holidays = prepare_holidays(random_case(rng)[2])
+    ranges = [random_case(rng)[:2] for _ in range(500)]
+
+    counts = count_business_days_batch(ranges, holidays)
+
+    assert counts == [reference_count(start, end, holidays) for start, end in ranges]
+
+
+def test_weekend_and_duplicate_holidays_are_ignored():
+    # 2025-07-19 is a Saturday, 2025-07-21 a Monday
+    holidays = [date(2025, 7, 19), date(2025, 7, 21), date(2025, 7, 21)]
+
+    assert count_business_days(date(2025, 7, 19), date(2025, 7, 25), holidays) == 4
+    assert prepare_holidays(holidays) == (date(2025, 7, 21),)
+
+
+def test_reversed_range_counts_zero():
+    assert count_business_days(date(2025, 7, 25), date(2025, 7, 22)) == 0
+    assert count_non_weekend_and_non_holiday_days(date(2025, 7, 25), date(2025, 7, 22), []) == 0
+
+
+def test_total_days_for_queryset_sums_rows():
+    class Row:
+        def __init__(self, start_date, end_date):
+            self.start_date = start_date
+            self.end_date = end_date
+
+    rows = [Row(date(2025, 7, 21), date(2025, 7, 25)), Row(date(2025, 12, 22), date(2026, 1, 2))]
+    holidays = [date(2025, 12, 25), date(2025, 12, 26), date(2026, 1, 1)]
+
+    assert total_days_for_queryset(rows, holidays) == 5 + 7
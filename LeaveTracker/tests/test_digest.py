@@ -0,0 +1,98 @@
+import pytest
+from datetime import date, timedelta
+from django.contrib.auth.models import User, Group, Permission
+from django.core.management import call_command
+from django.utils import timezone
+from LeaveTracker.emails.digest import send_review_digests
+from LeaveTracker.emails.outbox import dispatch_pending_emails
+from LeaveTracker.models import EmailOutbox, Employee, HolidayRequest
+
+
+@pytest.fixture
+def team():
+    reviewers = Group.objects.create(name="Reviewers")
+    reviewers.permissions.add(Permission.objects.get(codename="review_holiday_requests_all"))
+    User.objects.create_user(username="hr", email="hr@example.com").groups.add(reviewers)
+
+    manager = Employee.objects.create(user=User.objects.create_user(username="manager", email="manager@example.com"))
+    members = [
+        Employee.objects.create(
+            user=User.objects.create_user(username=f"member{i}", first_name="Member", last_name=str(i)),
+            manager=manager,
+        )
+        for i in range(3)
+    ]
+    other = Employee.objects.create(user=User.objects.create_user(username="other", first_name="Other", last_name="One"))
+    return members, other
+
+
+@pytest.mark.django_db
+def test_digest_mode_queues_one_email_per_reviewer(settings, team):
+    settings.LEAVE_NOTIFICATION_MODE = "digest"
+    members, other = team
+
+    for i, employee in enumerate(members + [other]):
+        HolidayRequest.objects.create(employee=employee, days_taken=1,
+                                      start_date=date(2025, 7, 21 + i), end_date=date(2025, 7, 21 + i))
+    assert not EmailOutbox.objects.exists()
+
+    run = send_review_digests()
+
+    assert run.requests_included == 4
+    assert run.reviewers_notified == 2
+    digests = {email.to_email: email for email in EmailOutbox.objects.all()}
+    assert set(digests) == {"hr@example.com", "manager@example.com"}
+    assert len(digests["hr@example.com"].context["requests"]) == 4
+    assert [r["employee_fullname"] for r in digests["manager@example.com"].context["requests"]] == [
+        "Member 0", "Member 1", "Member 2",
+    ]
+
+
+@pytest.mark.django_db
+def test_each_request_is_digested_once_whenever_it_commits(settings, team):
+    settings.LEAVE_NOTIFICATION_MODE = "digest"
+    members, _ = team
+    now = timezone.now()
+
+    HolidayRequest.objects.create(employee=members[0], days_taken=1,
+                                  start_date=date(2025, 7, 21), end_date=date(2025, 7, 21))
+    send_review_digests(now=now)
+    EmailOutbox.objects.all().delete()
+
+    # Built before the previous run ended but committed after it
+    late = HolidayRequest.objects.create(employee=members[1], days_taken=1, created_at=now - timedelta(minutes=5),
+                                         start_date=date(2025, 7, 22), end_date=date(2025, 7, 22))
+    # Reviewed before any run, so it needs no reminder
+    HolidayRequest.objects.create(employee=members[2], days_taken=1, status="approved",
+                                  start_date=date(2025, 7, 23), end_date=date(2025, 7, 23))
+    run = send_review_digests(now=now + timedelta(minutes=10))
+
+    assert run.requests_included == 1
+    assert EmailOutbox.objects.get(to_email="manager@example.com").context["requests"][0]["start_date"] == \
+        late.start_date.isoformat()
+    assert not HolidayRequest.objects.filter(awaiting_digest=True).exists()
+    assert send_review_digests(now=now + timedelta(minutes=10)) is None
+
+    call_command("send_review_digests")
+    assert EmailOutbox.objects.filter(to_email="manager@example.com").count() == 1
+
+
+@pytest.mark.django_db
+def test_immediate_mode_leaves_nothing_for_a_digest(team):
+    members, _ = team
+    HolidayRequest.objects.create(employee=members[0], days_taken=1,
+                                  start_date=date(2025, 7, 21), end_date=date(2025, 7, 21))
+    assert send_review_digests().requests_included == 0
+
+
+@pytest.mark.django_db
+def test_digest_run_renders_templates(settings, team, mailoutbox):
+    settings.LEAVE_NOTIFICATION_MODE = "digest"
+    members, _ = team
+    HolidayRequest.objects.create(employee=members[0], days_taken=1,
+                                  start_date=date(2025, 7, 21), end_date=date(2025, 7, 21))
+    send_review_digests()
+
+    assert dispatch_pending_emails() == (2, 0)
+    html = mailoutbox[0].alternatives[0][0]
+    assert "Member 0" in html and "2025-07-21" in html
@@ -0,0 +1,75 @@
+import io
+import json
+import pytest
+import openpyxl
+from datetime import date
+from django.urls import reverse
+from django.contrib.auth.models import User, Permission
+from LeaveTracker.models import Employee, HolidayRequest, SpecialHolidayTypes
+
+
+@pytest.fixture
+def exporter(client):
+    user = User.objects.create_user(username="exporter", password="testpass")
+    user.user_permissions.add(Permission.objects.get(codename="view_all_employees"))
+    client.login(username="exporter", password="testpass")
+
+    employee = Employee.objects.create(
+        user=User.objects.create_user(username="anna", first_name="Anna", last_name="Smith")
+    )
+    marriage = SpecialHolidayTypes.objects.create(name="Marriage Leave", max_days=5)
+    HolidayRequest.objects.create(employee=employee, days_taken=2, status="approved",
+                                  start_date=date(2025, 7, 21), end_date=date(2025, 7, 22))
+    HolidayRequest.objects.create(employee=employee, days_taken=1, status="approved", is_special=True,
+                                  special_type=marriage, start_date=date(2025, 9, 1), end_date=date(2025, 9, 1))
+    HolidayRequest.objects.create(employee=employee, days_taken=1, status="pending",
+                                  start_date=date(2025, 10, 1), end_date=date(2025, 10, 1))
+    return client
+
+
+def download(client, **params):
+    response = client.get(reverse("export_holidays"), {"year": 2025, **params})
+    assert response.streaming
+    return response, b"".join(response.streaming_content)
+
+
+@pytest.mark.django_db
+def test_xlsx_export_streams_a_workbook(exporter):
+    response, content = download(exporter)
+
+    assert response["Content-Disposition"] == 'attachment; filename="holidays_2025.xlsx"'
+    rows = list(openpyxl.load_workbook(io.BytesIO(content)).active.values)
+    assert rows == [
+        ("Employee", "Start Date", "End Date", "Days Taken", "Holiday Type"),
+        ("Anna Smith", "2025-07-21", "2025-07-22", 2, "Regular Holiday"),
+        ("Anna Smith", "2025-09-01", "2025-09-01", 1, "Special Holiday - Marriage Leave"),
+    ]
+
+
+@pytest.mark.django_db
+def test_csv_and_ndjson_exports(exporter):
+    response, content = download(exporter, format="csv")
+    assert response["Content-Type"] == "text/csv"
+    assert content.decode().splitlines() == [
+        "Employee,Start Date,End Date,Days Taken,Holiday Type",
+        "Anna Smith,2025-07-21,2025-07-22,2,Regular Holiday",
+        "Anna Smith,2025-09-01,2025-09-01,1,Special Holiday - Marriage Leave",
+    ]
+
+    _, content = download(exporter, format="ndjson")
+    records = [json.loads(line) for line in content.decode().splitlines()]
+    assert records[0] == {
+        "employee": "Anna Smith", "start_date": "2025-07-21", "end_date": "2025-07-22",
+        "days_taken": 2, "holiday_type": "Regular Holiday",
+    }
+    assert len(records) == 2
+
+
+@pytest.mark.django_db
+def test_export_rejects_unknown_format_and_missing_permission(exporter, client):
+    response = exporter.get(reverse("export_holidays"), {"year": 2025, "format": "pdf"})
+    assert response.status_code == 400
+
+    User.objects.create_user(username="nobody", password="testpass")
+    client.login(username="nobody", password="testpass")
+    assert client.get(reverse("export_holidays"), {"year": 2025}).status_code == 403
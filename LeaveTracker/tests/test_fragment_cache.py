@@ -0,0 +1,72 @@
+import pytest
+from datetime import date
+from django.contrib.auth.models import Permission, User
+from django.urls import reverse
+from LeaveTracker.models import Employee, HolidayRequest
+
+
+def create_employee(username, password=None, manager=None):
+    user = User.objects.create_user(username=username, password=password,
+                                    first_name=username.title(), last_name="Test")
+    return Employee.objects.create(user=user, manager=manager)
+
+
+def create_request(employee, start, status="approved"):
+    return HolidayRequest.objects.create(employee=employee, days_taken=1, status=status,
+                                         start_date=start, end_date=start)
+
+
+@pytest.mark.django_db
+def test_my_holidays_reuses_its_fragments_until_the_employee_changes(
+        client, django_assert_max_num_queries, django_capture_on_commit_callbacks):
+    alice = create_employee("alice", password="testpass")
+    create_employee("bob", password="testpass")
+    year = date.today().year
+    with django_capture_on_commit_callbacks(execute=True):
+        create_request(alice, date(year, 1, 6))
+    client.login(username="alice", password="testpass")
+
+    with django_assert_max_num_queries(30) as cold:
+        client.get(reverse("my_holidays"), {"year": year})
+    cold_count = len(cold)  # the query log is reset by the next request
+    with django_assert_max_num_queries(cold_count - 2):
+        response = client.get(reverse("my_holidays"), {"year": year})
+    assert "Past (1)" in response.content.decode()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        create_request(alice, date(year, 2, 3), status="pending")
+    response = client.get(reverse("my_holidays"), {"year": year})
+    assert "Pending (1)" in response.content.decode()
+
+    # Fragments are not shared between employees
+    client.login(username="bob", password="testpass")
+    content = client.get(reverse("my_holidays"), {"year": year}).content.decode()
+    assert "Past (0)" in content and "Pending (0)" in content
+
+
+@pytest.mark.django_db
+def test_manage_holidays_dropdowns_follow_employees_and_years(
+        client, django_assert_max_num_queries, django_capture_on_commit_callbacks):
+    manager = create_employee("manager", password="testpass")
+    manager.user.user_permissions.add(Permission.objects.get(codename="view_managed_employees"))
+    with django_capture_on_commit_callbacks(execute=True):
+        create_request(create_employee("member", manager=manager), date(2024, 5, 6))
+    client.login(username="manager", password="testpass")
+
+    with django_assert_max_num_queries(30) as cold:
+        client.get(reverse("manage_holidays"))
+    cold_count = len(cold)
+    with django_assert_max_num_queries(cold_count - 2):
+        content = client.get(reverse("manage_holidays")).content.decode()
+    assert "Member Test" in content and '<option value="2024">' in content
+
+    with django_capture_on_commit_callbacks(execute=True):
+        create_request(create_employee("newcomer", manager=manager), date(2025, 5, 5))
+    content = client.get(reverse("manage_holidays")).content.decode()
+    assert "Newcomer Test" in content and '<option value="2025">' in content
+
+    # Another manager's team is cached under their own scope
+    other = create_employee("other", password="testpass")
+    other.user.user_permissions.add(Permission.objects.get(codename="view_managed_employees"))
+    client.login(username="other", password="testpass")
+    assert "Member Test" not in client.get(reverse("manage_holidays")).content.decode()
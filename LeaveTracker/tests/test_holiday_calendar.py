@@ -0,0 +1,109 @@
+import time
+import pytest
+from datetime import date
+from unittest.mock import patch, Mock
+from django.core.cache import cache
+from LeaveTracker.models import Event, PublicHoliday
+from LeaveTracker.services.holiday_calendar import (
+    CALENDAR_CACHE_TTL,
+    _load_calendar as load_calendar,
+    count_working_days,
+    get_calendar_cache_stats,
+    get_holiday_calendar,
+    get_holidays_between,
+    invalidate_holiday_calendar,
+)
+from LeaveTracker.utils.public_holidays_fetching import fetch_and_store_holidays
+
+
+@pytest.mark.django_db
+def test_calendar_is_loaded_once_per_country_and_year(django_assert_num_queries):
+    PublicHoliday.objects.create(name="Kingsday", country_code="NL", date=date(2025, 4, 28))
+
+    with django_assert_num_queries(2):
+        first = get_holiday_calendar("NL", 2025)
+    with django_assert_num_queries(0):
+        second = get_holiday_calendar("NL", 2025)
+
+    assert first == second == (date(2025, 4, 28),)
+    stats = get_calendar_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+@pytest.mark.django_db
+def test_calendar_merges_public_holidays_and_events():
+    PublicHoliday.objects.create(name="Kingsday", country_code="NL", date=date(2025, 4, 28))
+    PublicHoliday.objects.create(name="Labour Day", country_code="GR", date=date(2025, 5, 1))
+    Event.objects.create(title="Office closed", start_date=date(2025, 12, 29), end_date=date(2026, 1, 2))
+
+    assert get_holiday_calendar("NL", 2025) == (
+        date(2025, 4, 28), date(2025, 12, 29), date(2025, 12, 30), date(2025, 12, 31),
+    )
+    assert get_holidays_between("NL", date(2025, 12, 1), date(2026, 1, 31))[-2:] == (
+        date(2026, 1, 1), date(2026, 1, 2),
+    )
+    # Mon 2025-12-29 to Fri 2026-01-09 minus five closed days
+    assert count_working_days("NL", date(2025, 12, 29), date(2026, 1, 9)) == 5
+
+
+@pytest.mark.django_db
+def test_public_holiday_changes_invalidate_cached_calendar(django_capture_on_commit_callbacks):
+    assert get_holiday_calendar("NL", 2025) == ()
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        holiday = PublicHoliday.objects.create(name="Kingsday", country_code="NL", date=date(2025, 4, 28))
+        # Not before commit, so nothing can reload the calendar from rows
+        # other requests cannot see yet
+        assert get_calendar_cache_stats()["size"] == 1
+    for callback in callbacks:
+        callback()
+    assert get_holiday_calendar("NL", 2025) == (date(2025, 4, 28),)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        holiday.delete()
+    assert get_holiday_calendar("NL", 2025) == ()
+
+
+@pytest.mark.django_db
+def test_calendar_follows_changes_made_by_other_workers(settings):
+    assert get_holiday_calendar("NL", 2025) == ()
+    PublicHoliday.objects.bulk_create([PublicHoliday(name="Kingsday", country_code="NL", date=date(2025, 4, 28))])
+
+    # Another worker committing a change bumps the shared calendar version
+    cache.incr("data_version:calendar")
+    assert get_holiday_calendar("NL", 2025) == (date(2025, 4, 28),)
+
+    # Without a shared cache the entries expire instead
+    settings.LEAVE_SHARED_CACHE = False
+    PublicHoliday.objects.bulk_create([PublicHoliday(name="Labour Day", country_code="NL", date=date(2025, 5, 1))])
+    with patch("LeaveTracker.services.holiday_calendar.time.monotonic",
+               return_value=time.monotonic() + CALENDAR_CACHE_TTL):
+        assert len(get_holiday_calendar("NL", 2025)) == 2
+
+
+@pytest.mark.django_db
+def test_load_racing_an_invalidation_is_not_stored():
+    def load_then_invalidate(*args):
+        calendar = load_calendar(*args)
+        invalidate_holiday_calendar()
+        return calendar
+
+    with patch("LeaveTracker.services.holiday_calendar._load_calendar", side_effect=load_then_invalidate):
+        get_holiday_calendar("NL", 2025)
+    assert get_calendar_cache_stats()["size"] == 0
+
+
+@pytest.mark.django_db
+def test_fetch_and_store_holidays_invalidates_calendar(django_capture_on_commit_callbacks):
+    assert get_holiday_calendar("NL", 2025) == ()
+
+    response = Mock(status_code=200, headers={})
+    response.json.return_value = {"response": {"holidays": [
+        {"name": "Christmas Day", "date": {"iso": "2025-12-25"}},
+    ]}}
+    with patch("LeaveTracker.utils.public_holidays_fetching.requests.get", return_value=response):
+        with django_capture_on_commit_callbacks(execute=True):
+            fetch_and_store_holidays("key", "NL", 2025)
+
+    assert get_calendar_cache_stats()["size"] == 0
@@ -0,0 +1,87 @@
+import logging
+import pytest
+from django.contrib.auth.models import User
+from django.test import Client
+from django.urls import reverse
+from LeaveTracker.middleware import RequestMetrics, fingerprint
+from LeaveTracker.models import Employee
+
+
+@pytest.fixture
+def records(caplog, monkeypatch):
+    # The LeaveTracker logger does not propagate to the root handler caplog uses
+    monkeypatch.setattr(logging.getLogger('LeaveTracker'), 'propagate', True)
+    caplog.set_level(logging.INFO, logger='LeaveTracker')
+    return lambda: [r.request_metrics for r in caplog.records if hasattr(r, 'request_metrics')]
+
+
+@pytest.fixture
+def member(client):
+    user = User.objects.create_user(username="member", password="testpass")
+    Employee.objects.create(user=user)
+    client.login(username="member", password="testpass")
+    return user
+
+
+def test_fingerprint_ignores_in_list_length():
+    assert fingerprint('SELECT 1 WHERE id IN (%s, %s)')[0] == fingerprint('SELECT 1 WHERE id IN (%s)')[0]
+    assert fingerprint('SELECT 1')[0] != fingerprint('SELECT 2')[0]
+
+
+def test_duplicates_report_repeated_statements():
+    metrics = RequestMetrics()
+    execute = lambda sql, params, many, context: None
+    for i in range(3):
+        metrics(execute, 'SELECT * FROM "Employee" WHERE id = %s', [i], False, {})
+    metrics(execute, 'SELECT 1', [], False, {})
+
+    assert metrics.queries == 4
+    assert [(d['count'], d['sql']) for d in metrics.duplicates()] == [(3, 'SELECT * FROM "Employee" WHERE id = %s')]
+
+
+@pytest.mark.django_db
+def test_request_metrics_are_logged_with_server_timing(client, member, records, settings):
+    settings.LEAVE_SERVER_TIMING = True
+    response = client.get(reverse("my_holidays"))
+
+    assert response.status_code == 200
+    assert 'db;dur=' in response['Server-Timing'] and 'tpl;dur=' in response['Server-Timing']
+    record = records()[-1]
+    assert record['view'] == 'my_holidays'
+    assert record['queries'] > 0
+    assert record['template_ms'] > 0
+    assert 'sql' not in record
+
+
+@pytest.mark.django_db
+def test_slow_requests_capture_full_sql(client, member, records, settings, caplog):
+    settings.LEAVE_SERVER_TIMING = False
+    settings.LEAVE_SLOW_REQUEST_QUERIES = 1
+    settings.LEAVE_SQL_SAMPLE_RATE = 1.0
+    response = client.get(reverse("get_all_holidays"), {"year": 2025, "month": 3})
+
+    assert 'Server-Timing' not in response
+    assert caplog.records[-1].levelno == logging.WARNING
+    record = records()[-1]
+    assert len(record['sql']) == record['queries']
+    # Only the placeholders are logged, never the values bound to them
+    assert all(set(entry) == {'fingerprint', 'sql', 'ms'} for entry in record['sql'])
+    assert any('%s' in entry['sql'] for entry in record['sql'])
+
+
+@pytest.mark.django_db
+def test_slow_requests_outside_the_sample_log_no_sql(client, member, records, settings):
+    settings.LEAVE_SLOW_REQUEST_QUERIES = 1
+    settings.LEAVE_SQL_SAMPLE_RATE = 0.0
+    client.get(reverse("get_all_holidays"), {"year": 2025, "month": 3})
+    assert 'sql' not in records()[-1]
+
+
+@pytest.mark.django_db
+def test_instrumentation_can_be_switched_off(member, records, settings):
+    settings.LEAVE_INSTRUMENTATION = False
+    # The middleware is set up when a client handles its first request
+    client = Client()
+    client.login(username="member", password="testpass")
+    client.get(reverse("my_holidays"))
+    assert records() == []
@@ -0,0 +1,103 @@
+import pytest
+from datetime import date
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from LeaveTracker.models import Employee, HolidayRequest, LeaveDay, PublicHoliday
+from LeaveTracker.services.leave_days import get_absence_heatmap
+
+
+def create_employee(username, manager=None, country_code="NL"):
+    user = User.objects.create_user(username=username, password="testpass",
+                                    first_name=username.title(), last_name="Test")
+    return Employee.objects.create(user=user, manager=manager, country_code=country_code)
+
+
+def create_request(employee, start_date, end_date, status="pending"):
+    return HolidayRequest.objects.create(
+        employee=employee, days_taken=1, start_date=start_date, end_date=end_date, status=status
+    )
+
+
+def leave_days(holiday_request):
+    return list(LeaveDay.objects.filter(holiday_request=holiday_request).order_by('date').values_list('date', 'status'))
+
+
+@pytest.mark.django_db
+def test_leave_days_follow_request_lifecycle():
+    PublicHoliday.objects.create(name="King's Day", country_code="NL", date=date(2025, 4, 28))
+    employee = create_employee("member")
+
+    # Friday to Tuesday over a weekend and a public holiday
+    holiday = create_request(employee, date(2025, 4, 25), date(2025, 4, 29))
+    assert leave_days(holiday) == [(date(2025, 4, 25), "pending"), (date(2025, 4, 29), "pending")]
+
+    holiday.status = "approved"
+    holiday.save()
+    assert [status for _, status in leave_days(holiday)] == ["approved", "approved"]
+
+    holiday.end_date = date(2025, 4, 30)
+    holiday.save()
+    assert len(leave_days(holiday)) == 3
+
+    holiday.deleted = timezone.now()
+    holiday.save()
+    assert leave_days(holiday) == []
+
+    rejected = create_request(employee, date(2025, 5, 5), date(2025, 5, 6))
+    rejected.status = "rejected"
+    rejected.save()
+    assert leave_days(rejected) == []
+
+
+@pytest.mark.django_db
+def test_heatmap_counts_visible_team_in_one_query(client, django_assert_num_queries):
+    manager = create_employee("manager")
+    member = create_employee("member", manager)
+    peer = create_employee("peer", manager)
+    outsider = create_employee("outsider")
+    create_request(member, date(2025, 3, 3), date(2025, 3, 5), status="approved")
+    create_request(peer, date(2025, 3, 4), date(2025, 3, 4))
+    create_request(outsider, date(2025, 3, 4), date(2025, 3, 4), status="approved")
+
+    client.login(username="member", password="testpass")
+    url = reverse("absence_heatmap")
+    response = client.get(url, {"from": "2025-03-01", "to": "2025-03-31"})
+
+    assert response.status_code == 200
+    assert response.json()["days"] == [
+        {"date": "2025-03-03", "absent": 1, "approved": 1},
+        {"date": "2025-03-04", "absent": 2, "approved": 1},
+        {"date": "2025-03-05", "absent": 1, "approved": 1},
+    ]
+    response = client.get(url, {"from": "2025-03-01", "to": "2025-03-31", "include_pending": "false"})
+    assert [day["absent"] for day in response.json()["days"]] == [1, 1, 1]
+
+    user = User.objects.get(username="member")
+    user.has_perm('LeaveTracker.view_all_employees')  # warm the permission cache
+    with django_assert_num_queries(2):  # the user's team plus the GROUP BY
+        get_absence_heatmap(user, date(2025, 3, 1), date(2025, 3, 31))
+
+
+@pytest.mark.django_db
+def test_who_is_out(client):
+    manager = create_employee("manager")
+    member = create_employee("member", manager)
+    create_request(member, date(2025, 3, 3), date(2025, 3, 5), status="approved")
+
+    client.login(username="manager", password="testpass")
+    response = client.get(reverse("who_is_out"), {"date": "2025-03-04"})
+    assert [e["employee_name"] for e in response.json()["employees"]] == ["Member Test"]
+    assert client.get(reverse("who_is_out"), {"date": "nope"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_rebuild_command_recreates_rows():
+    employee = create_employee("member")
+    holiday = create_request(employee, date(2025, 3, 3), date(2025, 3, 7), status="approved")
+    LeaveDay.objects.all().delete()
+
+    call_command("rebuild_leave_days")
+
+    assert len(leave_days(holiday)) == 5
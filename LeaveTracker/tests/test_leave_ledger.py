@@ -0,0 +1,188 @@
+import importlib
+import pytest
+from datetime import date, timedelta
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.http import Http404
+from django.utils import timezone
+from LeaveTracker.models import Employee, HolidayRequest, LeaveBalance, LeaveLedgerEntry, PublicHoliday
+from LeaveTracker.services.holiday_review import approve_holiday_request, reject_holiday_request
+from LeaveTracker.services.holiday_submission import process_holiday_submission
+from LeaveTracker.services.home_summary import rollover_annual_holidays
+from LeaveTracker.services.leave_ledger import (
+    get_leave_balance,
+    get_leave_balance_as_of,
+    record_ledger_entry,
+)
+
+
+def create_employee(username, available=20):
+    user = User.objects.create_user(username=username, email=f"{username}@example.com")
+    return Employee.objects.create(user=user, available_holidays=available, last_holiday_year_update=2024)
+
+
+def submit(employee, start, end):
+    result = process_holiday_submission(employee.user, {"start_date": start, "end_date": end, "is_special": False})
+    assert result["status"] == "success"
+    return HolidayRequest.objects.filter(employee=employee).latest('id')
+
+
+@pytest.mark.django_db
+def test_request_lifecycle_moves_balance_snapshot():
+    reviewer = User.objects.create_superuser(username="reviewer")
+    employee = create_employee("user")
+    record_ledger_entry(employee, 2025, 'grant', 20)
+
+    first = submit(employee, "2025-07-21", "2025-07-23")   # 3 days
+    second = submit(employee, "2025-08-04", "2025-08-05")  # 2 days
+    balance = get_leave_balance(employee, 2025)
+    assert (balance.reserved, balance.consumed, balance.available) == (5, 0, 15)
+
+    approve_holiday_request(reviewer, first.id)
+    reject_holiday_request(reviewer, second.id)
+    with pytest.raises(Http404):
+        reject_holiday_request(reviewer, second.id)  # a second rejection gives nothing back
+
+    balance = get_leave_balance(employee, 2025)
+    assert (balance.reserved, balance.consumed, balance.available) == (0, 3, 17)
+    employee.refresh_from_db()
+    assert employee.available_holidays == balance.available
+    assert list(LeaveLedgerEntry.objects.filter(employee=employee).order_by('id').values_list('kind', flat=True)) == [
+        'grant', 'reserve', 'reserve', 'consume', 'release'
+    ]
+
+
+@pytest.mark.django_db
+def test_deleting_approved_request_refunds(client):
+    user = User.objects.create_user(username="admin", password="pw", is_superuser=True)
+    client.login(username="admin", password="pw")
+    employee = create_employee("user")
+    record_ledger_entry(employee, 2025, 'grant', 20)
+    holiday = submit(employee, "2025-07-21", "2025-07-22")
+    approve_holiday_request(user, holiday.id)
+
+    response = client.post(f"/delete-holiday/{holiday.id}/")
+    assert response.status_code == 200
+    client.post(f"/delete-holiday/{holiday.id}/")  # already deleted
+
+    employee.refresh_from_db()
+    balance = get_leave_balance(employee, 2025)
+    assert balance.consumed == 0
+    assert employee.available_holidays == balance.available == 20
+
+
+@pytest.mark.django_db
+def test_deleted_requests_cannot_be_reviewed(client):
+    User.objects.create_user(username="admin", password="pw", is_superuser=True)
+    client.login(username="admin", password="pw")
+    employee = create_employee("user")
+    record_ledger_entry(employee, 2025, 'grant', 20)
+    holiday = submit(employee, "2025-07-21", "2025-07-22")
+    client.post(f"/delete-holiday/{holiday.id}/")
+
+    # The delete already gave the days back
+    reviewer = User.objects.get(username="admin")
+    for review in (reject_holiday_request, approve_holiday_request):
+        with pytest.raises(Http404):
+            review(reviewer, holiday.id)
+    employee.refresh_from_db()
+    balance = get_leave_balance(employee, 2025)
+    assert (balance.reserved, balance.consumed) == (0, 0)
+    assert employee.available_holidays == balance.available == 20
+
+
+@pytest.mark.django_db
+def test_deleting_refunds_what_was_reserved_after_the_calendar_changes(client, django_capture_on_commit_callbacks):
+    User.objects.create_user(username="admin", password="pw", is_superuser=True)
+    client.login(username="admin", password="pw")
+    employee = create_employee("user")
+    record_ledger_entry(employee, 2025, 'grant', 20)
+    holiday = submit(employee, "2025-07-21", "2025-07-23")  # 3 days
+
+    # A public holiday imported later falls inside the request
+    with django_capture_on_commit_callbacks(execute=True):
+        PublicHoliday.objects.create(name="Late addition", country_code=employee.country_code, date=date(2025, 7, 22))
+    client.post(f"/delete-holiday/{holiday.id}/")
+
+    employee.refresh_from_db()
+    balance = get_leave_balance(employee, 2025)
+    assert balance.reserved == 0
+    assert employee.available_holidays == balance.available == 20
+
+
+@pytest.mark.django_db
+def test_balance_as_of_replays_ledger():
+    employee = create_employee("user")
+    record_ledger_entry(employee, 2025, 'grant', 25)
+    checkpoint = timezone.now()
+    LeaveLedgerEntry.objects.create(
+        employee=employee, year=2025, kind='reserve', days=4, created_at=checkpoint + timedelta(seconds=1)
+    )
+
+    assert get_leave_balance_as_of(employee, 2025, checkpoint).available == 25
+    assert get_leave_balance_as_of(employee, 2025, checkpoint + timedelta(seconds=2)).available == 21
+
+
+@pytest.mark.django_db
+def test_balance_read_is_a_single_query(django_assert_num_queries):
+    employee = create_employee("user")
+    with django_assert_num_queries(1):
+        assert get_leave_balance(employee, 2025).available == 0
+
+
+@pytest.mark.django_db
+def test_rollover_records_grants():
+    employees = [create_employee(f"user{i}", available=0) for i in range(3)]
+
+    rollover_annual_holidays(2025, chunk_size=2)
+
+    for employee in employees:
+        assert get_leave_balance(employee, 2025).granted == employee.annual_holidays
+
+
+@pytest.mark.django_db
+def test_rebuild_matches_available_holidays():
+    employee = create_employee("user", available=10)
+    HolidayRequest.objects.create(
+        employee=employee, days_taken=3, start_date=date(2025, 3, 3), end_date=date(2025, 3, 5), status="approved"
+    )
+    HolidayRequest.objects.create(
+        employee=employee, days_taken=2, start_date=date(2026, 1, 5), end_date=date(2026, 1, 6), status="pending"
+    )
+
+    call_command("rebuild_leave_ledger")
+
+    assert get_leave_balance(employee, 2025).consumed == 3
+    assert get_leave_balance(employee, 2026).reserved == 2
+    total = sum(get_leave_balance(employee, year).available for year in (2025, 2026))
+    assert total == employee.available_holidays
+
+
+@pytest.mark.django_db
+def test_migration_backfills_what_the_rebuild_would_write():
+    backfill = importlib.import_module("LeaveTracker.migrations.0012_backfill_leave_ledger").backfill_leave_ledger
+    employee = create_employee("user", available=10)
+    HolidayRequest.objects.create(
+        employee=employee, days_taken=3, start_date=date(2025, 3, 3), end_date=date(2025, 3, 5), status="approved"
+    )
+    HolidayRequest.objects.create(
+        employee=employee, days_taken=2, start_date=date(2026, 1, 5), end_date=date(2026, 1, 6), status="pending"
+    )
+    # Upgraded installs have requests but no ledger yet
+    LeaveLedgerEntry.objects.all().delete()
+    LeaveBalance.objects.all().delete()
+
+    def snapshots():
+        return set(LeaveBalance.objects.values_list('year', 'granted', 'reserved', 'consumed'))
+
+    backfill(apps, None)
+    backfilled = snapshots()
+    assert (2025, 0, 0, 3) in backfilled
+    assert sum(granted - reserved - consumed for _, granted, reserved, consumed in backfilled) == 10
+
+    backfill(apps, None)  # employees with a ledger are left alone
+    assert LeaveLedgerEntry.objects.count() == 4
+
+    call_command("rebuild_leave_ledger")
+    assert snapshots() == backfilled
@@ -0,0 +1,54 @@
+import pytest
+from datetime import date
+from django.contrib.auth.models import User
+from LeaveTracker.models import Employee, HolidayRequest
+from LeaveTracker.services.manage_holiday_overview import get_approved_requests, get_manage_holiday_scope
+
+
+def create_employee(username, country_code="NL", manager=None):
+    user = User.objects.create_user(username=username, first_name=username.title(), last_name="Test")
+    return Employee.objects.create(user=user, country_code=country_code, manager=manager)
+
+
+def create_request(employee, start_date, end_date, **kwargs):
+    return HolidayRequest.objects.create(
+        employee=employee, days_taken=0, start_date=start_date, end_date=end_date, **kwargs
+    )
+
+
+@pytest.mark.django_db
+def test_scope_follows_view_permissions():
+    manager = create_employee("manager")
+    report = create_employee("report", manager=manager)
+    outsider = create_employee("outsider")
+    create_request(report, date(2025, 3, 3), date(2025, 3, 4), status="approved")
+    create_request(outsider, date(2025, 3, 3), date(2025, 3, 4), status="approved")
+
+    employees, requests = get_manage_holiday_scope(manager.user, can_view_all=False, can_view_managed=True)
+    assert set(employees) == {report}
+    assert {r.employee for r in requests} == {report}
+
+    employees, requests = get_manage_holiday_scope(manager.user, can_view_all=True, can_view_managed=False)
+    assert set(employees) == {manager, report, outsider}
+    assert requests.count() == 2
+
+    employees, requests = get_manage_holiday_scope(manager.user, can_view_all=False, can_view_managed=False)
+    assert not employees.exists() and not requests.exists()
+
+
+@pytest.mark.django_db
+def test_approved_requests_filter_by_year_and_employee():
+    first = create_employee("first")
+    second = create_employee("second")
+    later = create_request(first, date(2025, 6, 2), date(2025, 6, 3), status="approved")
+    earlier = create_request(first, date(2025, 4, 28), date(2025, 5, 2), status="approved")
+    other = create_request(second, date(2025, 4, 28), date(2025, 5, 2), status="approved")
+    create_request(first, date(2024, 4, 1), date(2024, 4, 2), status="approved")
+    create_request(first, date(2025, 7, 7), date(2025, 7, 8), status="pending")
+    create_request(first, date(2025, 8, 4), date(2025, 8, 8), status="rejected")
+
+    _, requests = get_manage_holiday_scope(first.user, can_view_all=True, can_view_managed=False)
+
+    assert list(get_approved_requests(requests, year="2025", employee_id=first.id)) == [earlier, later]
+    assert set(get_approved_requests(requests, year=2025)) == {earlier, later, other}
+    assert get_approved_requests(requests).count() == 4
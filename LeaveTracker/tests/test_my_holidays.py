@@ -0,0 +1,79 @@
+import pytest
+from datetime import date, timedelta
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from LeaveTracker.models import Employee, HolidayRequest, PublicHoliday, SpecialHolidayTypes
+from LeaveTracker.services.holiday_summary import get_my_holiday_summary
+
+
+@pytest.fixture
+def employee():
+    user = User.objects.create_user(username="alice", password="testpass")
+    return Employee.objects.create(user=user, country_code="NL")
+
+
+def create_request(employee, start, end, status="approved", **kwargs):
+    return HolidayRequest.objects.create(
+        employee=employee, days_taken=1, start_date=start, end_date=end, status=status, **kwargs
+    )
+
+
+@pytest.mark.django_db
+def test_summary_splits_tabs_and_counts_days_in_one_query(employee, django_assert_num_queries):
+    moving = SpecialHolidayTypes.objects.create(name="Moving", max_days=3)
+    PublicHoliday.objects.create(name="King's Day", country_code="NL", date=date(2025, 4, 28))
+    past = create_request(employee, date(2025, 4, 28), date(2025, 4, 30))  # 2 days, Monday is King's Day
+    ongoing = create_request(employee, date(2025, 6, 30), date(2025, 7, 4))  # 5 days
+    pending = create_request(employee, date(2025, 8, 4), date(2025, 8, 4), status="pending")
+    special = create_request(employee, date(2025, 9, 1), date(2025, 9, 2), is_special=True, special_type=moving)
+    rejected = create_request(employee, date(2025, 10, 6), date(2025, 10, 6), status="rejected")
+    create_request(employee, date(2025, 1, 6), date(2025, 1, 6), reset=True)  # carried over, not counted
+    create_request(employee, date(2024, 5, 6), date(2024, 5, 6))  # another year
+    create_request(employee, date(2025, 5, 5), date(2025, 5, 5), deleted=timezone.now())
+
+    get_my_holiday_summary(employee, 2025, today=date(2025, 7, 1))  # warm the calendar cache
+    with django_assert_num_queries(1):
+        summary = get_my_holiday_summary(employee, 2025, today=date(2025, 7, 1))
+
+    assert [hr.id for hr in summary['tabs']['past']] == [
+        HolidayRequest.objects.get(reset=True).id, past.id
+    ]
+    assert summary['tabs']['upcoming'] == [ongoing, special]
+    assert summary['tabs']['pending'] == [pending]
+    assert summary['tabs']['rejected'] == [rejected]
+    assert summary['holidays_taken'] == 2 + 5 + 1
+    assert summary['special_holidays_taken'] == 2
+
+
+@pytest.mark.django_db
+def test_page_query_count_does_not_grow_with_requests(client, employee, django_assert_max_num_queries):
+    client.login(username="alice", password="testpass")
+    year = date.today().year
+    create_request(employee, date(year, 1, 6), date(year, 1, 6))
+    client.get(reverse("my_holidays"))  # warm the calendar cache
+    with django_assert_max_num_queries(20) as few:
+        client.get(reverse("my_holidays"))
+
+    for week in range(1, 40):
+        day = date(year, 1, 6) + timedelta(weeks=week)
+        create_request(employee, day, day, status=["approved", "pending", "rejected"][week % 3])
+    with django_assert_max_num_queries(len(few)):
+        response = client.get(reverse("my_holidays"))
+    assert sum(response.context["tab_counts"].values()) == 40
+
+
+@pytest.mark.django_db
+def test_tab_endpoint_returns_the_tab_rows(client, employee):
+    client.login(username="alice", password="testpass")
+    rejected = create_request(employee, date(2025, 10, 6), date(2025, 10, 6), status="rejected")
+    create_request(employee, date(2025, 8, 4), date(2025, 8, 4), status="pending")
+
+    response = client.get(reverse("my_holidays_tab", args=["rejected"]), {"year": 2025})
+    assert response.status_code == 200
+    assert response.json()["holidays"] == [{
+        "id": rejected.id, "start_date": "2025-10-06", "end_date": "2025-10-06", "days_taken": 1,
+        "status": "rejected", "leave_type": "Regular Leave",
+    }]
+    assert client.get(reverse("my_holidays_tab", args=["archived"])).status_code == 404
+    assert client.get(reverse("my_holidays_tab", args=["past"]), {"year": "soon"}).status_code == 400
@@ -0,0 +1,94 @@
+import pytest
+from django.contrib.auth.models import Permission, User
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from LeaveTracker.models import Employee, EmployeeHierarchy
+from LeaveTracker.services.org_hierarchy import (
+    get_managed_employee_ids,
+    get_managed_employees,
+    rebuild_hierarchy,
+)
+
+
+def create_employee(username, manager=None, password=None):
+    user = User.objects.create_user(username=username, password=password)
+    return Employee.objects.create(user=user, manager=manager)
+
+
+def links():
+    return set(EmployeeHierarchy.objects.values_list('ancestor__user__username', 'descendant__user__username', 'depth'))
+
+
+@pytest.fixture
+def org():
+    # ceo > vp > (lead > dev), ceo > cfo
+    ceo = create_employee("ceo", password="testpass")
+    vp = create_employee("vp", ceo)
+    lead = create_employee("lead", vp)
+    dev = create_employee("dev", lead)
+    cfo = create_employee("cfo", ceo)
+    return {employee.user.username: employee for employee in (ceo, vp, lead, dev, cfo)}
+
+
+@pytest.mark.django_db
+def test_subtree_covers_every_depth_in_one_query(org, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        managed = set(get_managed_employees(org["ceo"].user).values_list('user__username', flat=True))
+    assert managed == {"vp", "lead", "dev", "cfo"}
+    assert set(get_managed_employees(org["vp"].user)) == {org["lead"], org["dev"]}
+    assert not get_managed_employees(org["dev"].user).exists()
+
+
+@pytest.mark.django_db
+def test_moves_and_deletes_keep_the_closure_table_in_line(org, django_capture_on_commit_callbacks):
+    ceo_ids = get_managed_employee_ids(org["ceo"].user)
+
+    # Move the lead with their report under the cfo
+    with django_capture_on_commit_callbacks(execute=True):
+        lead = Employee.objects.get(pk=org["lead"].pk)
+        lead.manager = org["cfo"]
+        lead.save()
+    assert set(get_managed_employees(org["cfo"].user)) == {org["lead"], org["dev"]}
+    assert not get_managed_employees(org["vp"].user).exists()
+    assert get_managed_employee_ids(org["ceo"].user) == ceo_ids
+    assert ("ceo", "dev", 3) in links() and ("vp", "dev", 2) not in links()
+
+    expected = links()
+    rebuild_hierarchy()
+    assert links() == expected
+
+    with pytest.raises(ValidationError):
+        cfo = Employee.objects.get(pk=org["cfo"].pk)
+        cfo.manager = org["dev"]
+        cfo.save()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        org["cfo"].delete()
+    assert set(get_managed_employees(org["ceo"].user)) == {org["vp"]}
+    assert set(get_managed_employees(org["lead"].user)) == {org["dev"]}
+    assert ("lead", "lead", 0) in links()
+
+
+@pytest.mark.django_db
+def test_senior_managers_see_their_whole_subtree(client, org):
+    org["ceo"].user.user_permissions.add(Permission.objects.get(codename="view_remaining_normal_holidays_managed"))
+    client.login(username="ceo", password="testpass")
+
+    response = client.get(reverse("remaining_normal_holidays", args=[org["dev"].id]))
+    assert response.status_code == 200
+
+    outsider = create_employee("outsider")
+    response = client.get(reverse("remaining_normal_holidays", args=[outsider.id]))
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_former_managers_lose_access_at_once_without_a_shared_cache(org, settings):
+    settings.LEAVE_SHARED_CACHE = False
+    assert org["dev"].id in get_managed_employee_ids(User.objects.get(username="vp"))
+
+    # Outside a captured on_commit, as other workers never see the bump
+    lead = Employee.objects.get(pk=org["lead"].pk)
+    lead.manager = org["cfo"]
+    lead.save()
+    assert org["dev"].id not in get_managed_employee_ids(User.objects.get(username="vp"))
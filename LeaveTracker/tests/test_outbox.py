@@ -0,0 +1,127 @@
+import pytest
+from datetime import date, timedelta
+from unittest.mock import patch
+from django.contrib.auth.models import Permission, User
+from django.core import mail
+from django.core.management import call_command
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from LeaveTracker.emails.outbox import dispatch_pending_emails
+from LeaveTracker.models import EmailOutbox, Employee, HolidayRequest
+from LeaveTracker.services.holiday_review import approve_holiday_request
+
+
+@pytest.fixture
+def employee_with_manager():
+    manager = Employee.objects.create(user=User.objects.create_user(username="manager", email="manager@example.com"))
+    return Employee.objects.create(
+        user=User.objects.create_user(username="employee", email="employee@example.com",
+                                      first_name="Anna", last_name="Smith"),
+        manager=manager,
+    )
+
+
+@pytest.mark.django_db
+def test_new_request_is_queued_not_sent(employee_with_manager):
+    HolidayRequest.objects.create(employee=employee_with_manager, days_taken=1,
+                                  start_date=date(2025, 7, 21), end_date=date(2025, 7, 21))
+
+    assert len(mail.outbox) == 0
+    queued = EmailOutbox.objects.get()
+    assert queued.to_email == "manager@example.com"
+    assert queued.subject == "New Holiday Request: Anna Smith"
+    assert queued.status == "pending"
+
+
+@pytest.mark.django_db
+def test_outbox_errors_roll_back_the_request(employee_with_manager):
+    with patch("LeaveTracker.emails.utils.EmailOutbox.objects.create", side_effect=DatabaseError("disk full")):
+        with pytest.raises(DatabaseError), transaction.atomic():
+            HolidayRequest.objects.create(employee=employee_with_manager, days_taken=1,
+                                          start_date=date(2025, 7, 21), end_date=date(2025, 7, 21))
+
+    assert not HolidayRequest.objects.exists()
+
+
+@pytest.mark.django_db
+def test_dispatcher_sends_batch_over_one_connection(employee_with_manager):
+    holiday = HolidayRequest.objects.create(employee=employee_with_manager, days_taken=1,
+                                            start_date=date(2025, 7, 21), end_date=date(2025, 7, 21))
+    manager = User.objects.get(username="manager")
+    manager.user_permissions.add(Permission.objects.get(codename="review_holiday_requests_managed"))
+    approve_holiday_request(User.objects.get(pk=manager.pk), holiday.id)
+
+    with patch("LeaveTracker.emails.outbox.get_connection", wraps=mail.get_connection) as get_connection:
+        sent, failed = dispatch_pending_emails()
+
+    assert (sent, failed) == (2, 0)
+    assert get_connection.call_count == 1
+    assert sorted(message.to[0] for message in mail.outbox) == ["employee@example.com", "manager@example.com"]
+    assert not EmailOutbox.objects.filter(status="pending").exists()
+    assert dispatch_pending_emails() == (0, 0)
+
+
+@pytest.mark.django_db
+def test_failed_sends_back_off_then_give_up():
+    email = EmailOutbox.objects.create(subject="Hello", to_email="a@example.com",
+                                       html_template="emails/employee_notification.html")
+
+    with patch("LeaveTracker.emails.outbox.send_custom_email", side_effect=OSError("SMTP down")):
+        assert dispatch_pending_emails(max_attempts=2) == (0, 0)
+        email.refresh_from_db()
+        assert email.status == "pending"
+        assert email.attempts == 1
+        assert email.next_attempt_at > timezone.now() + timedelta(seconds=30)
+        assert email.last_error == "SMTP down"
+
+        # Not due yet
+        assert dispatch_pending_emails(max_attempts=2) == (0, 0)
+
+        EmailOutbox.objects.update(next_attempt_at=timezone.now())
+        assert dispatch_pending_emails(max_attempts=2) == (0, 1)
+
+    email.refresh_from_db()
+    assert email.status == "failed"
+
+
+@pytest.mark.django_db
+def test_connection_failure_backs_off_the_whole_batch():
+    for to_email in ["a@example.com", "b@example.com"]:
+        EmailOutbox.objects.create(subject="Hello", to_email=to_email,
+                                   html_template="emails/employee_notification.html")
+
+    with patch("django.core.mail.backends.locmem.EmailBackend.open", side_effect=OSError("Connection refused")):
+        assert dispatch_pending_emails() == (0, 0)
+
+    assert len(mail.outbox) == 0
+    for email in EmailOutbox.objects.all():
+        assert email.status == "pending"
+        assert email.attempts == 1
+        assert email.last_error == "Connection refused"
+        assert email.next_attempt_at > timezone.now() + timedelta(seconds=30)
+
+
+@pytest.mark.django_db
+def test_claimed_emails_are_skipped_by_other_dispatchers():
+    EmailOutbox.objects.create(subject="Hello", to_email="a@example.com",
+                               html_template="emails/employee_notification.html")
+
+    def dispatch_again(**kwargs):
+        # A second dispatcher polling while the first is still sending
+        assert dispatch_pending_emails() == (0, 0)
+
+    with patch("LeaveTracker.emails.outbox.send_custom_email", side_effect=dispatch_again):
+        assert dispatch_pending_emails() == (1, 0)
+
+
+def test_dispatch_loop_survives_a_failed_batch():
+    class Stop(Exception):
+        pass
+
+    with patch("LeaveTracker.management.commands.dispatch_emails.dispatch_pending_emails",
+               side_effect=[OSError("SMTP down"), (0, 0)]) as dispatch, \
+            patch("LeaveTracker.management.commands.dispatch_emails.time.sleep",
+                  side_effect=[None, Stop]):
+        with pytest.raises(Stop):
+            call_command("dispatch_emails", "--loop")
+    assert dispatch.call_count == 2
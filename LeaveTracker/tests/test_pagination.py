@@ -0,0 +1,106 @@
+import pytest
+from datetime import date, timedelta
+from django.contrib.auth.models import Permission, User
+from django.test import RequestFactory
+from django.urls import reverse
+from LeaveTracker.models import Employee, HolidayRequest
+from LeaveTracker.utils.pagination import InvalidCursor, get_keyset_page, keyset_paginate
+
+
+def create_employee(username, password=None, manager=None):
+    user = User.objects.create_user(username=username, password=password,
+                                    first_name=username.title(), last_name="Test")
+    return Employee.objects.create(user=user, manager=manager)
+
+
+def create_requests(employee, count, status="approved"):
+    # Pairs of requests share a start date, so the id breaks the ties
+    HolidayRequest.objects.bulk_create([
+        HolidayRequest(employee=employee, days_taken=1, status=status,
+                       start_date=date(2025, 1, 6) + timedelta(days=7 * (n // 2)),
+                       end_date=date(2025, 1, 6) + timedelta(days=7 * (n // 2)))
+        for n in range(count)
+    ])
+    return list(HolidayRequest.objects.filter(employee=employee).order_by('start_date', 'id'))
+
+
+@pytest.mark.django_db
+def test_walking_forward_and_back_visits_every_row_once():
+    expected = create_requests(create_employee("alice"), 25)
+    queryset = HolidayRequest.objects.all()
+
+    pages = [keyset_paginate(queryset, per_page=10)]
+    while pages[-1].has_next:
+        pages.append(keyset_paginate(queryset, pages[-1].next_cursor, per_page=10))
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [row for page in pages for row in page] == expected
+    assert not pages[0].has_previous
+
+    back = keyset_paginate(queryset, pages[-1].previous_cursor, per_page=10)
+    assert list(back) == expected[10:20]
+    back = keyset_paginate(queryset, back.previous_cursor, per_page=10)
+    assert list(back) == expected[:10]
+    assert not back.has_previous and back.has_next
+
+
+@pytest.mark.django_db
+def test_count_is_capped_and_bad_cursors_are_rejected():
+    create_requests(create_employee("alice"), 12)
+
+    page = keyset_paginate(HolidayRequest.objects.all(), per_page=5, count_limit=10)
+    assert (page.count, page.count_capped) == (10, True)
+    page = keyset_paginate(HolidayRequest.objects.all(), per_page=5, count_limit=50)
+    assert (page.count, page.count_capped) == (12, False)
+
+    for cursor in ("not-a-cursor", "WyJuZXh0IiwiYWJjIiwxXQ"):  # the second holds a bad date
+        with pytest.raises(InvalidCursor):
+            keyset_paginate(HolidayRequest.objects.all(), cursor)
+
+    request = RequestFactory().get("/", {"cursor": "not-a-cursor", "year": "2025"})
+    page = get_keyset_page(request, HolidayRequest.objects.all(), per_page=5)
+    assert len(page) == 5
+    assert page.next_query.startswith("?cursor=") and "year=2025" in page.next_query
+
+
+@pytest.mark.django_db
+def test_filter_holidays_pages_on_request(client):
+    manager = create_employee("manager", password="testpass")
+    manager.user.user_permissions.add(Permission.objects.get(codename="filter_holidays_managed"))
+    member = create_employee("member", manager=manager)
+    expected = create_requests(member, 7)
+    client.login(username="manager", password="testpass")
+    params = {"employee_id": member.id, "year": 2025}
+
+    # Without paging parameters the response keeps its list shape
+    assert len(client.get(reverse("filter_holidays"), params).json()) == 7
+
+    first = client.get(reverse("filter_holidays"), dict(params, limit=4)).json()
+    second = client.get(reverse("filter_holidays"), dict(params, limit=4, cursor=first["next_cursor"])).json()
+    assert [row["id"] for row in first["results"] + second["results"]] == [hr.id for hr in expected]
+    assert first["count"] == 7 and second["next_cursor"] is None
+
+    response = client.get(reverse("filter_holidays"), dict(params, cursor="not-a-cursor"))
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_review_queue_page_has_no_per_row_queries(client, django_assert_max_num_queries):
+    reviewer = create_employee("reviewer", password="testpass")
+    reviewer.user.user_permissions.add(Permission.objects.get(codename="review_holiday_requests_managed"))
+    client.login(username="reviewer", password="testpass")
+
+    for n in range(2):
+        create_requests(create_employee(f"member{n}", manager=reviewer), 6, status="pending")
+    HolidayRequest.objects.update(reviewer=reviewer.user)
+    with django_assert_max_num_queries(20) as few:
+        response = client.get(reverse("review_requests"))
+    assert len(response.context["pending_requests"]) == 12
+
+    for n in range(2, 10):
+        create_requests(create_employee(f"member{n}", manager=reviewer), 6, status="pending")
+    HolidayRequest.objects.update(reviewer=reviewer.user)
+    with django_assert_max_num_queries(len(few)):
+        response = client.get(reverse("review_requests"))
+    assert len(response.context["pending_requests"]) == 50
+    assert response.context["pending_requests"].count == 60
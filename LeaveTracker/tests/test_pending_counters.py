@@ -0,0 +1,165 @@
+import pytest
+from datetime import date
+from django.contrib.auth.models import Group, User, Permission
+from django.test import RequestFactory
+from django.utils import timezone
+from LeaveTracker.context_processors import pending_requests
+from LeaveTracker.models import Employee, HolidayRequest
+from LeaveTracker.services.holiday_review import get_reviewable_requests
+from LeaveTracker.services.pending_counters import FALLBACK_SCOPE, get_pending_count, reviewer_scope
+
+
+@pytest.fixture
+def manager():
+    return Employee.objects.create(user=User.objects.create_user(username="manager"))
+
+
+@pytest.fixture
+def employee(manager):
+    return Employee.objects.create(user=User.objects.create_user(username="employee"), manager=manager)
+
+
+def create_request(employee, day, **kwargs):
+    kwargs.setdefault("user_group", "Employee")
+    return HolidayRequest.objects.create(
+        employee=employee, days_taken=1,
+        start_date=date(2025, 7, day), end_date=date(2025, 7, day), **kwargs
+    )
+
+
+@pytest.mark.django_db
+def test_counters_follow_creations_transitions_and_soft_deletes(employee, manager,
+                                                               django_capture_on_commit_callbacks):
+    scope = reviewer_scope(manager.user_id)
+    create_request(employee, 1)
+    assert get_pending_count('all') == 1
+    assert get_pending_count(scope) == 1
+
+    other_reviewer = User.objects.create_user(username="other_reviewer")
+    with django_capture_on_commit_callbacks(execute=True):
+        second = create_request(employee, 2)
+        create_request(employee, 3, reviewer=other_reviewer)
+        create_request(employee, 4, status="approved")
+    assert get_pending_count('all') == 3
+    assert get_pending_count(scope) == 2
+    assert get_pending_count(reviewer_scope(other_reviewer.pk)) == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        second.status = 'approved'
+        second.save()
+    assert get_pending_count('all') == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first = HolidayRequest.objects.get(start_date=date(2025, 7, 1))
+        first.deleted = timezone.now()
+        first.save()
+    assert get_pending_count('all') == 1
+    assert get_pending_count(scope) == 0
+
+    # Counters agree with a fresh count
+    assert get_pending_count('all') == HolidayRequest.objects.filter(status='pending', deleted__isnull=True).count()
+
+
+@pytest.mark.django_db
+def test_deferred_instances_invalidate_instead_of_querying(employee, django_capture_on_commit_callbacks):
+    create_request(employee, 1)
+    assert get_pending_count('all') == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        holiday = HolidayRequest.objects.only('id').get()
+        holiday.delete()
+
+    assert get_pending_count('all') == 0
+
+
+@pytest.mark.django_db
+def test_navbar_badge_costs_no_sql_once_warm(employee, manager, django_assert_num_queries):
+    manager.user.user_permissions.add(Permission.objects.get(codename='review_holiday_requests_managed'))
+    create_request(employee, 1)
+    request = RequestFactory().get("/")
+    request.user = User.objects.get(pk=manager.user_id)
+
+    assert pending_requests(request) == {'pending_requests_count': 1}
+    with django_assert_num_queries(0):
+        assert pending_requests(request) == {'pending_requests_count': 1}
+
+
+@pytest.mark.django_db
+def test_changing_manager_reroutes_pending_requests(employee, manager, django_capture_on_commit_callbacks):
+    pending = create_request(employee, 1)
+    approved = create_request(employee, 2, status="approved")
+    assert pending.reviewer_id == manager.user_id
+    assert get_pending_count(reviewer_scope(manager.user_id)) == 1
+
+    new_manager = Employee.objects.create(user=User.objects.create_user(username="new_manager"))
+    with django_capture_on_commit_callbacks(execute=True):
+        employee = Employee.objects.get(pk=employee.pk)
+        employee.manager = new_manager
+        employee.save()
+
+    pending.refresh_from_db()
+    approved.refresh_from_db()
+    assert pending.reviewer_id == new_manager.user_id
+    assert approved.reviewer_id == manager.user_id
+    assert get_pending_count(reviewer_scope(manager.user_id)) == 0
+    assert get_pending_count(reviewer_scope(new_manager.user_id)) == 1
+
+
+@pytest.mark.django_db
+def test_requests_without_a_manager_wait_for_operations_managers(manager, django_capture_on_commit_callbacks):
+    managed = Permission.objects.get(codename='review_holiday_requests_managed')
+    operations = Group.objects.create(name="Operations Manager")
+    operations.permissions.add(managed)
+    fallback = User.objects.create_user(username="operations")
+    fallback.groups.add(operations)
+    manager.user.user_permissions.add(managed)
+
+    loner = Employee.objects.create(user=User.objects.create_user(username="loner"))
+    with django_capture_on_commit_callbacks(execute=True):
+        queued = create_request(loner, 1)
+        # Only Employee-group requests fall back, as before routing
+        create_request(loner, 2, user_group="General Manager")
+    assert queued.reviewer_id is None and queued.fallback_review
+    assert get_pending_count(FALLBACK_SCOPE) == 1
+
+    fallback = User.objects.get(pk=fallback.pk)
+    assert list(get_reviewable_requests(fallback)) == [queued]
+    assert not get_reviewable_requests(User.objects.get(pk=manager.user_id)).exists()
+    request = RequestFactory().get("/")
+    request.user = fallback
+    assert pending_requests(request) == {'pending_requests_count': 1}
+
+    # Getting a manager takes the request out of the fallback queue
+    with django_capture_on_commit_callbacks(execute=True):
+        loner = Employee.objects.get(pk=loner.pk)
+        loner.manager = manager
+        loner.save()
+    queued.refresh_from_db()
+    assert (queued.reviewer_id, queued.fallback_review) == (manager.user_id, False)
+    assert get_pending_count(FALLBACK_SCOPE) == 0
+    assert not get_reviewable_requests(User.objects.get(pk=fallback.pk)).exists()
+
+
+@pytest.mark.django_db
+def test_fallback_groups_come_from_settings(settings):
+    settings.LEAVE_FALLBACK_REQUESTER_GROUPS = ["Contractor"]
+    settings.LEAVE_FALLBACK_REVIEWER_GROUP = "People Team"
+    reviewer = User.objects.create_user(username="people")
+    reviewer.groups.add(Group.objects.create(name="People Team"))
+    reviewer.user_permissions.add(Permission.objects.get(codename='review_holiday_requests_managed'))
+
+    loner = Employee.objects.create(user=User.objects.create_user(username="loner"))
+    create_request(loner, 1)
+    queued = create_request(loner, 2, user_group="Contractor,Remote")
+    assert list(get_reviewable_requests(User.objects.get(pk=reviewer.pk))) == [queued]
+
+
+@pytest.mark.django_db
+def test_counts_come_from_the_database_without_a_shared_cache(employee, settings):
+    settings.LEAVE_SHARED_CACHE = False
+    create_request(employee, 1)
+    assert get_pending_count('all') == 1
+
+    # No on-commit adjustment, as none would reach the other workers
+    create_request(employee, 2)
+    assert get_pending_count('all') == 2
@@ -0,0 +1,84 @@
+import pytest
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Group, Permission, User
+from django.urls import reverse
+from LeaveTracker.models import Employee
+from LeaveTracker.services.permission_cache import get_group_names, get_permission_snapshot, prime_permission_cache
+
+
+@pytest.fixture
+def manager():
+    group = Group.objects.create(name="Operations Manager")
+    group.permissions.add(*Permission.objects.filter(codename__in=[
+        "review_holiday_requests_managed", "view_managed_employees", "is_manager"
+    ]))
+    user = User.objects.create_user(username="manager", password="testpass")
+    user.groups.add(group)
+    user.user_permissions.add(Permission.objects.get(codename="view_holiday"))
+    Employee.objects.create(user=user)
+    return User.objects.get(pk=user.pk)
+
+
+@pytest.mark.django_db
+def test_snapshot_matches_the_model_backend(manager):
+    permissions, group_names = get_permission_snapshot(manager)
+    assert permissions == ModelBackend().get_all_permissions(User.objects.get(pk=manager.pk))
+    assert group_names == {"Operations Manager"}
+
+    superuser = User.objects.create_superuser("root", "root@example.com", None)
+    assert get_permission_snapshot(superuser)[0] == ModelBackend().get_all_permissions(superuser)
+
+    manager.is_active = False
+    assert get_permission_snapshot(manager)[0] == frozenset()
+
+
+@pytest.mark.django_db
+def test_primed_users_check_permissions_without_sql(manager, django_assert_num_queries):
+    get_permission_snapshot(manager)
+    user = User.objects.get(pk=manager.pk)
+
+    with django_assert_num_queries(0):
+        prime_permission_cache(user)
+        assert user.has_perm("LeaveTracker.review_holiday_requests_managed")
+        assert user.has_perm("LeaveTracker.view_holiday")
+        assert not user.has_perm("LeaveTracker.review_holiday_requests_all")
+        assert "Operations Manager" in get_group_names(user)
+
+
+@pytest.mark.django_db
+def test_pages_resolve_permissions_once_across_requests(client, manager):
+    client.login(username="manager", password="testpass")
+    client.get(reverse("my_holidays"))
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(ModelBackend, "_get_permissions", lambda *args: pytest.fail("permissions were resolved"))
+        patch.setattr(ModelBackend, "get_user_permissions", lambda *args: pytest.fail("permissions were resolved"))
+        response = client.get(reverse("my_holidays"))
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_permission_changes_bump_the_snapshot_version(manager, django_capture_on_commit_callbacks):
+    assert "LeaveTracker.review_holiday_requests_all" not in get_permission_snapshot(manager)[0]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Group.objects.get(name="Operations Manager").permissions.add(
+            Permission.objects.get(codename="review_holiday_requests_all"))
+    assert "LeaveTracker.review_holiday_requests_all" in get_permission_snapshot(manager)[0]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        manager.groups.clear()
+    assert get_permission_snapshot(manager) == ({"LeaveTracker.view_holiday"}, frozenset())
+
+
+@pytest.mark.django_db
+def test_revocations_apply_at_once_without_a_shared_cache(manager, settings):
+    settings.LEAVE_SHARED_CACHE = False
+    assert "Operations Manager" in get_group_names(User.objects.get(pk=manager.pk))
+
+    # No on-commit bump reaches the snapshot, as none would reach other workers
+    manager.groups.clear()
+    user = User.objects.get(pk=manager.pk)
+    prime_permission_cache(user)
+    assert not user.has_perm("LeaveTracker.review_holiday_requests_managed")
+    assert get_group_names(user) == frozenset()
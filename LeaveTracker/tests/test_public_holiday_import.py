@@ -0,0 +1,98 @@
+import json
+import threading
+import pytest
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from LeaveTracker.models import PublicHoliday, PublicHolidayFetchConfig
+from LeaveTracker.services.holiday_calendar import get_holiday_calendar
+from LeaveTracker.utils.public_holidays_fetching import import_public_holidays
+
+CALENDARS = {
+    "NL": [{"name": "King's Day", "date": {"iso": "2025-04-28"}},
+           {"name": "Christmas Day", "date": {"iso": "2025-12-25"}}],
+    "GR": [{"name": "Epiphany", "date": {"iso": "2025-01-06"}},
+           {"name": "Broken", "date": {}}],
+}
+
+
+class StubHolidayAPI(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        self.requests_seen.append((params["country"], self.headers.get("If-None-Match")))
+        holidays = CALENDARS.get(params["country"])
+        if holidays is None:
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        etag = f'"{params["country"]}-{params["year"]}-v1"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = json.dumps({"response": {"holidays": holidays}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_api(settings, tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHolidayAPI)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    StubHolidayAPI.requests_seen = []
+    settings.PUBLIC_HOLIDAYS_API_URL = f"http://127.0.0.1:{server.server_port}/api/v2/holidays"
+    settings.PUBLIC_HOLIDAYS_CACHE_DIR = str(tmp_path / "cache")
+    yield StubHolidayAPI
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.django_db
+def test_import_fetches_concurrently_and_reports_failures(stub_api):
+    results = import_public_holidays([("key", "NL", 2025), ("key", "GR", 2025), ("key", "XX", 2025)], max_workers=3)
+
+    assert results[0] == ("NL", 2025, 2, None)
+    assert results[1] == ("GR", 2025, 1, None)  # the malformed entry is skipped
+    assert results[2][:3] == ("XX", 2025, 0) and "HTTP 500" in results[2][3]
+    assert "key" not in results[2][3]
+    assert PublicHoliday.objects.count() == 3
+    assert get_holiday_calendar("NL", 2025) == (date(2025, 4, 28), date(2025, 12, 25))
+
+
+@pytest.mark.django_db
+def test_reimport_revalidates_cached_response(stub_api):
+    import_public_holidays([("key", "NL", 2025)])
+    PublicHoliday.objects.filter(name="Christmas Day").delete()
+
+    results = import_public_holidays([("key", "NL", 2025)])
+
+    # Served from the disk cache after a 304, and only the missing row is inserted
+    assert stub_api.requests_seen == [("NL", None), ("NL", '"NL-2025-v1"')]
+    assert results == [("NL", 2025, 1, None)]
+    assert PublicHoliday.objects.filter(country_code="NL").count() == 2
+
+
+@pytest.mark.django_db
+def test_command_imports_saved_configs(stub_api, capsys):
+    PublicHolidayFetchConfig.objects.create(api_key="key", country_code="NL", year=2025)
+    PublicHolidayFetchConfig.objects.create(api_key="key", country_code="GR", year=2025)
+
+    call_command("import_public_holidays")
+    assert "NL 2025: 2 new holidays" in capsys.readouterr().out
+
+    with pytest.raises(CommandError, match="1 of 2 imports failed"):
+        call_command("import_public_holidays", "--country", "NL", "--country", "XX", "--year", "2025",
+                     "--api-key", "key")
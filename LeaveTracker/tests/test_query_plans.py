@@ -0,0 +1,9 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+def test_hot_queries_use_indexes(capsys):
+    call_command("check_query_plans", "--employees", "50")
+
+    assert "All hot queries use an index." in capsys.readouterr().out
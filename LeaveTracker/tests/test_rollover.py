@@ -0,0 +1,72 @@
+import logging
+import pytest
+from datetime import date
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from LeaveTracker.models import Employee, HolidayRequest, HolidayRollover
+from LeaveTracker.services.home_summary import check_annual_rollover, rollover_annual_holidays
+
+
+def create_employee(username, available=5, last_year=2024):
+    user = User.objects.create_user(username=username)
+    return Employee.objects.create(
+        user=user, annual_holidays=25, available_holidays=available, last_holiday_year_update=last_year
+    )
+
+
+@pytest.mark.django_db
+def test_rollover_grants_allowance_once_and_resets_old_requests():
+    employees = [create_employee(f"user{i}") for i in range(5)]
+    up_to_date = create_employee("current", available=20, last_year=2025)
+    old_request = HolidayRequest.objects.create(
+        employee=employees[0], days_taken=2, start_date=date(2024, 6, 3), end_date=date(2024, 6, 4), status="approved"
+    )
+
+    marker, created = rollover_annual_holidays(2025, chunk_size=2)
+
+    assert created
+    assert marker.employees_processed == 5
+    assert all(e.available_holidays == 30 for e in Employee.objects.exclude(id=up_to_date.id))
+    up_to_date.refresh_from_db()
+    assert up_to_date.available_holidays == 20
+    old_request.refresh_from_db()
+    assert old_request.reset
+
+    # Re-running is a no-op
+    marker, created = rollover_annual_holidays(2025)
+    assert not created
+    assert Employee.objects.get(id=employees[1].id).available_holidays == 30
+
+
+@pytest.mark.django_db
+def test_annual_rollover_check_only_reads_the_marker_once(django_assert_num_queries):
+    HolidayRollover.objects.create(year=date.today().year)
+
+    with django_assert_num_queries(1):
+        assert check_annual_rollover()
+    with django_assert_num_queries(0):
+        assert check_annual_rollover()
+
+
+@pytest.mark.django_db
+def test_missing_rollover_is_logged_not_run(caplog):
+    employee = create_employee("user")
+
+    with caplog.at_level(logging.WARNING, logger="LeaveTracker"):
+        assert not check_annual_rollover()
+        assert not check_annual_rollover()
+    assert len(caplog.records) == 1 and "has not run" in caplog.records[0].getMessage()
+    assert not HolidayRollover.objects.exists()
+    employee.refresh_from_db()
+    assert employee.available_holidays == 5
+
+
+@pytest.mark.django_db
+def test_rollover_command_reports_progress(capsys):
+    create_employee("user")
+
+    call_command("rollover_holidays", "--year", "2025")
+    assert "Rolled over 1 employees for 2025" in capsys.readouterr().out
+
+    call_command("rollover_holidays", "--year", "2025")
+    assert "already completed" in capsys.readouterr().out
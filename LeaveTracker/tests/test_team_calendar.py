@@ -0,0 +1,81 @@
+import pytest
+from datetime import date
+from django.urls import reverse
+from django.contrib.auth.models import User, Permission
+from LeaveTracker.models import Employee, HolidayRequest, PublicHoliday
+
+
+def create_employee(username, manager=None):
+    user = User.objects.create_user(username=username, password="testpass",
+                                    first_name=username.title(), last_name="Test")
+    return Employee.objects.create(user=user, manager=manager)
+
+
+def create_request(employee, start_date, end_date, status="approved"):
+    return HolidayRequest.objects.create(
+        employee=employee, days_taken=1, start_date=start_date, end_date=end_date, status=status
+    )
+
+
+@pytest.mark.django_db
+def test_range_mode_returns_overlapping_requests_for_the_team(client):
+    manager = create_employee("manager")
+    member = create_employee("member", manager)
+    peer = create_employee("peer", manager)
+    outsider = create_employee("outsider")
+
+    create_request(member, date(2025, 1, 30), date(2025, 2, 3))
+    create_request(peer, date(2025, 3, 10), date(2025, 3, 11), status="pending")
+    create_request(peer, date(2025, 5, 5), date(2025, 5, 6))
+    create_request(outsider, date(2025, 2, 10), date(2025, 2, 11))
+    PublicHoliday.objects.create(name="Easter Monday", country_code="NL", date=date(2025, 4, 21))
+
+    client.login(username="member", password="testpass")
+    response = client.get(reverse("get_all_holidays"), {"from": "2025-02-01", "to": "2025-04-30"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [(h["employee_name"], h["start_date"], h["status"]) for h in data["employee_holidays"]] == [
+        ("Member Test", "2025-01-30", "approved"),
+        ("Peer Test", "2025-03-10", "pending"),
+    ]
+    assert data["public_holidays"] == [{"name": "Easter Monday", "date": "2025-04-21"}]
+
+
+@pytest.mark.django_db
+def test_month_mode_and_parameter_validation(client):
+    employee = create_employee("member")
+    create_request(employee, date(2025, 7, 21), date(2025, 7, 22))
+    client.login(username="member", password="testpass")
+    url = reverse("get_all_holidays")
+
+    assert len(client.get(url, {"year": 2025, "month": 7}).json()["employee_holidays"]) == 1
+    assert client.get(url).status_code == 400
+    assert client.get(url, {"from": "2025-01-01"}).status_code == 400
+    assert client.get(url, {"from": "2025-03-01", "to": "2025-01-01"}).status_code == 400
+    assert client.get(url, {"from": "2025-01-01", "to": "2026-12-31"}).status_code == 400
+    assert client.get(url, {"from": "not-a-date", "to": "2025-01-01"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_query_count_stays_flat_as_headcount_grows(client, django_assert_max_num_queries):
+    viewer = create_employee("viewer")
+    viewer.user.user_permissions.add(Permission.objects.get(codename="view_all_employees"))
+    client.login(username="viewer", password="testpass")
+    url = reverse("get_all_holidays")
+    params = {"from": "2025-01-01", "to": "2025-12-31"}
+
+    client.get(url, params)  # warm the permission snapshot
+
+    for i in range(2):
+        create_request(create_employee(f"small{i}"), date(2025, 6, 2), date(2025, 6, 3))
+    with django_assert_max_num_queries(6) as small:
+        client.get(url, params)
+
+    for i in range(25):
+        create_request(create_employee(f"large{i}"), date(2025, 6, 2), date(2025, 6, 3))
+    with django_assert_max_num_queries(6) as large:
+        response = client.get(url, params)
+
+    assert len(large.captured_queries) == len(small.captured_queries)
+    assert len(response.json()["employee_holidays"]) == 27
@@ -6,4 +6,6 @@ urlpatterns = [
     path('total-normal-holidays/<int:employee_id>/<int:year>/', api.total_normal_holidays_api, name='total_normal_holidays_api'),
     path('remaining-normal-holidays/<int:employee_id>/', api.remaining_normal_holidays, name='remaining_normal_holidays'),
     path('filter-holidays/', api.filter_holidays, name='filter_holidays'),
+    path('absence-heatmap/', api.absence_heatmap, name='absence_heatmap'),
+    path('who-is-out/', api.who_is_out, name='who_is_out'),
 ]
@@ -4,6 +4,8 @@ from LeaveTracker.views import dashboard
 urlpatterns = [
     path('', dashboard.home, name='home'),
     path('my-holidays/', dashboard.my_holidays, name='my_holidays'),
+    path('my-holidays/<str:tab>/', dashboard.my_holidays_tab, name='my_holidays_tab'),
+    path('dashboard-bootstrap/', dashboard.dashboard_bootstrap, name='dashboard_bootstrap'),
     path('get-available-holidays/', dashboard.get_available_holidays, name='get_available_holidays'),
     path('get-user-existing-holidays/', dashboard.get_user_existing_holidays, name='get_user_existing_holidays'),
 ]
@@ -5,4 +5,5 @@ urlpatterns = [
     path('review-requests/', review.review_requests, name='review_requests'),
     path('approve-request/<int:request_id>/', review.approve_request, name='approve_request'),
     path('reject-request/<int:request_id>/', review.reject_request, name='reject_request'),
+    path('bulk-review/', review.bulk_review, name='bulk_review'),
 ]
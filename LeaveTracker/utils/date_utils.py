@@ -1,22 +1,80 @@
+from bisect import bisect_left, bisect_right
 from datetime import timedelta, datetime
 
 
+class SortedHolidays(tuple):
+    """
+    Marker type for a pre-sorted, de-duplicated tuple of weekday holidays.
+    Build it with prepare_holidays() and reuse it across calls.
+    """
+    __slots__ = ()
 
-def total_days_for_queryset(queryset, public_holidays):
-    return sum([
-        count_non_weekend_and_non_holiday_days(hr.start_date, hr.end_date, public_holidays)
-        for hr in queryset
-    ])
-    
-def count_non_weekend_and_non_holiday_days(start_date, end_date, holidays):
-    holidays = set(holidays)  # ensure fast lookup
-    count = 0
+
+def prepare_holidays(holidays):
+    """
+    Normalise an iterable of holiday dates into the sorted tuple the counting
+    functions expect. Weekend holidays are dropped since they never reduce
+    the number of business days.
+    """
+    if isinstance(holidays, SortedHolidays):
+        return holidays
+    return SortedHolidays(sorted({day for day in holidays if day.weekday() < 5}))
+
+
+def _weekdays_before(ordinal):
+    # date.fromordinal(1) is a Monday, so whole weeks contribute five days
+    weeks, remainder = divmod(ordinal - 1, 7)
+    return weeks * 5 + min(remainder, 5)
+
+
+def count_business_days(start_date, end_date, holidays=()):
+    """
+    Count the weekdays between start_date and end_date (inclusive) that are
+    not holidays, in O(log h) time regardless of the range length.
+
+    :param holidays: Holiday dates; pass the result of prepare_holidays()
+        to avoid re-sorting on every call.
+    """
+    if start_date > end_date:
+        return 0
+    holidays = prepare_holidays(holidays)
+    weekdays = _weekdays_before(end_date.toordinal() + 1) - _weekdays_before(start_date.toordinal())
+    in_range = bisect_right(holidays, end_date) - bisect_left(holidays, start_date)
+    return weekdays - in_range
+
+
+def count_business_days_batch(ranges, holidays=()):
+    """
+    Vectorised counterpart of count_business_days: takes an iterable of
+    (start_date, end_date) pairs and returns the list of counts, sorting the
+    holidays only once for the whole batch.
+    """
+    holidays = prepare_holidays(holidays)
+    return [count_business_days(start, end, holidays) for start, end in ranges]
+
+
+def business_days(start_date, end_date, holidays=()):
+    """List the weekdays between start_date and end_date (inclusive) that are not holidays."""
+    holidays = set(prepare_holidays(holidays))
+    days = []
     day = start_date
     while day <= end_date:
         if day.weekday() < 5 and day not in holidays:
-            count += 1
+            days.append(day)
         day += timedelta(days=1)
-    return count
+    return days
+
+
+def total_days_for_queryset(queryset, public_holidays):
+    return sum(count_business_days_batch(
+        ((hr.start_date, hr.end_date) for hr in queryset),
+        public_holidays
+    ))
+
+
+def count_non_weekend_and_non_holiday_days(start_date, end_date, holidays):
+    return count_business_days(start_date, end_date, holidays)
+
 
 def get_month_range(year, month):
     start = datetime(year, month, 1).date()
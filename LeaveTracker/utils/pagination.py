@@ -0,0 +1,157 @@
+import base64
+import json
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+DEFAULT_ORDERING = ('start_date', 'id')
+# Totals shown next to paginated lists are counted up to this many rows
+APPROXIMATE_COUNT_LIMIT = 1000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values, direction):
+    payload = json.dumps([direction, *values], cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, field_count):
+    """
+    :return: (direction, values) where direction is 'next' or 'previous'.
+    :raises InvalidCursor: If the cursor was not produced by encode_cursor.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        direction, *values = payload
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor.")
+    if direction not in ('next', 'previous') or len(values) != field_count:
+        raise InvalidCursor("Invalid cursor.")
+    return direction, values
+
+
+def _after(ordering, values, strict_lookup):
+    # Lexicographic (a, b) > (x, y) as (a > x) OR (a = x AND b > y)
+    condition = Q()
+    for position, field in enumerate(ordering):
+        step = Q(**{f"{field}__{strict_lookup}": values[position]})
+        for previous_field, value in zip(ordering[:position], values[:position]):
+            step &= Q(**{previous_field: value})
+        condition |= step
+    return condition
+
+
+class KeysetPage:
+    """
+    One page of a keyset-paginated queryset. Behaves like a list of rows and
+    exposes the cursors of its neighbours instead of page numbers.
+    """
+    def __init__(self, object_list, next_cursor, previous_cursor, count=None, count_capped=False):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+        self.count_capped = count_capped
+        self.next_query = None
+        self.previous_query = None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+def keyset_paginate(queryset, cursor=None, per_page=10, ordering=DEFAULT_ORDERING, count_limit=None):
+    """
+    Page through `queryset` ordered on `ordering`, whose last field must be
+    unique. Each page is one indexed range scan of per_page + 1 rows instead
+    of a COUNT(*) plus an OFFSET over every earlier row.
+
+    :param cursor: A next_cursor or previous_cursor of an earlier page, or
+        None for the first page.
+    :param count_limit: If given, the total is counted up to this many rows,
+        so the count stays cheap however large the result; count_capped
+        tells the total was larger.
+    :raises InvalidCursor: If the cursor cannot be decoded.
+    """
+    ordering = tuple(ordering)
+    direction, values = decode_cursor(cursor, len(ordering)) if cursor else ('next', None)
+
+    page_query = queryset
+    if values is not None:
+        try:
+            page_query = page_query.filter(_after(ordering, values, 'lt' if direction == 'previous' else 'gt'))
+        except (ValidationError, TypeError, ValueError):
+            raise InvalidCursor("Invalid cursor.")
+    if direction == 'previous':
+        page_query = page_query.order_by(*[f"-{field}" for field in ordering])
+    else:
+        page_query = page_query.order_by(*ordering)
+
+    rows = list(page_query[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == 'previous':
+        rows.reverse()
+
+    def key(row):
+        # Rows are model instances or, for .values() querysets, dicts
+        if isinstance(row, dict):
+            return [row[field] for field in ordering]
+        return [getattr(row, field) for field in ordering]
+
+    # Walking forward there is something behind us as soon as we moved off the
+    # first page; walking back there is something ahead of the cursor row
+    if direction == 'next':
+        next_cursor = encode_cursor(key(rows[-1]), 'next') if has_more else None
+        previous_cursor = encode_cursor(key(rows[0]), 'previous') if values is not None and rows else None
+    else:
+        next_cursor = encode_cursor(key(rows[-1]), 'next') if rows else None
+        previous_cursor = encode_cursor(key(rows[0]), 'previous') if has_more else None
+
+    count, count_capped = None, False
+    if count_limit is not None:
+        count = queryset.order_by()[:count_limit + 1].count()
+        count_capped = count > count_limit
+        count = min(count, count_limit)
+
+    return KeysetPage(rows, next_cursor, previous_cursor, count, count_capped)
+
+
+def get_keyset_page(request, queryset, cursor_param='cursor', **kwargs):
+    """
+    keyset_paginate() for a view: reads the cursor from request.GET, falls
+    back to the first page on a bad cursor like Paginator.get_page, and sets
+    next_query and previous_query to query strings that keep the other
+    request parameters.
+    """
+    try:
+        page = keyset_paginate(queryset, request.GET.get(cursor_param) or None, **kwargs)
+    except InvalidCursor:
+        page = keyset_paginate(queryset, None, **kwargs)
+
+    def query_for(cursor):
+        params = request.GET.copy()
+        params[cursor_param] = cursor
+        return f"?{params.urlencode()}"
+
+    if page.has_next:
+        page.next_query = query_for(page.next_cursor)
+    if page.has_previous:
+        page.previous_query = query_for(page.previous_cursor)
+    return page
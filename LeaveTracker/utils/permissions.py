@@ -1,5 +1,6 @@
 from django.contrib.auth.models import User
 from django.db.models import Q
+from LeaveTracker.models import Employee, EmployeeHierarchy
 
 def get_users_with_permission(app_label: str, codename: str):
     """
@@ -11,3 +12,24 @@ def get_users_with_permission(app_label: str, codename: str):
         Q(user_permissions__codename=codename, user_permissions__content_type__app_label=app_label) |
         Q(groups__permissions__codename=codename, groups__permissions__content_type__app_label=app_label)
     ).distinct()
+
+
+def get_visible_employees(user):
+    """
+    Returns a queryset of the employees whose leave the user may see on the
+    team calendar: everyone for view_all_employees, otherwise the user's own
+    team (themselves, their manager and peers) plus everyone below them in
+    the hierarchy.
+    """
+    if user.has_perm('LeaveTracker.view_all_employees'):
+        return Employee.objects.all()
+
+    employee = Employee.objects.filter(user=user).values('id', 'manager_id').first()
+    if employee is None:
+        return Employee.objects.none()
+
+    # The subtree includes the employee themselves at depth 0
+    team = Q(id__in=EmployeeHierarchy.objects.filter(ancestor_id=employee['id']).values('descendant_id'))
+    if employee['manager_id']:
+        team |= Q(id=employee['manager_id']) | Q(manager_id=employee['manager_id'])
+    return Employee.objects.filter(team)
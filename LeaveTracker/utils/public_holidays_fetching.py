@@ -1,41 +1,162 @@
 import datetime
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from django.conf import settings
+from django.db import transaction
 import requests
 from LeaveTracker.models import PublicHoliday
+from LeaveTracker.services.data_versions import CALENDAR_SCOPE, bump_data_versions
+from LeaveTracker.services.holiday_calendar import invalidate_holiday_calendar
+
+logger = logging.getLogger('LeaveTracker')
+
+
+def _cache_path(cache_dir, country_code, year):
+    return os.path.join(cache_dir, f"{country_code.upper()}_{year}.json")
+
+
+def _read_cache(path):
+    try:
+        with open(path) as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(path, etag, body):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as cache_file:
+        json.dump({'etag': etag, 'body': body}, cache_file)
+    os.replace(temp_path, path)
+
+
+def fetch_holiday_payload(api_key, country_code, year, cache_dir=None):
+    """
+    Fetch the raw API response for one country and year. Responses are kept
+    on disk with their ETag and revalidated with If-None-Match, so an
+    unchanged calendar costs a 304 and is read from the cache.
+
+    :return: (payload, from_cache)
+    """
+    cache_dir = cache_dir or settings.PUBLIC_HOLIDAYS_CACHE_DIR
+    path = _cache_path(cache_dir, country_code, year)
+    cached = _read_cache(path)
+
+    headers = {}
+    if cached and cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
+
+    response = requests.get(
+        settings.PUBLIC_HOLIDAYS_API_URL,
+        params={"api_key": api_key, "country": country_code, "year": year},
+        headers=headers,
+        timeout=settings.PUBLIC_HOLIDAYS_API_TIMEOUT,
+    )
+    if response.status_code == 304 and cached:
+        return cached['body'], True
 
-def fetch_and_store_holidays(api_key, country_code, year):
-    url = "https://calendarific.com/api/v2/holidays"
-    params = {
-        "api_key": api_key,
-        "country": country_code,
-        "year": year,
-    }
-
-    response = requests.get(url, params=params)
     response.raise_for_status()
-    data = response.json()
+    body = response.json()
+    etag = response.headers.get('ETag')
+    if etag:
+        _write_cache(path, etag, body)
+    return body, False
 
-    if 'response' not in data or 'holidays' not in data['response']:
-        raise ValueError("Invalid response from API")
 
-    created_count = 0
+def parse_holidays(payload, country_code):
+    """
+    Build unsaved PublicHoliday rows from an API response, de-duplicated on
+    the (name, date, country) unique key.
+    """
+    if 'response' not in payload or 'holidays' not in payload['response']:
+        raise ValueError("Invalid response from API")
 
-    for holiday in data['response']['holidays']:
-        name = holiday['name']
-        date_str = holiday['date']['iso']
+    holidays = {}
+    for holiday in payload['response']['holidays']:
         try:
-            date = datetime.datetime.fromisoformat(date_str).date()
-
-            # Include country_code in the get_or_create
-            _, created = PublicHoliday.objects.get_or_create(
-                name=name,
-                date=date,
-                country_code=country_code
-            )
-
-            if created:
-                created_count += 1
-        except Exception:
+            name = holiday['name']
+            date = datetime.datetime.fromisoformat(holiday['date']['iso']).date()
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"Skipping malformed public holiday for {country_code}: {holiday!r}")
             continue
+        holidays[(name, date)] = PublicHoliday(name=name, date=date, country_code=country_code)
+    return list(holidays.values())
+
+
+def store_holidays(holidays, country_code, year):
+    """
+    Insert the holidays that are not stored yet in one statement.
+
+    :return: Number of holidays created.
+    """
+    existing = set(PublicHoliday.objects.filter(
+        country_code=country_code,
+        date__year=year
+    ).values_list('name', 'date'))
+    new_holidays = [h for h in holidays if (h.name, h.date) not in existing]
+
+    # ignore_conflicts covers a concurrent import racing this one
+    PublicHoliday.objects.bulk_create(new_holidays, ignore_conflicts=True)
+    if new_holidays:
+        # bulk_create skips the signals that expire calendar ETags and fragments
+        transaction.on_commit(partial(invalidate_holiday_calendar, country_code=country_code))
+        bump_data_versions([CALENDAR_SCOPE])
+    return len(new_holidays)
+
+
+def import_public_holidays(configs, max_workers=None, cache_dir=None):
+    """
+    Import several (api_key, country_code, year) configurations. The API is
+    called concurrently from a bounded thread pool; rows are written from
+    the calling thread so no extra database connections are opened.
 
-    return created_count
+    :return: List of (country_code, year, created_count, error_msg), in the
+             order of the configurations.
+    """
+    configs = list(configs)
+    if not configs:
+        return []
+    max_workers = max_workers or settings.PUBLIC_HOLIDAYS_IMPORT_WORKERS
 
+    def fetch(config):
+        api_key, country_code, year = config
+        # Error messages leave out the URL, which carries the API key
+        try:
+            return fetch_holiday_payload(api_key, country_code, year, cache_dir)[0], None
+        except requests.HTTPError as e:
+            return None, f"Holiday API returned HTTP {e.response.status_code}"
+        except requests.RequestException as e:
+            return None, f"Could not reach the holiday API ({type(e).__name__})"
+        except ValueError:
+            return None, "Invalid response from API"
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(configs))) as pool:
+        fetched = list(pool.map(fetch, configs))
+
+    results = []
+    for (api_key, country_code, year), (payload, error) in zip(configs, fetched):
+        if error is None:
+            try:
+                created = store_holidays(parse_holidays(payload, country_code), country_code, year)
+            except ValueError as e:
+                error = str(e)
+
+        if error:
+            logger.error(f"Public holiday import failed for {country_code} {year}: {error}")
+            results.append((country_code, year, 0, error))
+        else:
+            logger.info(f"Imported {created} public holidays for {country_code} {year}")
+            results.append((country_code, year, created, None))
+    return results
+
+
+def fetch_and_store_holidays(api_key, country_code, year):
+    """Import a single country and year, raising on failure."""
+    _, _, created, error = import_public_holidays([(api_key, country_code, year)])[0]
+    if error:
+        raise ValueError(error)
+    return created
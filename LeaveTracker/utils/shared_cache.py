@@ -0,0 +1,10 @@
+from django.conf import settings
+
+
+def shared_cache_enabled():
+    """
+    Whether the cache is shared by every worker. A value stored or a version
+    bumped in one process's local memory is never seen by the others, so
+    state that must agree across workers is only kept there when it is.
+    """
+    return getattr(settings, 'LEAVE_SHARED_CACHE', False)
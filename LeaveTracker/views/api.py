@@ -1,69 +1,74 @@
 from django.contrib.auth.decorators import login_required
-from django.views.decorators.http import require_GET
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
 from django.http import JsonResponse, HttpResponseBadRequest, HttpResponseForbidden
-from LeaveTracker.models import HolidayRequest, PublicHoliday, Employee
+from datetime import date
 from LeaveTracker.utils.date_utils import get_month_range
+from LeaveTracker.services.team_calendar import get_team_calendar, MAX_CALENDAR_RANGE_DAYS
+from LeaveTracker.services.data_versions import CALENDAR_SCOPE, DIRECTORY_SCOPE, data_etag, month_scopes
 from LeaveTracker.services.normal_holiday_summary import compute_total_normal_holidays, get_remaining_normal_holidays
-from LeaveTracker.services.holiday_filter import get_filtered_holidays
+from LeaveTracker.services.holiday_filter import get_filtered_holidays, get_filtered_holidays_page
+from LeaveTracker.services.leave_days import get_absence_heatmap, get_absent_employees
 import logging
 
 logger = logging.getLogger('LeaveTracker')
 
+MAX_PAGE_SIZE = 500
 
-@login_required
-def get_all_holidays(request):
-    try:
+
+def _calendar_range(request):
+    """
+    The (start_date, end_date) asked for with from/to or year/month.
+
+    :raises ValueError: With the message for the 400 response.
+    """
+    range_from = request.GET.get('from')
+    range_to = request.GET.get('to')
+
+    if range_from or range_to:
+        if not (range_from and range_to):
+            raise ValueError("Both from and to parameters are required.")
+        try:
+            start_date = date.fromisoformat(range_from)
+            end_date = date.fromisoformat(range_to)
+        except ValueError:
+            raise ValueError("Invalid date parameters.")
+    else:
         year = request.GET.get('year')
         month = request.GET.get('month')
 
         if not year or not month:
-            logger.warning("Missing year or month parameter.")
-            return HttpResponseBadRequest("Missing year or month parameter.")
-
-        year = int(year)
-        month = int(month)
-        start_date, end_date = get_month_range(year, month)
-
-        # Fetch employee holiday requests in the range
-        employee_holidays = []
-        employees = Employee.objects.select_related('user').all()
-
-        for employee in employees:
-            holidays = HolidayRequest.objects.filter(
-                employee=employee,
-                status__in=["approved", "pending"],
-                start_date__lte=end_date,
-                end_date__gte=start_date,
-                deleted__isnull=True
-            )
-            for hr in holidays:
-                employee_holidays.append({
-                    'employee_name': f"{employee.user.first_name} {employee.user.last_name}",
-                    'start_date': hr.start_date.isoformat(),
-                    'end_date': hr.end_date.isoformat(),
-                    'status': hr.status,
-                    'is_special': hr.is_special
-                })
-
-        public_holidays_qs = PublicHoliday.objects.filter(
-            date__year=year,
-            date__month=month
-        ).order_by('date')
-
-        public_holidays = [
-            {'name': ph.name, 'date': ph.date.isoformat()}
-            for ph in public_holidays_qs
-        ]
-
-        return JsonResponse({
-            'employee_holidays': employee_holidays,
-            'public_holidays': public_holidays
-        })
+            raise ValueError("Missing year or month parameter.")
+        try:
+            start_date, end_date = get_month_range(int(year), int(month))
+        except ValueError:
+            raise ValueError("Invalid date parameters.")
+
+    if start_date > end_date or (end_date - start_date).days >= MAX_CALENDAR_RANGE_DAYS:
+        raise ValueError(f"The range must be ordered and shorter than {MAX_CALENDAR_RANGE_DAYS} days.")
+    return start_date, end_date
+
 
+def _team_calendar_etag(request):
+    try:
+        start_date, end_date = _calendar_range(request)
     except ValueError:
-        logger.warning("Year and month must be integers.")
-        return HttpResponseBadRequest("Invalid year or month format.")
+        return None
+    return data_etag(request, [CALENDAR_SCOPE, DIRECTORY_SCOPE, *month_scopes(start_date, end_date)])
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_team_calendar_etag)
+def get_all_holidays(request):
+    try:
+        start_date, end_date = _calendar_range(request)
+    except ValueError as e:
+        logger.warning(f"Invalid range for get_all_holidays: {e}")
+        return HttpResponseBadRequest(str(e))
 
+    try:
+        return JsonResponse(get_team_calendar(request.user, start_date, end_date))
     except Exception as e:
         logger.error("Error in get_all_holidays view", exc_info=True)
         return JsonResponse({'error': 'Internal server error'}, status=500)
@@ -95,11 +100,55 @@ def filter_holidays(request):
     employee_id = request.GET.get('employee_id')
     year = request.GET.get('year')
 
-    data, error_msg = get_filtered_holidays(request.user, employee_id, year)
+    # Paging is opt-in; without cursor or limit the full list is returned
+    if 'cursor' in request.GET or 'limit' in request.GET:
+        try:
+            limit = min(max(int(request.GET.get('limit', 50)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            return JsonResponse({"error": "Invalid parameters."}, status=400)
+        data, error_msg = get_filtered_holidays_page(
+            request.user, employee_id, year, request.GET.get('cursor') or None, limit
+        )
+    else:
+        data, error_msg = get_filtered_holidays(request.user, employee_id, year)
 
     if error_msg:
         if "permission" in error_msg.lower():
             return HttpResponseForbidden(error_msg)
         return JsonResponse({"error": error_msg}, status=400)
 
-    return JsonResponse(data, safe=False)
\ No newline at end of file
+    return JsonResponse(data, safe=False)
+
+
+def _include_pending(request):
+    return request.GET.get('include_pending', 'true').lower() != 'false'
+
+
+@login_required
+@require_GET
+def absence_heatmap(request):
+    try:
+        start_date = date.fromisoformat(request.GET.get('from', ''))
+        end_date = date.fromisoformat(request.GET.get('to', ''))
+    except ValueError:
+        return HttpResponseBadRequest("from and to must be ISO dates.")
+
+    if start_date > end_date or (end_date - start_date).days >= MAX_CALENDAR_RANGE_DAYS:
+        return HttpResponseBadRequest(
+            f"The range must be ordered and shorter than {MAX_CALENDAR_RANGE_DAYS} days."
+        )
+
+    days = get_absence_heatmap(request.user, start_date, end_date, _include_pending(request))
+    return JsonResponse({'from': start_date.isoformat(), 'to': end_date.isoformat(), 'days': days})
+
+
+@login_required
+@require_GET
+def who_is_out(request):
+    try:
+        day = date.fromisoformat(request.GET.get('date', ''))
+    except ValueError:
+        return HttpResponseBadRequest("date must be an ISO date.")
+
+    employees = get_absent_employees(request.user, day, _include_pending(request))
+    return JsonResponse({'date': day.isoformat(), 'employees': employees})
@@ -1,14 +1,28 @@
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
 from django.shortcuts import render, redirect
 from datetime import datetime
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from django.db.models import Q
 from django.http import JsonResponse, HttpResponse
 from django.contrib import messages
-from django.core.paginator import Paginator
 import logging
-from LeaveTracker.services.holiday_summary import get_my_holiday_summary
-from LeaveTracker.services.home_summary import rollover_annual_holidays, get_employee_dashboard_summary
+from LeaveTracker.services.dashboard_bootstrap import get_dashboard_bootstrap, get_quarter_range
+from LeaveTracker.services.data_versions import (
+    CALENDAR_SCOPE,
+    DIRECTORY_SCOPE,
+    data_etag,
+    employee_etag,
+    employee_scope,
+    get_employee_id,
+    get_fragment_cache_ttl,
+    get_fragment_stamp,
+    month_scopes,
+)
+from LeaveTracker.services.holiday_summary import MY_HOLIDAY_TABS, get_my_holiday_summary, get_request_years
+from LeaveTracker.services.home_summary import check_annual_rollover, get_employee_dashboard_summary
 from LeaveTracker.models import Employee, HolidayRequest
 from LeaveTracker.forms import HolidayRequestForm
 
@@ -19,10 +33,11 @@ logger = logging.getLogger('LeaveTracker')
 @login_required
 def home(request):
     try:
-        # Run rollover and reset logic once per year
-        rollover_annual_holidays()
+        # Only reports a missing rollover; the rollover_holidays command does the work
+        check_annual_rollover()
 
         summary = get_employee_dashboard_summary(request.user)
+        today = timezone.localdate()
 
         # Permissions
         is_manager = request.user.has_perm('LeaveTracker.is_manager')
@@ -64,7 +79,11 @@ def home(request):
             'can_review_managed': can_review_managed,
             'can_review_all': can_review_all,
             'can_view_all_employees': can_view_all_employees,
-            'can_view_managed_employees': can_view_managed_employees
+            'can_view_managed_employees': can_view_managed_employees,
+            # Rendered inline so the calendar needs no request of its own on load
+            'bootstrap': get_dashboard_bootstrap(
+                request.user, summary['employee'], *get_quarter_range(today.year, today.month), today.year
+            ),
         }
 
         return render(request, 'LeaveTracker/home.html', context)
@@ -74,7 +93,54 @@ def home(request):
         return HttpResponse("An error occurred. Please try again later.", status=500)
 
 
+def _bootstrap_params(request):
+    """
+    The (year, month) whose quarter is asked for, the current one by default.
+
+    :raises ValueError: If year or month is not a valid month.
+    """
+    today = timezone.localdate()
+    year = int(request.GET.get('year', today.year))
+    month = int(request.GET.get('month', today.month))
+    if not 1 <= month <= 12:
+        raise ValueError("Invalid month.")
+    return year, month
+
+
+def _bootstrap_etag(request):
+    try:
+        start_date, end_date = get_quarter_range(*_bootstrap_params(request))
+    except ValueError:
+        return None
+    employee_id = get_employee_id(request.user)
+    if employee_id is None:
+        return None
+    return data_etag(request, [
+        employee_scope(employee_id), CALENDAR_SCOPE, DIRECTORY_SCOPE, *month_scopes(start_date, end_date)
+    ])
+
+
+@login_required
+@require_GET
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_bootstrap_etag)
+def dashboard_bootstrap(request):
+    try:
+        year, month = _bootstrap_params(request)
+        employee = Employee.objects.get(user=request.user)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid year or month.'}, status=400)
+    except Employee.DoesNotExist:
+        return JsonResponse({'error': 'Employee record not found.'}, status=404)
+
+    return JsonResponse(get_dashboard_bootstrap(
+        request.user, employee, *get_quarter_range(year, month), timezone.localdate().year
+    ))
+
+
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=employee_etag)
 def get_available_holidays(request):
     try:
         employee = Employee.objects.get(user=request.user)
@@ -89,27 +155,59 @@ def my_holidays(request):
     is_manager = request.user.has_perm('LeaveTracker.is_manager')
     year = int(request.GET.get('year', datetime.now().year))
 
-    summary = get_my_holiday_summary(employee, year)
-
-    # Pagination
-    page_number = request.GET.get('page', 1)
-    paginate = lambda qs: Paginator(qs.order_by('start_date'), 10).get_page(page_number)
+    # The summary and years feed cached template fragments, so they are only
+    # queried when a fragment is rendered afresh
+    summary = SimpleLazyObject(lambda: get_my_holiday_summary(employee, year))
 
+    # Only the first tab is rendered; the others are fetched from my_holidays_tab when opened
     context = {
-        'upcoming_approved_holidays': paginate(summary['upcoming_approved']),
-        'past_holidays': paginate(summary['past_approved']),
-        'pending_holidays': paginate(summary['pending']),
-        'rejected_holidays': paginate(summary['rejected']),
-        'holidays_taken': summary['holidays_taken'],
-        'special_holidays_taken': summary['special_holidays_taken'],
-        'years': [d.year for d in summary['all_requests'].dates('start_date', 'year').distinct()],
+        'employee': employee,
+        'upcoming_approved_holidays': SimpleLazyObject(lambda: summary['tabs']['upcoming']),
+        'tab_counts': SimpleLazyObject(lambda: {tab: len(rows) for tab, rows in summary['tabs'].items()}),
+        'holidays_taken': SimpleLazyObject(lambda: summary['holidays_taken']),
+        'special_holidays_taken': SimpleLazyObject(lambda: summary['special_holidays_taken']),
+        'years': SimpleLazyObject(lambda: get_request_years(employee)),
         'selected_year': year,
         'is_manager': is_manager,
+        'fragment_ttl': get_fragment_cache_ttl(),
+        # Upcoming and past are split on today's date
+        'today': timezone.now().date(),
+        'summary_stamp': get_fragment_stamp([employee_scope(employee.id), CALENDAR_SCOPE]),
     }
 
     return render(request, 'LeaveTracker/my-holidays.html', context)
 
 
+@login_required
+@require_GET
+def my_holidays_tab(request, tab):
+    if tab not in MY_HOLIDAY_TABS:
+        return JsonResponse({'error': 'Unknown tab.'}, status=404)
+    try:
+        year = int(request.GET.get('year', datetime.now().year))
+        employee = Employee.objects.get(user=request.user)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid year.'}, status=400)
+    except Employee.DoesNotExist:
+        return JsonResponse({'error': 'Employee record not found.'}, status=404)
+
+    summary = get_my_holiday_summary(employee, year)
+    return JsonResponse({'tab': tab, 'year': year, 'holidays': [
+        {
+            'id': holiday_request.id,
+            'start_date': holiday_request.start_date,
+            'end_date': holiday_request.end_date,
+            'days_taken': holiday_request.days_taken,
+            'status': holiday_request.status,
+            'leave_type': holiday_request.special_type.name if holiday_request.special_type else 'Regular Leave',
+        }
+        for holiday_request in summary['tabs'][tab]
+    ]})
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=employee_etag)
 def get_user_existing_holidays(request):
     employee = Employee.objects.get(user=request.user)
     past_holidays = HolidayRequest.objects.filter(
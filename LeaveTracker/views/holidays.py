@@ -1,20 +1,29 @@
 from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse, HttpResponseForbidden
+from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET
-from django.core.paginator import Paginator
-from django.db.models import Case, When, Value, CharField
+from django.db import transaction
+from django.db.models import Case, When, Value, CharField, F
 from django.db.models.functions import Concat
 import json
 from datetime import datetime
 from django.utils import timezone
 from django.core.exceptions import PermissionDenied
+from django.utils.functional import SimpleLazyObject
 import logging
-from LeaveTracker.models import HolidayRequest, Employee, PublicHoliday, SpecialHolidayUsage
-from LeaveTracker.utils.date_utils import count_non_weekend_and_non_holiday_days
+from LeaveTracker.models import HolidayRequest, Employee, SpecialHolidayUsage
 from LeaveTracker.services.holiday_submission import process_holiday_submission
-from LeaveTracker.services.manage_holiday_overview import get_manage_holiday_overview
+from LeaveTracker.services.leave_ledger import record_request_transition
+from LeaveTracker.services.data_versions import (
+    DIRECTORY_SCOPE,
+    REQUEST_YEARS_SCOPE,
+    get_fragment_cache_ttl,
+    get_fragment_stamp,
+)
+from LeaveTracker.services.manage_holiday_overview import get_approved_requests, get_manage_holiday_scope
+from LeaveTracker.services.org_hierarchy import get_hierarchy_version, get_managed_employees
+from LeaveTracker.utils.pagination import APPROXIMATE_COUNT_LIMIT, get_keyset_page
 
 logger = logging.getLogger('LeaveTracker')
 
@@ -38,42 +47,43 @@ def delete_holiday(request, holiday_id):
         )
         return render(request, "403.html", {"custom_message": message}, status=403)
 
-    # Fetch holiday
-    holiday_request = get_object_or_404(
-        HolidayRequest.objects.select_related('employee'),
-        id=holiday_id
-    )
-
-    employee = holiday_request.employee
-
-    # Calculate non-holiday weekdays
-    public_holidays_dates = list(PublicHoliday.objects.filter(
-        date__range=[holiday_request.start_date, holiday_request.end_date]
-    ).values_list('date', flat=True))
-
-    days_deleted = count_non_weekend_and_non_holiday_days(
-        holiday_request.start_date,
-        holiday_request.end_date,
-        public_holidays_dates
-    )
-
-    if holiday_request.is_special and holiday_request.special_type:
-        year = holiday_request.start_date.year
-        usage, _ = SpecialHolidayUsage.objects.get_or_create(
-            employee=employee,
-            holiday_type=holiday_request.special_type,
-            year=year
+    with transaction.atomic():
+        # Fetch holiday
+        holiday_request = get_object_or_404(
+            HolidayRequest.objects.select_for_update().select_related('employee'),
+            id=holiday_id
         )
-        usage.days_used = max(0, usage.days_used - days_deleted)
-        usage.save()
-    else:
-        employee.available_holidays += days_deleted
-        employee.save()
 
-    # Soft delete
-    holiday_request.deleted = timezone.now()
-    holiday_request.deleted_by = request.user
-    holiday_request.save()
+        employee = holiday_request.employee
+
+        # Rejected or already deleted requests have nothing left to give back
+        holds_days = holiday_request.deleted is None and holiday_request.status in ('pending', 'approved')
+
+        # Give back what was reserved; the calendar may have changed since
+        days_deleted = holiday_request.days_taken
+
+        if holds_days and holiday_request.is_special and holiday_request.special_type:
+            year = holiday_request.start_date.year
+            usage, _ = SpecialHolidayUsage.objects.get_or_create(
+                employee=employee,
+                holiday_type=holiday_request.special_type,
+                year=year
+            )
+            usage.days_used = max(0, usage.days_used - days_deleted)
+            usage.save()
+        elif holds_days:
+            Employee.objects.filter(id=employee.id).update(
+                available_holidays=F('available_holidays') + days_deleted
+            )
+            record_request_transition(
+                holiday_request,
+                'release' if holiday_request.status == 'pending' else 'refund'
+            )
+
+        # Soft delete
+        holiday_request.deleted = timezone.now()
+        holiday_request.deleted_by = request.user
+        holiday_request.save()
 
     return JsonResponse({'status': 'ok'})
 
@@ -89,25 +99,34 @@ def manage_holidays(request):
     employee_id = request.GET.get('employee_id')
     year = request.GET.get('year')
 
-    employee_holidays_data, employees, approved_requests, selected_year = get_manage_holiday_overview(
-        request.user, can_view_all, can_view_managed, year=year, employee_id=employee_id
+    employees, scoped_requests = get_manage_holiday_scope(request.user, can_view_all, can_view_managed)
+    page_obj = get_keyset_page(
+        request,
+        get_approved_requests(scoped_requests, year, employee_id).select_related('employee__user', 'special_type'),
+        count_limit=APPROXIMATE_COUNT_LIMIT
     )
 
-    paginator = Paginator(approved_requests, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-
-    years = [d.year for d in HolidayRequest.objects.dates('start_date', 'year')]
+    # The dropdowns are cached template fragments keyed on these stamps, so
+    # their queries only run when a fragment is rendered afresh
+    if can_view_all:
+        viewer_scope = 'all'
+    elif can_view_managed:
+        viewer_scope = f"managed:{request.user.pk}:{get_hierarchy_version()}"
+    else:
+        viewer_scope = 'none'
 
     context = {
         'page_obj': page_obj,
         'is_manager': can_view_all or can_view_managed,
         "can_delete_holiday": request.user.has_perm("LeaveTracker.delete_holiday"),
-        'employee_holidays_data': employee_holidays_data,
-        'employees': employees,
-        'years': years,
+        'employees': employees.select_related('user'),
+        'years': SimpleLazyObject(lambda: [d.year for d in HolidayRequest.objects.dates('start_date', 'year')]),
         'view_only': can_view_only,
         'now': datetime.now(),
+        'fragment_ttl': get_fragment_cache_ttl(),
+        'viewer_scope': viewer_scope,
+        'directory_stamp': get_fragment_stamp([DIRECTORY_SCOPE]),
+        'years_stamp': get_fragment_stamp([REQUEST_YEARS_SCOPE]),
     }
 
     return render(request, 'LeaveTracker/manage_holidays.html', context)
@@ -146,11 +165,7 @@ def filter_holidays(request):
 
     # Restrict if managed-only
     if not can_filter_all:
-        try:
-            employee = Employee.objects.get(user=request.user)
-        except Employee.DoesNotExist:
-            return HttpResponseForbidden("You must be linked to an employee profile.")
-        base_query = base_query.filter(employee__manager=employee)
+        base_query = base_query.filter(employee__in=get_managed_employees(request.user))
 
     # Format data
     filtered_holidays = base_query.order_by('full_name').values_list(
@@ -1,30 +1,24 @@
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponseForbidden, HttpResponse, JsonResponse
-from openpyxl.styles import Font
-import openpyxl
-import datetime
-import requests
-from LeaveTracker.models import HolidayRequest, PublicHoliday
+from django.http import HttpResponseForbidden, JsonResponse, StreamingHttpResponse
 from LeaveTracker.services.special_holiday_summary import get_special_holiday_usage_data
-from LeaveTracker.services.holiday_export import generate_holiday_export_workbook
+from LeaveTracker.services.holiday_export import generate_holiday_export_stream
 
 
 @login_required
 def export_holidays(request):
     year = request.GET.get('year')
-    workbook, error = generate_holiday_export_workbook(request.user, year)
+    export_format = request.GET.get('format', 'xlsx')
+    export, error = generate_holiday_export_stream(request.user, year, export_format)
 
     if error:
         if "permission" in error.lower():
             return HttpResponseForbidden(error)
         return JsonResponse({"error": error}, status=400)
 
-    # Prepare HTTP Excel response
-    response = HttpResponse(
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = f'attachment; filename="holidays_{year}.xlsx"'
-    workbook.save(response)
+    # Stream the file so memory stays flat whatever the number of rows
+    chunks, content_type, filename = export
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
     return response
 
 @login_required
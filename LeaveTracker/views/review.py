@@ -1,9 +1,19 @@
+import json
+from collections import Counter
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect
-from django.http import HttpResponseForbidden
+from django.http import HttpResponseForbidden, JsonResponse
 from django.core.exceptions import PermissionDenied
-from LeaveTracker.models import HolidayRequest
-from LeaveTracker.services.holiday_review import approve_holiday_request, reject_holiday_request
+from django.views.decorators.http import require_POST
+from LeaveTracker.services.holiday_review import (
+    approve_holiday_request,
+    get_reviewable_requests,
+    reject_holiday_request,
+    review_holiday_requests,
+)
+from LeaveTracker.utils.pagination import APPROXIMATE_COUNT_LIMIT, get_keyset_page
+
+REVIEW_PAGE_SIZE = 50
 
 
 @login_required
@@ -15,14 +25,6 @@ def review_requests(request):
     if not (can_review_all or can_review_managed):
         raise PermissionDenied()
 
-    if can_review_all:
-        pending_requests = HolidayRequest.objects.filter(status='pending')
-    else:
-        pending_requests = HolidayRequest.objects.filter(
-            status='pending',
-            user_group__icontains='Employee'  # Replace with dynamic group filtering if needed
-        )
-
     if request.method == 'POST':
         request_id = request.POST.get('request_id')
         action = request.POST.get('action')
@@ -32,6 +34,13 @@ def review_requests(request):
         elif action == 'reject':
             return reject_request(request, request_id)
 
+    pending_requests = get_keyset_page(
+        request,
+        get_reviewable_requests(request.user).select_related('employee__user', 'special_type'),
+        per_page=REVIEW_PAGE_SIZE,
+        count_limit=APPROXIMATE_COUNT_LIMIT
+    )
+
     return render(request, 'LeaveTracker/review_requests.html', {
         'pending_requests': pending_requests,
         'is_manager': True,
@@ -52,4 +61,28 @@ def reject_request(request, request_id):
         raise PermissionDenied()
 
     reject_holiday_request(request.user, request_id)
-    return redirect('review_requests')
\ No newline at end of file
+    return redirect('review_requests')
+
+
+@login_required
+@require_POST
+def bulk_review(request):
+    try:
+        data = json.loads(request.body)
+        request_ids = data['ids']
+        action = data['action']
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({"error": "Expected a JSON body with ids and action."}, status=400)
+
+    permission = 'LeaveTracker.approve_holiday_request' if action == 'approve' else 'LeaveTracker.reject_holiday_request'
+    if not request.user.has_perm(permission):
+        raise PermissionDenied()
+
+    results, error_msg = review_holiday_requests(request.user, request_ids, action)
+    if error_msg:
+        return JsonResponse({"error": error_msg}, status=400)
+
+    return JsonResponse({
+        "results": results,
+        "summary": dict(Counter(result['outcome'] for result in results)),
+    })
@@ -1,10 +1,16 @@
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse, HttpResponseForbidden
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from django.db.models import Sum, CharField, Value
 from django.db.models.functions import Concat
 from LeaveTracker.models import SpecialHolidayTypes, SpecialHolidayUsage, Employee
+from LeaveTracker.services.data_versions import employee_etag
+from LeaveTracker.services.org_hierarchy import get_managed_employees
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=employee_etag)
 def get_special_holiday_usage(request):
     try:
         special_type_id = int(request.GET.get("special_type_id"))
@@ -67,7 +73,7 @@ def special_holiday_usage(request):
 
     # Restrict to managed employees if not allowed to view all
     if not can_view_all:
-        usage_qs = usage_qs.filter(employee__manager__user=request.user)
+        usage_qs = usage_qs.filter(employee__in=get_managed_employees(request.user))
 
     # Filter by specific employee unless "all"
     if employee_id != 'all':
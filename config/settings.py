@@ -42,6 +42,8 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'LeaveTracker.middleware.QueryInstrumentationMiddleware',
+    'LeaveTracker.middleware.PermissionSnapshotMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -69,6 +71,21 @@ DATABASES = {
     'default': env.db(),
 }
 
+# Pending-request counters and other shared state live here; point CACHE_URL
+# at redis or memcached when running more than one worker process
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+# ETags and template fragments are keyed on data versions kept in the cache,
+# so they are only used once every worker shares it (see check_shared_cache)
+LEAVE_SHARED_CACHE = env.bool(
+    'LEAVE_SHARED_CACHE',
+    default=CACHES['default']['BACKEND'] not in (
+        'django.core.cache.backends.locmem.LocMemCache',
+        'django.core.cache.backends.dummy.DummyCache',
+    ),
+)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -91,6 +108,29 @@ EMAIL_USE_TLS = env.bool('EMAIL_USE_TLS')
 EMAIL_HOST_USER = env('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD')
 
+# Reviewer notifications: 'immediate' queues one email per new request,
+# 'digest' groups pending requests per reviewer (send_review_digests command)
+LEAVE_NOTIFICATION_MODE = env('LEAVE_NOTIFICATION_MODE', default='immediate')
+
+# Requests from members of these groups who have no manager go to a shared
+# queue reviewed by the fallback group (LeaveTracker.services.review_routing)
+LEAVE_FALLBACK_REQUESTER_GROUPS = env.list('LEAVE_FALLBACK_REQUESTER_GROUPS', default=['Employee'])
+LEAVE_FALLBACK_REVIEWER_GROUP = env('LEAVE_FALLBACK_REVIEWER_GROUP', default='Operations Manager')
+
+# Per-request SQL and timing instrumentation (LeaveTracker.middleware)
+LEAVE_INSTRUMENTATION = env.bool('LEAVE_INSTRUMENTATION', default=True)
+LEAVE_SERVER_TIMING = env.bool('LEAVE_SERVER_TIMING', default=DEBUG)
+LEAVE_SLOW_REQUEST_MS = env.int('LEAVE_SLOW_REQUEST_MS', default=500)
+LEAVE_SLOW_REQUEST_QUERIES = env.int('LEAVE_SLOW_REQUEST_QUERIES', default=50)
+LEAVE_SQL_SAMPLE_RATE = env.float('LEAVE_SQL_SAMPLE_RATE', default=0.01)
+
+# Public holiday import (LeaveTracker.utils.public_holidays_fetching)
+PUBLIC_HOLIDAYS_API_URL = env('PUBLIC_HOLIDAYS_API_URL', default='https://calendarific.com/api/v2/holidays')
+PUBLIC_HOLIDAYS_API_KEY = env('PUBLIC_HOLIDAYS_API_KEY', default='')
+PUBLIC_HOLIDAYS_API_TIMEOUT = env.int('PUBLIC_HOLIDAYS_API_TIMEOUT', default=30)
+PUBLIC_HOLIDAYS_IMPORT_WORKERS = env.int('PUBLIC_HOLIDAYS_IMPORT_WORKERS', default=4)
+PUBLIC_HOLIDAYS_CACHE_DIR = env('PUBLIC_HOLIDAYS_CACHE_DIR', default=os.path.join(BASE_DIR, 'cache', 'public_holidays'))
+
 LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'UTC'
@@ -0,0 +1,61 @@
+"""
+Micro-benchmark for the business-day counting engine.
+
+Run it from the repository root with
+
+python scripts/benchmark_date_utils.py
+"""
+import os
+import random
+import sys
+import timeit
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from LeaveTracker.utils.date_utils import count_business_days_batch, prepare_holidays
+
+
+def day_by_day(start_date, end_date, holidays):
+    holidays = set(holidays)
+    count = 0
+    day = start_date
+    while day <= end_date:
+        if day.weekday() < 5 and day not in holidays:
+            count += 1
+        day += timedelta(days=1)
+    return count
+
+
+def build_dataset(requests=5000, max_span=730, holiday_count=60, seed=42):
+    rng = random.Random(seed)
+    origin = date(2020, 1, 1)
+    holidays = [origin + timedelta(days=rng.randint(0, 3650)) for _ in range(holiday_count)]
+    ranges = []
+    for _ in range(requests):
+        start = origin + timedelta(days=rng.randint(0, 2900))
+        ranges.append((start, start + timedelta(days=rng.randint(0, max_span))))
+    return ranges, holidays
+
+
+def main():
+    ranges, holidays = build_dataset()
+
+    baseline = timeit.timeit(
+        lambda: [day_by_day(start, end, holidays) for start, end in ranges], number=3
+    ) / 3
+    closed_form = timeit.timeit(
+        lambda: count_business_days_batch(ranges, prepare_holidays(holidays)), number=3
+    ) / 3
+
+    assert count_business_days_batch(ranges, holidays) == [
+        day_by_day(start, end, holidays) for start, end in ranges
+    ]
+
+    print(f"{len(ranges)} ranges, {len(holidays)} holidays")
+    print(f"day-by-day : {baseline * 1000:9.2f} ms")
+    print(f"closed form: {closed_form * 1000:9.2f} ms ({baseline / closed_form:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
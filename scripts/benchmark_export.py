@@ -0,0 +1,86 @@
+"""
+Peak-memory benchmark for the streaming holiday export.
+
+Seeds a throwaway SQLite database and measures, for each export format,
+the peak Python heap (tracemalloc) and time taken to stream the whole
+file. Run it from the repository root with
+
+python scripts/benchmark_export.py --rows 100000 --rows 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_PATH = os.path.join(tempfile.mkdtemp(), "export_benchmark.sqlite3")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django
+
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from LeaveTracker.models import Employee, HolidayRequest
+from LeaveTracker.services.holiday_export import STREAMERS, iter_holiday_export_rows
+
+YEAR = 2025
+
+
+def seed(total_rows, employees=1000, batch_size=20000):
+    existing = HolidayRequest.objects.count()
+    if not Employee.objects.exists():
+        User.objects.bulk_create([User(username=f"bench{i}", first_name="Bench", last_name=str(i))
+                                  for i in range(employees)])
+        Employee.objects.bulk_create([Employee(user=user) for user in User.objects.all()])
+    employee_ids = list(Employee.objects.values_list("id", flat=True))
+
+    for offset in range(existing, total_rows, batch_size):
+        HolidayRequest.objects.bulk_create([
+            HolidayRequest(
+                employee_id=employee_ids[i % len(employee_ids)],
+                days_taken=2,
+                start_date=date(YEAR, 1, 1) + timedelta(days=i % 360),
+                end_date=date(YEAR, 1, 2) + timedelta(days=i % 360),
+                status="approved",
+            )
+            for i in range(offset, min(offset + batch_size, total_rows))
+        ])
+
+
+def measure(export_format):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = 0
+    for chunk in STREAMERS[export_format](iter_holiday_export_rows(YEAR)):
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, action="append", help="Row counts to test (repeatable)")
+    args = parser.parse_args()
+    row_counts = sorted(args.rows or [10000, 100000])
+
+    call_command("migrate", verbosity=0)
+    print(f"{'rows':>9} {'format':>7} {'peak MiB':>9} {'seconds':>8} {'output MiB':>11}")
+    for rows in row_counts:
+        seed(rows)
+        for export_format in STREAMERS:
+            peak, elapsed, size = measure(export_format)
+            print(f"{rows:>9} {export_format:>7} {peak / 2**20:>9.2f} {elapsed:>8.2f} {size / 2**20:>11.2f}")
+
+    os.remove(DB_PATH)
+
+
+if __name__ == "__main__":
+    main()